@@ -0,0 +1,224 @@
+"""
+Write-behind access analytics for token-protected pages.
+
+Hits are appended to a per-process in-memory buffer and written to
+:class:`~django_resume.models.TokenAccess` with one ``bulk_create`` by a daemon
+flusher thread. The thread wakes up once the buffer holds
+``DJANGO_RESUME_TOKEN_ACCESS_FLUSH_SIZE`` hits and at least every
+``DJANGO_RESUME_TOKEN_ACCESS_FLUSH_INTERVAL``, so page views never wait for the
+write and an idle process still flushes its last hits. Flushing only inserts
+rows, it never locks or updates the ``Resume`` row.
+"""
+
+import atexit
+import logging
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DatabaseError, close_old_connections, transaction
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from .models import Resume, TokenAccess
+
+logger = logging.getLogger(__name__)
+
+ACCESS_LOG_SETTING = "DJANGO_RESUME_TOKEN_ACCESS_LOG"
+FLUSH_SIZE_SETTING = "DJANGO_RESUME_TOKEN_ACCESS_FLUSH_SIZE"
+FLUSH_INTERVAL_SETTING = "DJANGO_RESUME_TOKEN_ACCESS_FLUSH_INTERVAL"
+DEFAULT_FLUSH_SIZE = 100
+DEFAULT_FLUSH_INTERVAL = timedelta(seconds=60)
+# Share link ids embed an owner-chosen receiver label of any length.
+TOKEN_ID_MAX_LENGTH = TokenAccess._meta.get_field("token_id").max_length
+PAGE_MAX_LENGTH = TokenAccess._meta.get_field("page").max_length
+# Set while rendering pages for internal use, see :func:`access_log_paused`.
+_paused: ContextVar[bool] = ContextVar("django_resume_access_log_paused", default=False)
+# Shortest sleep of the flusher thread, so a zero interval does not spin.
+MIN_FLUSHER_SLEEP = 1.0
+
+
+@dataclass(frozen=True)
+class TokenHit:
+    resume_pk: int
+    token_id: str
+    page: str
+    accessed_at: datetime
+
+
+@dataclass(frozen=True)
+class TokenAccessSummary:
+    count: int
+    last_accessed: datetime | None
+
+
+def access_log_enabled() -> bool:
+    return bool(getattr(settings, ACCESS_LOG_SETTING, False))
+
+
+def get_flush_size() -> int:
+    flush_size = getattr(settings, FLUSH_SIZE_SETTING, DEFAULT_FLUSH_SIZE)
+    if isinstance(flush_size, int) and flush_size > 0:
+        return flush_size
+    raise ImproperlyConfigured(f"{FLUSH_SIZE_SETTING} must be a positive integer.")
+
+
+def get_flush_interval() -> timedelta:
+    interval = getattr(settings, FLUSH_INTERVAL_SETTING, DEFAULT_FLUSH_INTERVAL)
+    if isinstance(interval, timedelta):
+        return interval
+    raise ImproperlyConfigured(
+        f"{FLUSH_INTERVAL_SETTING} must be a datetime.timedelta."
+    )
+
+
+class AccessBuffer:
+    """Thread-safe buffer of :class:`TokenHit` flushed in batches."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._hits: list[TokenHit] = []
+        self._last_flush = timezone.now()
+        self._wakeup = threading.Event()
+        self._flusher: threading.Thread | None = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._hits)
+
+    def record(self, hit: TokenHit) -> None:
+        with self._lock:
+            self._hits.append(hit)
+            due = (
+                len(self._hits) >= get_flush_size()
+                or hit.accessed_at - self._last_flush >= get_flush_interval()
+            )
+        self.start_flusher()
+        if due:
+            self._wakeup.set()
+
+    def start_flusher(self) -> None:
+        """Start the flusher thread unless it is running in this process."""
+        with self._lock:
+            if self._flusher is not None and self._flusher.is_alive():
+                return None
+            self._flusher = threading.Thread(
+                target=self.run_flusher,
+                name="django-resume-token-access-log",
+                daemon=True,
+            )
+            self._flusher.start()
+        return None
+
+    def run_flusher(self) -> None:
+        while True:
+            timeout = get_flush_interval().total_seconds()
+            self._wakeup.wait(max(timeout, MIN_FLUSHER_SLEEP))
+            self._wakeup.clear()
+            if not len(self):
+                continue
+            close_old_connections()
+            try:
+                self.flush()
+            finally:
+                close_old_connections()
+
+    def flush(self) -> int:
+        """Write buffered hits to the database and return how many were written."""
+        with self._lock:
+            hits, self._hits = self._hits, []
+            self._last_flush = timezone.now()
+        if not hits:
+            return 0
+        rows = [
+            TokenAccess(
+                resume_id=hit.resume_pk,
+                token_id=hit.token_id,
+                page=hit.page,
+                accessed_at=hit.accessed_at,
+            )
+            for hit in hits
+        ]
+        try:
+            with transaction.atomic():
+                TokenAccess.objects.bulk_create(rows)
+        except DatabaseError:
+            # One bad row must not cost the batch; retry them one by one.
+            return self.write_rows(rows)
+        return len(rows)
+
+    @staticmethod
+    def write_rows(rows: list[TokenAccess]) -> int:
+        written = 0
+        for row in rows:
+            try:
+                with transaction.atomic():
+                    row.save(force_insert=True)
+            except DatabaseError:
+                # Analytics must never break page views; drop the hit.
+                logger.exception("Could not write token access hit %r.", row)
+            else:
+                written += 1
+        return written
+
+
+access_buffer = AccessBuffer()
+atexit.register(access_buffer.flush)
+
+
+@contextmanager
+def access_log_paused() -> Iterator[None]:
+    """Skip recording hits in this block, e.g. for pages rendered by a command."""
+    token = _paused.set(True)
+    try:
+        yield
+    finally:
+        _paused.reset(token)
+
+
+def record_token_access(
+    resume_pk: int, token_id: str, page: str, *, now: datetime | None = None
+) -> None:
+    """Buffer one token hit if ``DJANGO_RESUME_TOKEN_ACCESS_LOG`` is enabled."""
+    if not access_log_enabled() or _paused.get():
+        return None
+    access_buffer.record(
+        TokenHit(
+            resume_pk=resume_pk,
+            token_id=token_id[:TOKEN_ID_MAX_LENGTH],
+            page=page[:PAGE_MAX_LENGTH],
+            accessed_at=now or timezone.now(),
+        )
+    )
+    return None
+
+
+def get_token_access_summaries(resume: Resume) -> dict[str, TokenAccessSummary]:
+    """
+    Return flushed access counts per token id for ``resume``.
+
+    The aggregate is computed in one query and memoized on the instance, so
+    rendering a form per token item does not query once per item.
+    """
+    cached = getattr(resume, "_token_access_summaries", None)
+    if cached is not None:
+        return cached
+    summaries: dict[str, TokenAccessSummary] = {}
+    if resume.pk is not None:
+        rows = (
+            TokenAccess.objects.filter(resume_id=resume.pk)
+            .values("token_id")
+            .annotate(count=Count("id"), last_accessed=Max("accessed_at"))
+            .order_by()
+        )
+        for row in rows:
+            summaries[row["token_id"]] = TokenAccessSummary(
+                count=row["count"], last_accessed=row["last_accessed"]
+            )
+    resume._token_access_summaries = summaries  # type: ignore[attr-defined]
+    return summaries
@@ -37,6 +37,13 @@ class ResumeConfig(AppConfig):
             ]
         )
 
+    @staticmethod
+    def warm_templates() -> None:
+        from .themes import warm_templates, warm_templates_enabled
+
+        if warm_templates_enabled():
+            warm_templates()
+
     def ready(self) -> None:
         # All pages must be registered before plugins: the first plugin
         # registration imports django_resume.urls, which calls
@@ -47,3 +54,6 @@ class ResumeConfig(AppConfig):
         self.register_pages()
         self.autodiscover_pages()
         self.register_plugins()
+        # Compile page and plugin templates only once everything that names
+        # a template is registered.
+        self.warm_templates()
@@ -0,0 +1,23 @@
+"""
+Exceptions of the JSON Resume importer and theme support.
+
+Kept apart from :mod:`.importer` and :mod:`.themes` so code that only handles
+these errors, like the views, does not import the schema validator, the HTTP
+client or the theme runner.
+"""
+
+
+class JsonResumeImportError(ValueError):
+    """Raised when a JSON Resume document cannot be imported."""
+
+    def __init__(self, message: str, *, field: str | None = None) -> None:
+        super().__init__(message)
+        self.field = field
+
+
+class JsonResumeThemeError(RuntimeError):
+    """Raised when theme discovery, installation, or rendering fails."""
+
+
+class UnknownThemeCatalogKey(JsonResumeThemeError):
+    """Raised when a requested catalog key is unknown or disabled."""
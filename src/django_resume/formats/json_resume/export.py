@@ -34,14 +34,8 @@ def portable_document(document: dict) -> dict:
 
 
 def _source_document_for_unchanged_import(
-    resume: Resume, document: dict
+    resume: Resume, document: dict, json_resume_state: dict
 ) -> dict | None:
-    integration_data = resume.integration_data
-    if not isinstance(integration_data, dict):
-        return None
-    json_resume_state = integration_data.get("json_resume", {})
-    if not isinstance(json_resume_state, dict):
-        return None
     source_document = json_resume_state.get("source_document")
     source_adapter_document = json_resume_state.get("source_adapter_document")
     source_plugin_data = json_resume_state.get("source_plugin_data")
@@ -69,7 +63,10 @@ def export_resume(resume: Resume, *, registry=None) -> JsonResumeExport:
     plugins = registry.get_all_plugins()
     resolved, omitted = collect_adapters(plugins, resume, FORMAT_ID)
     document, notes = build_document(resolved)
-    source_document = _source_document_for_unchanged_import(resume, document)
+    json_resume_state = resume.get_provenance(FORMAT_ID)
+    source_document = _source_document_for_unchanged_import(
+        resume, document, json_resume_state
+    )
     if source_document is not None:
         document = source_document
         notes.append(
@@ -81,12 +78,6 @@ def export_resume(resume: Resume, *, registry=None) -> JsonResumeExport:
             "version": DJANGO_RESUME_META_VERSION,
             "plugin_data": deepcopy(resume.plugin_data),
         }
-        integration_data = resume.integration_data
-        if not isinstance(integration_data, dict):
-            integration_data = {}
-        json_resume_state = integration_data.get("json_resume", {})
-        if not isinstance(json_resume_state, dict):
-            json_resume_state = {}
         preserved_extensions = json_resume_state.get("preserved_extensions")
         if isinstance(preserved_extensions, list):
             django_resume_meta["preserved_extensions"] = deepcopy(preserved_extensions)
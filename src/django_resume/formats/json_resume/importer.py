@@ -1,11 +1,12 @@
 import errno
 import http.client
-import json
 import ipaddress
 import socket
 import ssl
+from collections.abc import Iterable
 from copy import deepcopy
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
 from typing import Any, cast
 from urllib.parse import urljoin, urlparse
@@ -23,8 +24,10 @@ from ...interchange.coordinator import (
 from ...interchange.conflicts import detect_path_conflicts
 from ...interchange.pointer import get_pointer, has_pointer
 from ...interchange.report import ImportReport
-from ...models import Resume
+from ...models import Resume, ResumeProvenance
 from ...plugins import plugin_registry
+from .errors import JsonResumeImportError
+from .streaming import CHUNK_SIZE, DocumentParser, parse_document_chunks
 from .validation import validate_document
 
 FORMAT_ID = "json_resume"
@@ -33,14 +36,6 @@ URL_FETCH_TIMEOUT_SECONDS = 10
 MAX_URL_REDIRECTS = 5
 
 
-class JsonResumeImportError(ValueError):
-    """Raised when a JSON Resume document cannot be imported."""
-
-    def __init__(self, message: str, *, field: str | None = None) -> None:
-        super().__init__(message)
-        self.field = field
-
-
 @dataclass
 class JsonResumeImport:
     resume: Resume | None
@@ -58,27 +53,21 @@ class _ResolvedImportURL:
     host_header: str
 
 
-def _reject_duplicate_keys(pairs: list[tuple[str, Any]]) -> dict:
-    result = {}
-    for key, value in pairs:
-        if key in result:
-            raise JsonResumeImportError(f"Duplicate JSON object key {key!r}")
-        result[key] = value
-    return result
-
-
 def _coerce_document(document: object) -> dict:
     if not isinstance(document, dict):
         raise JsonResumeImportError("JSON Resume document must be an object")
     return document
 
 
-def _loads_document(text: str) -> dict:
-    try:
-        document = json.loads(text, object_pairs_hook=_reject_duplicate_keys)
-    except json.JSONDecodeError as exc:
-        raise JsonResumeImportError(f"Invalid JSON: {exc}") from exc
-    return _coerce_document(document)
+def load_document_chunks(chunks: Iterable[bytes], *, source: str = "input") -> dict:
+    """Parse a JSON Resume document from byte chunks as they arrive.
+
+    Oversized, too deeply nested, non-UTF-8 or malformed input and duplicate
+    object keys are rejected without consuming the remaining chunks.
+    """
+    return _coerce_document(
+        parse_document_chunks(chunks, max_bytes=MAX_INPUT_BYTES, source=source)
+    )
 
 
 def load_document(path: str | Path) -> dict:
@@ -88,12 +77,13 @@ def load_document(path: str | Path) -> dict:
             raise JsonResumeImportError(
                 f"Input exceeds maximum size of {MAX_INPUT_BYTES} bytes"
             )
-        text = input_path.read_text(encoding="utf-8")
+        with input_path.open("rb") as input_file:
+            return load_document_chunks(
+                iter(partial(input_file.read, CHUNK_SIZE), b""),
+                source=str(input_path),
+            )
     except OSError as exc:
         raise JsonResumeImportError(f"Could not read {input_path}: {exc}") from exc
-    except UnicodeDecodeError as exc:
-        raise JsonResumeImportError(f"Invalid UTF-8 in {input_path}: {exc}") from exc
-    return _loads_document(text)
 
 
 def load_document_bytes(data: bytes, *, source: str = "input") -> dict:
@@ -101,11 +91,11 @@ def load_document_bytes(data: bytes, *, source: str = "input") -> dict:
         raise JsonResumeImportError(
             f"Input exceeds maximum size of {MAX_INPUT_BYTES} bytes"
         )
-    try:
-        text = data.decode("utf-8")
-    except UnicodeDecodeError as exc:
-        raise JsonResumeImportError(f"Invalid UTF-8 in {source}: {exc}") from exc
-    return _loads_document(text)
+    view = memoryview(data)
+    return load_document_chunks(
+        (view[start : start + CHUNK_SIZE] for start in range(0, len(data), CHUNK_SIZE)),
+        source=source,
+    )
 
 
 def _is_public_address(address: str) -> bool:
@@ -279,8 +269,14 @@ def load_document_url(url: str) -> dict:
                         f"Input exceeds maximum size of {MAX_INPUT_BYTES} bytes",
                         field="source_url",
                     )
-            data = response.read(MAX_INPUT_BYTES + 1)
-        except JsonResumeImportError:
+            # Parse while reading, so an oversized or malformed body is
+            # rejected before the rest of it is downloaded.
+            parser = DocumentParser(max_bytes=MAX_INPUT_BYTES, source=checked_url.url)
+            while chunk := response.read(CHUNK_SIZE):
+                parser.feed(chunk)
+            document = _coerce_document(parser.close())
+        except JsonResumeImportError as exc:
+            exc.field = "source_url"
             raise
         except (http.client.HTTPException, OSError) as exc:
             raise JsonResumeImportError(
@@ -288,16 +284,7 @@ def load_document_url(url: str) -> dict:
             ) from exc
         finally:
             connection.close()
-        if len(data) > MAX_INPUT_BYTES:
-            raise JsonResumeImportError(
-                f"Input exceeds maximum size of {MAX_INPUT_BYTES} bytes",
-                field="source_url",
-            )
-        try:
-            return load_document_bytes(data, source=checked_url.url)
-        except JsonResumeImportError as exc:
-            exc.field = "source_url"
-            raise
+        return document
     raise JsonResumeImportError(
         f"Could not read JSON Resume URL: exceeded {MAX_URL_REDIRECTS} redirects",
         field="source_url",
@@ -497,7 +484,6 @@ def import_resume_document(
             "did not store source JSON Resume document for exact re-export because "
             "meta.django_resume.plugin_data was ignored"
         )
-    integration_data: dict[str, Any] = {"json_resume": json_resume_state}
     source_adapter_document, source_notes = _build_source_adapter_document(
         plugin_data=plugin_data,
         owner=owner,
@@ -507,19 +493,15 @@ def import_resume_document(
     )
     report.notes.extend(source_notes)
     if source_adapter_document is not None:
-        integration_data["json_resume"]["source_adapter_document"] = (
-            source_adapter_document
-        )
-        if "source_document" in integration_data["json_resume"]:
+        json_resume_state["source_adapter_document"] = source_adapter_document
+        if "source_document" in json_resume_state:
             report.notes.append(
                 "stored source JSON Resume document for exact re-export while mapped "
                 "projection and plugin data remain unchanged"
             )
     preserved_extensions = django_resume_meta.get("preserved_extensions")
     if isinstance(preserved_extensions, list):
-        integration_data["json_resume"]["preserved_extensions"] = deepcopy(
-            preserved_extensions
-        )
+        json_resume_state["preserved_extensions"] = deepcopy(preserved_extensions)
         report.notes.append("stored meta.django_resume.preserved_extensions")
 
     try:
@@ -529,7 +511,10 @@ def import_resume_document(
                 slug=slug,
                 owner=owner,
                 plugin_data=plugin_data,
-                integration_data=integration_data,
+            )
+            # Provenance is kept off the Resume row so page views never load it.
+            ResumeProvenance.objects.create(
+                resume=resume, data={FORMAT_ID: json_resume_state}
             )
     except IntegrityError as exc:
         raise JsonResumeImportError(
@@ -0,0 +1,90 @@
+"""
+Background job handlers for JSON Resume imports and themes.
+
+See :mod:`django_resume.jobs`. Each handler returns a ``message`` for the job
+status fragment plus the data the views need to show the outcome.
+"""
+
+from typing import Any
+
+from django.urls import reverse
+
+from ...jobs import JobFailed
+from ...models import Job, Resume
+from .errors import JsonResumeImportError, JsonResumeThemeError
+from .importer import import_resume_document, load_document_url
+from .themes import (
+    install_catalog_theme,
+    set_selected_catalog_theme,
+    set_selected_theme,
+)
+from .themes import (
+    install_theme as install_theme_package,
+)
+
+
+def get_owned_resume(job: Job) -> Resume:
+    try:
+        return Resume.objects.get(pk=job.payload["resume_id"], owner=job.owner)
+    except (KeyError, Resume.DoesNotExist):
+        raise JobFailed("The resume no longer exists.")
+
+
+def import_url(job: Job) -> dict[str, Any]:
+    """Fetch a JSON Resume document from ``payload["source_url"]`` and import it."""
+    payload = job.payload
+    try:
+        document = load_document_url(payload["source_url"])
+        result = import_resume_document(
+            document,
+            owner=job.owner,
+            slug=payload["slug"],
+            name=payload.get("name") or None,
+            restore_django_resume_data=not payload.get("portable_only", False),
+        )
+    except JsonResumeImportError as exc:
+        raise JobFailed(str(exc))
+    report = result.report
+    if not report.valid or result.resume is None:
+        raise JobFailed("; ".join(report.validation_errors) or "Import failed.")
+    return {
+        "message": f"Imported {result.resume.name}.",
+        "resume_slug": result.resume.slug,
+        "mapped_plugins": report.mapped_plugins,
+        "restored_plugins": report.restored_plugins,
+        "omitted_plugins": report.omitted_plugins,
+        "notes": report.notes,
+    }
+
+
+def install_theme(job: Job) -> dict[str, Any]:
+    """Install the npm theme ``payload["package"]`` and select it."""
+    resume = get_owned_resume(job)
+    package_name = job.payload.get("package", "")
+    try:
+        install_theme_package(package_name)
+        set_selected_theme(resume, package_name)
+    except JsonResumeThemeError as exc:
+        raise JobFailed(str(exc))
+    return {
+        "message": f"Installed and selected {package_name}.",
+        "url": reverse(
+            "django_resume:json-resume-themes", kwargs={"slug": resume.slug}
+        ),
+    }
+
+
+def use_catalog_theme(job: Job) -> dict[str, Any]:
+    """Install the pinned catalog theme ``payload["key"]`` and select it."""
+    resume = get_owned_resume(job)
+    try:
+        entry = install_catalog_theme(job.payload.get("key", ""))
+        set_selected_catalog_theme(resume, entry.key)
+    except JsonResumeThemeError as exc:
+        raise JobFailed(str(exc))
+    return {
+        "message": f"Selected {entry.display_name}.",
+        "url": reverse(
+            "django_resume:json-resume-themes", kwargs={"slug": resume.slug}
+        ),
+    }
@@ -0,0 +1,278 @@
+"""
+Incremental, size-bounded JSON parsing for imports.
+
+:class:`DocumentParser` is fed the raw bytes of a document chunk by chunk
+(from an upload, a file or an HTTP response). It decodes them incrementally,
+tokenizes the text as soon as complete tokens are available and builds the
+document while doing so. Only the undecoded tail of the current chunk and the
+text of an incomplete token are buffered, so an import never holds the whole
+input as bytes, as text and as the parsed document at once.
+
+The parser fails as soon as the input exceeds ``max_bytes``, nests deeper than
+``max_depth``, repeats a key within an object, is not valid UTF-8 or is not
+valid JSON, without reading the rest of it. It accepts what ``json.loads``
+accepts, including ``NaN`` and ``Infinity``.
+"""
+
+import codecs
+import re
+from collections.abc import Iterable
+from json.decoder import scanstring
+from typing import Any
+
+from .errors import JsonResumeImportError
+
+MAX_NESTING_DEPTH = 64
+CHUNK_SIZE = 64 * 1024
+
+WHITESPACE_RE = re.compile(r"[ \t\n\r]*")
+# String content up to the closing quote or a backslash ending the buffer.
+STRING_BODY_RE = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL)
+# Characters a number can continue with after the end of a chunk.
+NUMBER_CHARS_RE = re.compile(r"[-+.eE0-9]*")
+NUMBER_RE = re.compile(r"(-?(?:0|[1-9][0-9]*))(\.[0-9]+)?([eE][-+]?[0-9]+)?")
+CONSTANTS: dict[str, Any] = {
+    "true": True,
+    "false": False,
+    "null": None,
+    "NaN": float("nan"),
+    "Infinity": float("inf"),
+    "-Infinity": float("-inf"),
+}
+
+# What the parser expects next.
+VALUE = "value"
+VALUE_OR_END = "value or ']'"
+KEY = "key"
+KEY_OR_END = "key or '}'"
+COLON = "':'"
+COMMA_OR_END = "',' or closing bracket"
+DONE = "end of input"
+
+
+class DocumentParser:
+    """Build a JSON value from byte chunks passed to :meth:`feed`.
+
+    Call :meth:`close` after the last chunk to get the value.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_bytes: int,
+        max_depth: int = MAX_NESTING_DEPTH,
+        source: str = "input",
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.max_depth = max_depth
+        self.source = source
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.received = 0
+        self.buffer = ""
+        self.pos = 0
+        # Position of the buffer start in the decoded text, for messages.
+        self.offset = 0
+        self.line = 1
+        self.line_start = 0
+        # Where to resume scanning an incomplete string in the buffer.
+        self.string_scan = 0
+        # Open containers: [container, pending object key].
+        self.stack: list[list[Any]] = []
+        self.expect = VALUE
+        self.value: Any = None
+
+    def error(self, message: str, pos: int | None = None) -> JsonResumeImportError:
+        char = self.offset + (self.pos if pos is None else pos)
+        consumed = self.buffer[: char - self.offset]
+        line = self.line + consumed.count("\n")
+        newline = consumed.rfind("\n")
+        line_start = self.offset + newline + 1 if newline >= 0 else self.line_start
+        return JsonResumeImportError(
+            f"Invalid JSON: {message}: line {line} column "
+            f"{char - line_start + 1} (char {char})"
+        )
+
+    def feed(self, chunk: bytes) -> None:
+        self.received += len(chunk)
+        if self.received > self.max_bytes:
+            raise JsonResumeImportError(
+                f"Input exceeds maximum size of {self.max_bytes} bytes"
+            )
+        self.add_text(chunk, final=False)
+
+    def close(self) -> Any:
+        self.add_text(b"", final=True)
+        if self.expect != DONE:
+            raise self.error(f"Expecting {self.expect}")
+        return self.value
+
+    def add_text(self, chunk: bytes, *, final: bool) -> None:
+        try:
+            text = self.decoder.decode(chunk, final)
+        except UnicodeDecodeError as exc:
+            raise JsonResumeImportError(
+                f"Invalid UTF-8 in {self.source}: {exc}"
+            ) from exc
+        if self.pos:
+            self.compact()
+        self.buffer += text
+        self.parse(final)
+
+    def compact(self) -> None:
+        consumed = self.buffer[: self.pos]
+        newlines = consumed.count("\n")
+        if newlines:
+            self.line += newlines
+            self.line_start = self.offset + consumed.rfind("\n") + 1
+        self.offset += self.pos
+        if self.string_scan:
+            self.string_scan -= self.pos
+        self.buffer = self.buffer[self.pos :]
+        self.pos = 0
+
+    def parse(self, final: bool) -> None:
+        buffer = self.buffer
+        end = len(buffer)
+        while True:
+            pos = WHITESPACE_RE.match(buffer, self.pos).end()
+            self.pos = pos
+            if pos == end:
+                return
+            if self.expect == DONE:
+                raise self.error("Extra data")
+            char = buffer[pos]
+            expect = self.expect
+            if expect in (VALUE, VALUE_OR_END):
+                if char == "]" and expect == VALUE_OR_END:
+                    self.pos = pos + 1
+                    self.end_container()
+                    continue
+                if not self.parse_value(buffer, pos, final):
+                    return
+            elif expect in (KEY, KEY_OR_END):
+                if char == "}" and expect == KEY_OR_END:
+                    self.pos = pos + 1
+                    self.end_container()
+                    continue
+                if char != '"':
+                    raise self.error(
+                        "Expecting property name enclosed in double quotes"
+                    )
+                key = self.parse_string(buffer, pos, final)
+                if key is None:
+                    return
+                frame = self.stack[-1]
+                if key in frame[0]:
+                    raise JsonResumeImportError(f"Duplicate JSON object key {key!r}")
+                frame[1] = key
+                self.expect = COLON
+            elif expect == COLON:
+                if char != ":":
+                    raise self.error("Expecting ':' delimiter")
+                self.pos = pos + 1
+                self.expect = VALUE
+            else:  # COMMA_OR_END
+                container = self.stack[-1][0]
+                if char == ",":
+                    self.pos = pos + 1
+                    self.expect = KEY if isinstance(container, dict) else VALUE
+                elif char == ("}" if isinstance(container, dict) else "]"):
+                    self.pos = pos + 1
+                    self.end_container()
+                else:
+                    raise self.error("Expecting ',' delimiter")
+
+    def parse_value(self, buffer: str, pos: int, final: bool) -> bool:
+        """Parse the value at ``pos``; False if more input is needed."""
+        char = buffer[pos]
+        if char in "{[":
+            if len(self.stack) >= self.max_depth:
+                raise self.error(f"Nesting deeper than {self.max_depth} levels")
+            if char == "{":
+                self.stack.append([{}, None])
+                self.expect = KEY_OR_END
+            else:
+                self.stack.append([[], None])
+                self.expect = VALUE_OR_END
+            self.pos = pos + 1
+            return True
+        if char == '"':
+            value = self.parse_string(buffer, pos, final)
+            if value is None:
+                return False
+            self.add_value(value)
+            return True
+        remaining = len(buffer) - pos
+        for name, constant in CONSTANTS.items():
+            if buffer.startswith(name, pos):
+                self.pos = pos + len(name)
+                self.add_value(constant)
+                return True
+            if not final and remaining < len(name) and name.startswith(buffer[pos:]):
+                return False
+        if not final and NUMBER_CHARS_RE.match(buffer, pos).end() == len(buffer):
+            return False  # the number may continue in the next chunk
+        match = NUMBER_RE.match(buffer, pos)
+        if match is None:
+            raise self.error("Expecting value")
+        integer, fraction, exponent = match.groups()
+        if fraction or exponent:
+            number: int | float = float(integer + (fraction or "") + (exponent or ""))
+        else:
+            try:
+                number = int(integer)
+            except ValueError as exc:  # more digits than int() converts
+                raise self.error(str(exc)) from exc
+        self.pos = match.end()
+        self.add_value(number)
+        return True
+
+    def parse_string(self, buffer: str, pos: int, final: bool) -> str | None:
+        """Parse the string at ``pos``; None if more input is needed."""
+        scan = STRING_BODY_RE.match(buffer, self.string_scan or pos + 1).end()
+        if scan == len(buffer) or buffer[scan] != '"':
+            if final:
+                raise self.error("Unterminated string starting at", pos)
+            self.string_scan = scan
+            return None
+        self.string_scan = 0
+        try:
+            value, end = scanstring(buffer, pos + 1, True)
+        except ValueError as exc:
+            raise self.error(
+                getattr(exc, "msg", str(exc)), getattr(exc, "pos", pos)
+            ) from exc
+        self.pos = end
+        return value
+
+    def add_value(self, value: Any) -> None:
+        if not self.stack:
+            self.value = value
+            self.expect = DONE
+            return
+        frame = self.stack[-1]
+        container = frame[0]
+        if isinstance(container, dict):
+            container[frame[1]] = value
+            frame[1] = None
+        else:
+            container.append(value)
+        self.expect = COMMA_OR_END
+
+    def end_container(self) -> None:
+        container = self.stack.pop()[0]
+        self.add_value(container)
+
+
+def parse_document_chunks(
+    chunks: Iterable[bytes],
+    *,
+    max_bytes: int,
+    max_depth: int = MAX_NESTING_DEPTH,
+    source: str = "input",
+) -> Any:
+    """Parse the JSON value made of ``chunks``, enforcing the limits early."""
+    parser = DocumentParser(max_bytes=max_bytes, max_depth=max_depth, source=source)
+    for chunk in chunks:
+        parser.feed(chunk)
+    return parser.close()
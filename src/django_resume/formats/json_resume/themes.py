@@ -16,6 +16,7 @@ from urllib.request import urlopen
 from django.conf import settings
 
 from ...models import Resume
+from .errors import JsonResumeThemeError, UnknownThemeCatalogKey
 from .export import export_resume, portable_document
 
 NPM_SEARCH_URL = "https://registry.npmjs.org/-/v1/search"
@@ -91,14 +92,6 @@ DEFAULT_THEME_CATALOG = (
 )
 
 
-class JsonResumeThemeError(RuntimeError):
-    """Raised when theme discovery, installation, or rendering fails."""
-
-
-class UnknownThemeCatalogKey(JsonResumeThemeError):
-    """Raised when a requested catalog key is unknown or disabled."""
-
-
 @dataclass(frozen=True)
 class ThemeSearchResult:
     name: str
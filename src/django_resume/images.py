@@ -1,113 +1,679 @@
+import hashlib
 import io
+import logging
+import os
+import posixpath
+import re
 import struct
-
-from collections.abc import Iterable
-from typing import Any, cast
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import IO, Any, cast
 
 from django import forms
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
 from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
-from django.core.files.uploadedfile import InMemoryUploadedFile
+from django.core.files.uploadedfile import UploadedFile
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.db.models import TextField
+from django.db.models.functions import Cast
+from django.dispatch import receiver
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Resume, ResumeProvenance
+
+PILImage: Any | None
+PILImageOps: Any | None
+PILFeatures: Any | None
+try:
+    import PIL.features as PILFeatures
+    import PIL.Image as PILImage
+    import PIL.ImageOps as PILImageOps
+except ImportError:  # pragma: no cover - exercised only when Pillow is unavailable
+    PILImage = None
+    PILImageOps = None
+    PILFeatures = None
+
+logger = logging.getLogger(__name__)
+
+DERIVATIVE_WIDTHS_SETTING = "DJANGO_RESUME_IMAGE_DERIVATIVE_WIDTHS"
+DERIVATIVE_FORMATS_SETTING = "DJANGO_RESUME_IMAGE_DERIVATIVE_FORMATS"
+DEFAULT_DERIVATIVE_WIDTHS = (160, 320, 640)
+DEFAULT_DERIVATIVE_FORMATS = ("avif", "webp", "jpeg")
+SERVE_UPLOADS_SETTING = "DJANGO_RESUME_SERVE_UPLOADS"
+DEFAULT_ORPHAN_GRACE = timedelta(days=1)
+COLLECT_REFERENCES_CHUNK_SIZE = 500
+UPLOAD_URL_CACHE_TTL_SETTING = "DJANGO_RESUME_UPLOAD_URL_CACHE_TTL"
+DEFAULT_UPLOAD_URL_CACHE_TTL = timedelta(minutes=5)
+UPLOAD_URL_CACHE_MAX_ENTRIES = 1024
+# A rendition never changes once written; a missing one may still be rendering.
+DERIVATIVE_EXISTS_TTL = timedelta(hours=1)
+DERIVATIVE_MISSING_TTL = timedelta(seconds=30)
+UPLOAD_DIRECTORY = "uploads"
+# uploads/<first two hex digits>/[derivatives/]<sha256>[-<width>w][.<ext>]
+CONTENT_ADDRESSED_PATH_RE = re.compile(
+    r"^uploads/[0-9a-f]{2}/(?:derivatives/)?[0-9a-f]{64}"
+    r"(?:-[0-9]+w)?(?:\.[a-z0-9]{1,10})?$"
+)
+# Extensions kept on stored uploads, with the content type they are served as.
+# Anything else (HTML, SVG, ...) is stored without an extension, so the
+# storage backend and serve_upload never hand it out as a document.
+UPLOAD_CONTENT_TYPES = {
+    ".avif": "image/avif",
+    ".gif": "image/gif",
+    ".jpeg": "image/jpeg",
+    ".jpg": "image/jpeg",
+    ".png": "image/png",
+    ".webp": "image/webp",
+}
+DERIVATIVE_MIME_TYPES = {
+    "avif": "image/avif",
+    "webp": "image/webp",
+    "jpeg": "image/jpeg",
+}
 
 
 class UnknownImageFormat(Exception):
     pass
 
 
-def get_image_metadata_from_bytesio(
-    input: InMemoryUploadedFile, size: int
-) -> tuple[int, int]:
-    data = input.read(30)  # Increased read size for WebP format detection
-    msg = " raised while trying to decode as JPEG."
+# Enough for every format's fixed-size header; JPEG is walked segment by segment.
+IMAGE_HEADER_BYTES = 32
+# JPEG start-of-frame markers; C4, C8 and CC share the range but are not frames.
+JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def _read_jpeg_dimensions(input: IO[bytes]) -> tuple[int, int]:
+    """
+    Walk JPEG segments from the current position up to the first frame header.
+
+    Segment payloads are skipped with ``seek`` instead of being read, so large
+    EXIF or ICC blocks in front of the frame header cost nothing.
+    """
+    while True:
+        marker = input.read(1)
+        while marker == b"\xff":
+            marker = input.read(1)
+        if not marker:
+            raise UnknownImageFormat("No JPEG frame header found")
+        if marker[0] == 0xDA:  # start of scan: no frame header before the data
+            raise UnknownImageFormat("No JPEG frame header found")
+        length_bytes = input.read(2)
+        if len(length_bytes) != 2:
+            raise UnknownImageFormat("Truncated JPEG segment")
+        (length,) = struct.unpack(">H", length_bytes)
+        if marker[0] in JPEG_SOF_MARKERS:
+            frame = input.read(5)
+            if len(frame) != 5:
+                raise UnknownImageFormat("Truncated JPEG frame header")
+            h, w = struct.unpack(">HH", frame[1:5])
+            return int(w), int(h)
+        input.seek(length - 2, io.SEEK_CUR)
+        next_byte = input.read(1)
+        if next_byte != b"\xff":
+            raise UnknownImageFormat("Corrupt JPEG segment marker")
+
+
+def get_image_metadata_from_bytesio(input: IO[bytes], size: int) -> tuple[int, int]:
+    """
+    Return ``(width, height)`` from the header of the image file ``input``.
+
+    Reads are bounded to the header (plus segment headers for JPEG), so this
+    works on uploads and storage files alike without loading the image. The
+    position of ``input`` is restored afterwards.
+    """
+    position = input.tell()
+    try:
+        input.seek(0)
+        data = input.read(IMAGE_HEADER_BYTES)
+        return _get_dimensions_from_header(input, data, size)
+    finally:
+        input.seek(position)
 
+
+def _get_dimensions_from_header(
+    input: IO[bytes], data: bytes, size: int
+) -> tuple[int, int]:
     # Check for GIF format
     if (size >= 10) and data[:6] in (b"GIF87a", b"GIF89a"):
         w, h = struct.unpack("<HH", data[6:10])
-        width = int(w)
-        height = int(h)
+        return int(w), int(h)
 
     # Check for PNG format
-    elif (
+    if (
         (size >= 24)
         and data.startswith(b"\211PNG\r\n\032\n")
         and (data[12:16] == b"IHDR")
     ):
         w, h = struct.unpack(">LL", data[16:24])
-        width = int(w)
-        height = int(h)
+        return int(w), int(h)
 
     # Check for JPEG format
-    elif (size >= 2) and data.startswith(b"\377\330"):
-        input.seek(0)
-        input.read(2)
-        b = input.read(1)
+    if (size >= 2) and data.startswith(b"\377\330"):
+        input.seek(2)
         try:
-            while b and ord(b) != 0xDA:
-                while ord(b) != 0xFF:
-                    b = input.read(1)
-                while ord(b) == 0xFF:
-                    b = input.read(1)
-                if 0xC0 <= ord(b) <= 0xC3:
-                    input.read(3)
-                    h, w = struct.unpack(">HH", input.read(4))
-                    break
-                else:
-                    input.read(int(struct.unpack(">H", input.read(2))[0]) - 2)
-                b = input.read(1)
-            width = int(w)
-            height = int(h)
-        except struct.error:
-            raise UnknownImageFormat("StructError" + msg)
-        except ValueError:
-            raise UnknownImageFormat("ValueError" + msg)
-        except Exception as e:
-            raise UnknownImageFormat(e.__class__.__name__ + msg)
+            return _read_jpeg_dimensions(input)
+        except (struct.error, ValueError, OSError) as e:
+            raise UnknownImageFormat(
+                e.__class__.__name__ + " raised while trying to decode as JPEG."
+            )
 
     # Check for BMP format
-    elif (size >= 26) and data.startswith(b"BM"):
+    if (size >= 26) and data.startswith(b"BM"):
         headersize = struct.unpack("<I", data[14:18])[0]
         if headersize == 12:
             w, h = struct.unpack("<HH", data[18:22])
-            width = int(w)
-            height = int(h)
-        elif headersize >= 40:
+            return int(w), int(h)
+        if headersize >= 40:
             w, h = struct.unpack("<ii", data[18:26])
-            width = int(w)
-            height = abs(int(h))
-        else:
-            raise UnknownImageFormat("Unknown DIB header size:" + str(headersize))
+            return int(w), abs(int(h))
+        raise UnknownImageFormat("Unknown DIB header size:" + str(headersize))
 
     # Check for WebP format
-    elif data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+    if len(data) >= 30 and data[:4] == b"RIFF" and data[8:12] == b"WEBP":
         if data[12:16] == b"VP8 ":
             # Simple WebP file format with VP8 chunk
             w, h = struct.unpack("<HH", data[26:30])
-            width = int(w) & 0x3FFF  # 14-bit width
-            height = int(h) & 0x3FFF  # 14-bit height
-        elif data[12:16] == b"VP8L":
-            # WebP lossless format with VP8L chunk
-            w, h = struct.unpack("<HH", data[21:25])
-            width = (w & 0x3FFF) + 1
-            height = (h & 0x3FFF) + 1
-        elif data[12:16] == b"VP8X":
-            # WebP extended format with VP8X chunk
-            w, h = struct.unpack("<LL", data[24:32])
-            width = (w & 0xFFFFFF) + 1
-            height = (h & 0xFFFFFF) + 1
-        else:
-            raise UnknownImageFormat("Unknown WebP format")
+            return int(w) & 0x3FFF, int(h) & 0x3FFF  # 14-bit width and height
+        if data[12:16] == b"VP8L":
+            # WebP lossless format with VP8L chunk: 14-bit fields after a signature
+            bits = int.from_bytes(data[21:25], "little")
+            return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+        if data[12:16] == b"VP8X":
+            # WebP extended format with VP8X chunk: 24-bit canvas width and height
+            width = int.from_bytes(data[24:27], "little") + 1
+            height = int.from_bytes(data[27:30], "little") + 1
+            return width, height
+        raise UnknownImageFormat("Unknown WebP format")
+
+    raise UnknownImageFormat("unknown")
+
+
+def get_image_dimensions_from_storage(path: str) -> tuple[int, int]:
+    with default_storage.open(path, "rb") as file:
+        return get_image_metadata_from_bytesio(file, default_storage.size(path))
+
+
+def content_addressed_path(upload: UploadedFile) -> str:
+    """
+    Return ``uploads/<xx>/<sha256><ext>`` for ``upload``.
+
+    The hash is computed over ``upload.chunks()``, so the file is never read
+    into memory in one piece. The extension of the uploaded name is kept only
+    when it is one of the raster image types in ``UPLOAD_CONTENT_TYPES``.
+    """
+    digest = hashlib.sha256()
+    upload.seek(0)
+    for chunk in upload.chunks():
+        digest.update(chunk)
+    upload.seek(0)
+    content_hash = digest.hexdigest()
+    extension = posixpath.splitext(upload.name or "")[1].lower()
+    if extension not in UPLOAD_CONTENT_TYPES:
+        extension = ""
+    return f"{UPLOAD_DIRECTORY}/{content_hash[:2]}/{content_hash}{extension}"
+
+
+def store_upload(upload: UploadedFile) -> str:
+    """
+    Store ``upload`` under its content hash and return the storage path.
+
+    Identical files share one stored copy across fields and resumes. The
+    upload is handed to the storage backend as a file, which copies it in
+    chunks. Reusing a stored copy refreshes its modification time, so the
+    orphan sweep's grace period covers it until the form is saved.
+    """
+    path = content_addressed_path(upload)
+    if default_storage.exists(path):
+        touch_upload(path, upload)
+        return path
+    return default_storage.save(path, upload)
+
 
+def touch_upload(path: str, upload: UploadedFile) -> None:
+    """
+    Set the modification time of the stored ``path`` to now.
+
+    Local storages update the time in place. Other backends get the identical
+    content written over the same name when they allow overwriting; otherwise
+    the time cannot be refreshed and is left alone.
+    """
+    try:
+        local_path = default_storage.path(path)
+    except NotImplementedError:
+        if default_storage.get_available_name(path) == path:
+            default_storage.save(path, upload)
+        return None
+    try:
+        os.utime(local_path)
+    except OSError:
+        logger.warning("Could not refresh the modification time of %s.", path)
+    return None
+
+
+def is_content_addressed(path: str) -> bool:
+    return bool(CONTENT_ADDRESSED_PATH_RE.match(path))
+
+
+def upload_content_type(path: str) -> str | None:
+    """The image content type of a stored upload, None if it is not an image."""
+    return UPLOAD_CONTENT_TYPES.get(posixpath.splitext(path)[1].lower())
+
+
+def serve_uploads_enabled() -> bool:
+    return bool(getattr(settings, SERVE_UPLOADS_SETTING, False))
+
+
+def cap_by_upload_url_lifetime(ttl: timedelta) -> timedelta:
+    """
+    Bound ``ttl`` by half the signature lifetime of upload URLs.
+
+    Signing storage backends expire their URLs (``querystring_expire`` on
+    S3-style backends, ``expiration`` on others); anything that caches upload
+    URLs for at most this long hands them out with half their validity left.
+    """
+    for attribute in ("querystring_expire", "expiration"):
+        expiry = getattr(default_storage, attribute, None)
+        if isinstance(expiry, (int, float)) and not isinstance(expiry, bool):
+            expiry = timedelta(seconds=expiry)
+        if isinstance(expiry, timedelta):
+            ttl = min(ttl, expiry / 2)
+    return ttl
+
+
+def get_upload_url_cache_ttl() -> timedelta:
+    """
+    How long a resolved upload URL may be reused.
+
+    Bounded by :func:`cap_by_upload_url_lifetime`.
+    """
+    ttl = getattr(settings, UPLOAD_URL_CACHE_TTL_SETTING, DEFAULT_UPLOAD_URL_CACHE_TTL)
+    if not isinstance(ttl, timedelta):
+        raise ImproperlyConfigured(
+            f"{UPLOAD_URL_CACHE_TTL_SETTING} must be a datetime.timedelta."
+        )
+    return cap_by_upload_url_lifetime(ttl)
+
+
+class UploadUrlCache:
+    """Per-process, TTL-bounded memo of resolved upload URLs keyed by path."""
+
+    def __init__(self, max_entries: int = UPLOAD_URL_CACHE_MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: dict[str, tuple[str, float]] = {}
+
+    def get(self, path: str) -> str | None:
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry is None or entry[1] <= time.monotonic():
+            return None
+        return entry[0]
+
+    def set(self, path: str, url: str, ttl: timedelta) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries = {
+                    key: entry for key, entry in self._entries.items() if entry[1] > now
+                }
+                if len(self._entries) >= self.max_entries:
+                    self._entries.clear()
+            self._entries[path] = (url, now + ttl.total_seconds())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+upload_url_cache = UploadUrlCache()
+
+
+@receiver(setting_changed)
+def clear_upload_url_cache(*, setting: str, **kwargs: Any) -> None:
+    if setting in (
+        "STORAGES",
+        "MEDIA_URL",
+        SERVE_UPLOADS_SETTING,
+        UPLOAD_URL_CACHE_TTL_SETTING,
+    ):
+        upload_url_cache.clear()
+
+
+def get_upload_url(path: str) -> str:
+    """
+    Return the URL of the stored upload at ``path``.
+
+    With ``DJANGO_RESUME_SERVE_UPLOADS`` enabled, content-addressed uploads are
+    served by django-resume with immutable cache headers; everything else uses
+    the storage backend's URL. Results are memoized for
+    :func:`get_upload_url_cache_ttl`, so a signing backend signs each image at
+    most once per window no matter how many plugins and templates ask.
+    """
+    url = upload_url_cache.get(path)
+    if url is not None:
+        return url
+    if serve_uploads_enabled() and is_content_addressed(path):
+        url = reverse("django_resume:upload", kwargs={"name": path})
     else:
-        raise UnknownImageFormat("unknown")
+        url = default_storage.url(path)
+    ttl = get_upload_url_cache_ttl()
+    if ttl > timedelta(0):
+        upload_url_cache.set(path, url, ttl)
+    return url
+
+
+def iter_upload_references(value: object) -> Iterator[str]:
+    """Yield every string below ``value`` that points into the upload directory."""
+    if isinstance(value, str):
+        if value.startswith(f"{UPLOAD_DIRECTORY}/"):
+            yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from iter_upload_references(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from iter_upload_references(item)
+
+
+def collect_referenced_uploads(
+    *, chunk_size: int = COLLECT_REFERENCES_CHUNK_SIZE
+) -> set[str]:
+    """
+    Mark phase: collect upload paths referenced by any resume.
 
-    return width, height
+    Both the plugin data and the import provenance are scanned, because a
+    re-export restores image paths from the provenance data.
+    """
+    referenced: set[str] = set()
+    for rows in (
+        Resume.objects.values_list("plugin_data", flat=True),
+        ResumeProvenance.objects.values_list("data", flat=True),
+    ):
+        for data in rows.iterator(chunk_size=chunk_size):
+            referenced.update(iter_upload_references(data))
+    return referenced
 
 
-def get_image_dimensions_from_storage(path):
-    with default_storage.open(path, "rb") as file:
-        file_data = io.BytesIO(file.read())
-        size = default_storage.size(path)
-        return get_image_metadata_from_bytesio(file_data, size)
+def is_upload_referenced(path: str) -> bool:
+    """
+    Whether any resume references ``path`` right now.
+
+    Only rows whose JSON text contains ``path`` are fetched and then checked
+    exactly. Paths that are not ASCII may be escaped in the stored JSON, so
+    they always count as referenced.
+    """
+    if not path.isascii():
+        return True
+    for model, field in ((Resume, "plugin_data"), (ResumeProvenance, "data")):
+        rows = (
+            model.objects.annotate(json_text=Cast(field, TextField()))
+            .filter(json_text__contains=path)
+            .values_list(field, flat=True)
+        )
+        for data in rows.iterator():
+            if path in iter_upload_references(data):
+                return True
+    return False
+
+
+def iter_stored_uploads(directory: str = UPLOAD_DIRECTORY) -> Iterator[str]:
+    """
+    Yield the paths of all files below ``directory`` in storage.
+
+    Storage is listed one directory at a time (``uploads/``, then each hash
+    prefix and its ``derivatives/``), so no listing holds the whole bucket.
+    """
+    try:
+        directories, files = default_storage.listdir(directory)
+    except (FileNotFoundError, NotADirectoryError):
+        return
+    for name in sorted(files):
+        yield posixpath.join(directory, name)
+    for name in sorted(directories):
+        yield from iter_stored_uploads(posixpath.join(directory, name))
+
+
+@dataclass
+class UploadSweepResult:
+    files: int = 0
+    bytes: int = 0
+
+
+def remove_orphaned_uploads(
+    *,
+    grace: timedelta = DEFAULT_ORPHAN_GRACE,
+    dry_run: bool = False,
+    include_legacy: bool = False,
+    now: datetime | None = None,
+) -> UploadSweepResult:
+    """
+    Delete stored uploads that no resume references any more.
+
+    Referenced paths are collected first by streaming every resume's plugin
+    data and import provenance, then storage is swept directory by directory.
+    Only content-addressed files are candidates: other projects often store
+    their own files below ``uploads/`` too. Pass ``include_legacy`` to also
+    delete unreferenced files with other names, such as uploads stored before
+    content addressing. Files younger than ``grace`` are kept, so an upload
+    whose form has not been saved yet survives. Files whose modification time
+    the storage cannot report are kept as well. Right before a file is deleted
+    its path is looked up again, so a file that a resume started referencing
+    during the sweep is kept.
+    """
+    if now is None:
+        now = timezone.now()
+    referenced = collect_referenced_uploads()
+    result = UploadSweepResult()
+    for path in iter_stored_uploads():
+        if path in referenced:
+            continue
+        if not include_legacy and not is_content_addressed(path):
+            continue
+        try:
+            modified = default_storage.get_modified_time(path)
+        except (NotImplementedError, OSError):
+            continue
+        if timezone.is_naive(modified):
+            modified = timezone.make_aware(modified)
+        if now - modified < grace:
+            continue
+        try:
+            size = default_storage.size(path)
+        except OSError:
+            size = 0
+        if is_upload_referenced(path):
+            continue
+        if not dry_run:
+            default_storage.delete(path)
+        result.files += 1
+        result.bytes += size
+    return result
+
+
+def get_derivative_widths() -> tuple[int, ...]:
+    widths = getattr(settings, DERIVATIVE_WIDTHS_SETTING, DEFAULT_DERIVATIVE_WIDTHS)
+    if isinstance(widths, (list, tuple)) and all(
+        isinstance(width, int) and width > 0 for width in widths
+    ):
+        return tuple(sorted(set(widths)))
+    raise ImproperlyConfigured(
+        f"{DERIVATIVE_WIDTHS_SETTING} must be a sequence of positive integers."
+    )
+
+
+def get_derivative_formats() -> tuple[str, ...]:
+    """Configured derivative formats that the installed Pillow can encode."""
+    formats = getattr(settings, DERIVATIVE_FORMATS_SETTING, DEFAULT_DERIVATIVE_FORMATS)
+    unknown = set(formats) - set(DERIVATIVE_MIME_TYPES)
+    if isinstance(formats, str) or unknown:
+        raise ImproperlyConfigured(
+            f"{DERIVATIVE_FORMATS_SETTING} must be a sequence of "
+            f"{', '.join(DERIVATIVE_MIME_TYPES)}."
+        )
+    if PILImage is None or PILFeatures is None:
+        return ()
+    supported = []
+    for image_format in formats:
+        if image_format in ("avif", "webp") and not PILFeatures.check(image_format):
+            continue
+        supported.append(image_format)
+    return tuple(supported)
+
+
+def derivative_path(path: str, width: int, image_format: str) -> str:
+    directory, filename = posixpath.split(path)
+    stem = posixpath.splitext(filename)[0]
+    return posixpath.join(directory, "derivatives", f"{stem}-{width}w.{image_format}")
+
+
+def plan_image_derivatives(path: str, width: int | None) -> list[dict[str, Any]]:
+    """
+    Return the renditions to generate for the image stored at ``path``.
+
+    Only widths smaller than the original are planned, so images are never
+    upscaled. Without a known width or without Pillow nothing is planned and
+    templates keep serving the original.
+    """
+    if width is None:
+        return []
+    return [
+        {
+            "path": derivative_path(path, derivative_width, image_format),
+            "width": derivative_width,
+            "format": image_format,
+        }
+        for image_format in get_derivative_formats()
+        for derivative_width in get_derivative_widths()
+        if derivative_width < width
+    ]
+
+
+def generate_image_derivatives(path: str, derivatives: list[dict[str, Any]]) -> int:
+    """
+    Write the planned ``derivatives`` of the image at ``path`` to storage.
+
+    Renditions are turned upright according to the EXIF orientation, like
+    browsers display the original. Content-addressed renditions already in
+    storage are skipped before decoding the image. Returns the number of
+    renditions written. Errors are logged, not raised, because this runs off
+    the request thread.
+    """
+    if PILImage is None or PILImageOps is None or not derivatives:
+        return 0
+    written = 0
+    try:
+        pending = []
+        for derivative in sorted(derivatives, key=lambda item: item["width"]):
+            if default_storage.exists(derivative["path"]):
+                if is_content_addressed(derivative["path"]):
+                    # Same content, width and format: already rendered.
+                    derivative_exists_cache.set(
+                        derivative["path"], "exists", DERIVATIVE_EXISTS_TTL
+                    )
+                    continue
+                default_storage.delete(derivative["path"])
+            pending.append(derivative)
+        if not pending:
+            return 0
+        with default_storage.open(path, "rb") as file:
+            original = PILImage.open(file)
+            original.load()
+        original = PILImageOps.exif_transpose(original)
+        for derivative in pending:
+            image = original.copy()
+            image.thumbnail((derivative["width"], image.height), PILImage.LANCZOS)
+            if derivative["format"] == "jpeg" and image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            buffer = io.BytesIO()
+            image.save(buffer, format=derivative["format"].upper())
+            default_storage.save(derivative["path"], ContentFile(buffer.getvalue()))
+            derivative_exists_cache.set(
+                derivative["path"], "exists", DERIVATIVE_EXISTS_TTL
+            )
+            written += 1
+    except Exception:
+        logger.exception("Could not generate image derivatives for %s.", path)
+    return written
+
+
+def schedule_image_derivatives(path: str, derivatives: list[dict[str, Any]]) -> None:
+    """Generate ``derivatives`` in a background thread once the save commits."""
+    if not derivatives:
+        return None
+
+    def start() -> None:
+        threading.Thread(
+            target=generate_image_derivatives,
+            args=(path, derivatives),
+            name="django-resume-image-derivatives",
+            daemon=True,
+        ).start()
+
+    transaction.on_commit(start)
+    return None
+
+
+# Memo of derivative_exists results, "exists" or "missing" per path.
+derivative_exists_cache = UploadUrlCache()
+
+
+def derivative_exists(path: str) -> bool:
+    """
+    Whether the rendition at ``path`` has been written to storage.
+
+    Renditions are recorded when an image is uploaded but rendered after the
+    save, and rendering may fail or never finish. The storage lookup is
+    memoized, briefly for missing files so they show up once rendered.
+    """
+    cached = derivative_exists_cache.get(path)
+    if cached is not None:
+        return cached == "exists"
+    exists = default_storage.exists(path)
+    if exists:
+        derivative_exists_cache.set(path, "exists", DERIVATIVE_EXISTS_TTL)
+    else:
+        derivative_exists_cache.set(path, "missing", DERIVATIVE_MISSING_TTL)
+    return exists
+
+
+@receiver(setting_changed)
+def clear_derivative_exists_cache(*, setting: str, **kwargs: Any) -> None:
+    if setting == "STORAGES":
+        derivative_exists_cache.clear()
+
+
+def build_picture_sources(
+    derivatives: Iterable[dict[str, Any]] | None,
+) -> list[dict[str, str]]:
+    """
+    Group ``derivatives`` into ``<source>`` entries ``{"type", "srcset"}``.
+
+    Sources keep the configured format order so browsers pick the first (most
+    compact) format they support. Renditions that are not in storage are left
+    out: browsers do not fall back to the ``<img>`` when a ``<source>`` fails.
+    """
+    srcsets: dict[str, list[str]] = {}
+    for derivative in derivatives or []:
+        if not isinstance(derivative, dict):
+            continue
+        image_format = derivative.get("format")
+        if image_format not in DERIVATIVE_MIME_TYPES:
+            continue
+        if not derivative_exists(derivative["path"]):
+            continue
+        url = get_upload_url(derivative["path"])
+        srcsets.setdefault(image_format, []).append(f"{url} {derivative['width']}w")
+    return [
+        {"type": DERIVATIVE_MIME_TYPES[image_format], "srcset": ", ".join(candidates)}
+        for image_format, candidates in srcsets.items()
+    ]
 
 
 class CustomFileObject:
@@ -119,7 +685,7 @@ class CustomFileObject:
 
     def __init__(self, filename):
         self.name = filename
-        self.url = default_storage.url(filename)
+        self.url = get_upload_url(filename)
 
     def __str__(self) -> str:
         return self.name
@@ -155,7 +721,13 @@ class ImageFormMixin:
 
     @staticmethod
     def get_image_url_for_field(image_path: str) -> str:
-        return default_storage.url(image_path)
+        return get_upload_url(image_path)
+
+    @staticmethod
+    def get_image_sources_for_field(
+        data: dict[str, Any], image_field: str
+    ) -> list[dict[str, str]]:
+        return build_picture_sources(data.get(f"{image_field}_derivatives"))
 
     @staticmethod
     def do_clean_image_field(
@@ -168,28 +740,30 @@ class ImageFormMixin:
         just_clear_the_image = clear_image and not hasattr(image, "temporary_file_path")
         if just_clear_the_image:
             cleaned_data[image_field] = None
+            cleaned_data[f"{image_field}_derivatives"] = []
             image_handled = True
 
-        set_new_image = isinstance(image, InMemoryUploadedFile) and not image_handled
+        set_new_image = isinstance(image, UploadedFile) and not image_handled
         if set_new_image:
             assert image is not None
             if image.size > 2 * 1024 * 1024:
                 raise forms.ValidationError("Image file too large ( > 2mb )")
-            cleaned_data[image_field] = default_storage.save(
-                f"uploads/{image.name}", ContentFile(image.read())
-            )
-            image_handled = True
-
-            # Add image dimensions to cleaned data
+            # Probe the upload before saving, so the stored copy is never re-read.
             try:
-                width, height = get_image_dimensions_from_storage(
-                    cleaned_data["avatar_img"]
-                )
+                width, height = get_image_metadata_from_bytesio(image, image.size)
             except UnknownImageFormat:
                 width, height = None, None
+            cleaned_data[image_field] = store_upload(image)
+            image_handled = True
+
+            # Add image dimensions to cleaned data
             cleaned_data[f"{image_field}_width"] = width
             cleaned_data[f"{image_field}_height"] = height
 
+            derivatives = plan_image_derivatives(cleaned_data[image_field], width)
+            cleaned_data[f"{image_field}_derivatives"] = derivatives
+            schedule_image_derivatives(cleaned_data[image_field], derivatives)
+
         keep_current_image = (
             not clear_image and isinstance(clear_image, str) and not image_handled
         )
@@ -205,4 +779,9 @@ class ImageFormMixin:
             cleaned_data = self.do_clean_image_field(
                 cleaned_data, image_field, clear_field
             )
+            derivatives_key = f"{image_field}_derivatives"
+            initial = cast(dict[str, Any], self.initial)  # type: ignore
+            if derivatives_key not in cleaned_data and initial.get(derivatives_key):
+                # The current image is kept, and with it its renditions.
+                cleaned_data[derivatives_key] = initial[derivatives_key]
         return cleaned_data
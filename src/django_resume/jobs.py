@@ -0,0 +1,235 @@
+"""
+Background jobs for slow resume operations.
+
+Views hand work that can take many seconds (fetching a JSON Resume document
+from a URL, installing an npm theme) to :func:`enqueue_job`, which stores a
+:class:`~django_resume.models.Job` row. ``DJANGO_RESUME_JOB_RUNNER`` decides
+who runs it:
+
+``"inline"``
+    The view runs the operation itself, as before. Views check
+    :func:`background_jobs_enabled` and keep their synchronous path.
+``"thread"``
+    A thread pool in the web process runs the job once the enqueuing
+    transaction commits.
+``"worker"``
+    The job waits in the database until ``python manage.py run_resume_jobs``
+    claims it.
+
+A job still running ``DJANGO_RESUME_JOB_TIMEOUT`` after it started was
+orphaned by a process that died; :func:`fail_stale_jobs` (run by every worker
+pass) marks it failed. Jobs left pending by a restarted ``"thread"`` runner are
+picked up by ``run_resume_jobs --once``. The status fragment stops polling a
+job once it is unfinished for longer than the timeout.
+
+Handlers are functions taking the job and returning a JSON-serializable
+result dict. They are named by dotted path in :data:`JOB_HANDLERS` (extended
+by ``DJANGO_RESUME_JOB_HANDLERS``) and imported on first use. A handler
+raises :class:`JobFailed` with a message for the owner; any other exception
+is logged and reported as a generic failure.
+"""
+
+import logging
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.db import close_old_connections, transaction
+from django.dispatch import receiver
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+JOB_RUNNER_SETTING = "DJANGO_RESUME_JOB_RUNNER"
+JOB_THREADS_SETTING = "DJANGO_RESUME_JOB_THREADS"
+JOB_HANDLERS_SETTING = "DJANGO_RESUME_JOB_HANDLERS"
+JOB_TIMEOUT_SETTING = "DJANGO_RESUME_JOB_TIMEOUT"
+JOB_RUNNERS = ("inline", "thread", "worker")
+DEFAULT_JOB_THREADS = 2
+DEFAULT_JOB_TIMEOUT = timedelta(minutes=15)
+UNEXPECTED_ERROR_MESSAGE = "The operation failed unexpectedly."
+INTERRUPTED_ERROR_MESSAGE = "The operation was interrupted. Please try again."
+
+JOB_HANDLERS = {
+    "json_resume.import_url": "django_resume.formats.json_resume.jobs.import_url",
+    "json_resume.install_theme": (
+        "django_resume.formats.json_resume.jobs.install_theme"
+    ),
+    "json_resume.use_catalog_theme": (
+        "django_resume.formats.json_resume.jobs.use_catalog_theme"
+    ),
+}
+
+JobHandler = Callable[[Job], dict[str, Any]]
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+class JobFailed(Exception):
+    """Raised by a handler to fail its job with a message for the owner."""
+
+
+def get_job_runner() -> str:
+    runner = getattr(settings, JOB_RUNNER_SETTING, "inline")
+    if runner not in JOB_RUNNERS:
+        raise ImproperlyConfigured(
+            f"{JOB_RUNNER_SETTING} must be one of {', '.join(JOB_RUNNERS)}."
+        )
+    return runner
+
+
+def background_jobs_enabled() -> bool:
+    return get_job_runner() != "inline"
+
+
+def get_job_timeout() -> timedelta:
+    timeout = getattr(settings, JOB_TIMEOUT_SETTING, DEFAULT_JOB_TIMEOUT)
+    if not isinstance(timeout, timedelta) or timeout <= timedelta(0):
+        raise ImproperlyConfigured(
+            f"{JOB_TIMEOUT_SETTING} must be a positive datetime.timedelta."
+        )
+    return timeout
+
+
+def is_job_stale(job: Job, now: datetime | None = None) -> bool:
+    """Whether ``job`` is unfinished for longer than the job timeout."""
+    if job.is_finished:
+        return False
+    since = job.started_at or job.created_at
+    return (now or timezone.now()) - since > get_job_timeout()
+
+
+def fail_stale_jobs(now: datetime | None = None) -> int:
+    """
+    Fail running jobs whose thread or worker died, return how many.
+
+    Such jobs are not run again: their handler may have had side effects
+    before the process died. The owner is asked to try again instead.
+    """
+    now = now or timezone.now()
+    return Job.objects.filter(
+        status=Job.Status.RUNNING, started_at__lt=now - get_job_timeout()
+    ).update(status=Job.Status.FAILED, error=INTERRUPTED_ERROR_MESSAGE, finished_at=now)
+
+
+def get_job_handler(kind: str) -> JobHandler:
+    handlers = {**JOB_HANDLERS, **getattr(settings, JOB_HANDLERS_SETTING, {})}
+    try:
+        path = handlers[kind]
+    except KeyError:
+        raise JobFailed(f"Unknown job kind {kind!r}.")
+    return import_string(path)
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, JOB_THREADS_SETTING, DEFAULT_JOB_THREADS),
+                thread_name_prefix="django-resume-job",
+            )
+        return _executor
+
+
+@receiver(setting_changed)
+def reset_executor(*, setting: str, **kwargs: Any) -> None:
+    global _executor
+    if setting == JOB_THREADS_SETTING:
+        with _executor_lock:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            _executor = None
+
+
+def enqueue_job(kind: str, *, owner, payload: dict[str, Any]) -> Job:
+    """Store a pending job and hand it to the configured runner.
+
+    With the ``inline`` runner the job has finished when this returns.
+    """
+    job = Job.objects.create(owner=owner, kind=kind, payload=payload)
+    runner = get_job_runner()
+    if runner == "inline":
+        run_job(job)
+    elif runner == "thread":
+        transaction.on_commit(lambda: get_executor().submit(run_job_in_thread, job.pk))
+    return job
+
+
+def claim_job(job_id: int | None = None) -> Job | None:
+    """Mark a pending job (the oldest, or ``job_id``) as running and return it.
+
+    The status is switched with a conditional update, so concurrent workers
+    never run the same job.
+    """
+    pending = Job.objects.filter(status=Job.Status.PENDING)
+    if job_id is not None:
+        pending = pending.filter(pk=job_id)
+    for candidate_id in pending.order_by("created_at", "pk").values_list(
+        "pk", flat=True
+    )[:10]:
+        claimed = Job.objects.filter(pk=candidate_id, status=Job.Status.PENDING).update(
+            status=Job.Status.RUNNING, started_at=timezone.now()
+        )
+        if claimed:
+            return Job.objects.get(pk=candidate_id)
+    return None
+
+
+def run_job(job: Job) -> Job:
+    """Run ``job``'s handler and store its result or error."""
+    if job.status == Job.Status.PENDING:
+        job.status = Job.Status.RUNNING
+        job.started_at = timezone.now()
+        job.save(update_fields=["status", "started_at"])
+    try:
+        result = get_job_handler(job.kind)(job)
+    except JobFailed as exc:
+        job.status = Job.Status.FAILED
+        job.error = str(exc)
+    except Exception:
+        logger.exception("django-resume job %s (%s) failed", job.pk, job.kind)
+        job.status = Job.Status.FAILED
+        job.error = UNEXPECTED_ERROR_MESSAGE
+    else:
+        job.status = Job.Status.SUCCEEDED
+        job.result = result
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "result", "error", "finished_at"])
+    return job
+
+
+def run_job_in_thread(job_id: int) -> None:
+    close_old_connections()
+    try:
+        job = claim_job(job_id)
+        if job is not None:
+            run_job(job)
+    finally:
+        close_old_connections()
+
+
+def run_pending_jobs(limit: int | None = None) -> int:
+    """
+    Claim and run pending jobs until none are left or ``limit`` ran.
+
+    Stale running jobs are failed first, see :func:`fail_stale_jobs`.
+    """
+    fail_stale_jobs()
+    count = 0
+    while limit is None or count < limit:
+        job = claim_job()
+        if job is None:
+            break
+        run_job(job)
+        count += 1
+    return count
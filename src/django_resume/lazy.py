@@ -0,0 +1,28 @@
+"""
+Import feature modules on first use.
+
+The JSON Resume importer and theme support pull in ``jsonschema``, the HTTP
+client and the theme runner. Views and commands that offer them refer to
+their functions through :func:`lazy_function`, so a worker that never imports
+a document or renders a JSON Resume theme never loads them.
+"""
+
+from collections.abc import Callable
+from importlib import import_module
+from typing import Any
+
+
+def lazy_function(module_name: str, name: str) -> Callable[..., Any]:
+    """A stand-in for ``module_name.name`` that imports the module when called.
+
+    The function is looked up on every call, so patching it in
+    ``module_name`` keeps working.
+    """
+
+    def call(*args: Any, **kwargs: Any) -> Any:
+        return getattr(import_module(module_name), name)(*args, **kwargs)
+
+    call.__name__ = call.__qualname__ = name
+    call.__module__ = module_name
+    call.__doc__ = f"Lazily imported :func:`{module_name}.{name}`."
+    return call
@@ -0,0 +1,38 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...models import Resume
+from ...plugins.tokens import UNSET_TTL, create_share_link
+
+
+class Command(BaseCommand):
+    help = "Print signed, expiring CV share links for one or more receivers"
+
+    def add_arguments(self, parser):
+        parser.add_argument("slug", type=str, help="Slug of the resume to share")
+        parser.add_argument(
+            "receivers",
+            nargs="*",
+            type=str,
+            help="Receiver labels; one link is printed per receiver",
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=None,
+            help="Days until the links expire (default: DJANGO_RESUME_TOKEN_TTL)",
+        )
+
+    def handle(self, *args, **options):
+        slug = options["slug"]
+        try:
+            resume = Resume.objects.get(slug=slug)
+        except Resume.DoesNotExist:
+            raise CommandError(f"No resume found with slug {slug!r}")
+
+        days = options["days"]
+        expires_in = UNSET_TTL if days is None else timedelta(days=days)
+        for receiver in options["receivers"] or [""]:
+            link = create_share_link(resume, receiver=receiver, expires_in=expires_in)
+            self.stdout.write(f"{receiver}\t{link}" if receiver else link)
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+
+from ...plugins.tokens import (
+    PRUNE_TOKENS_BATCH_SIZE,
+    TokenPruneResult,
+    prune_expired_tokens,
+)
+
+
+class Command(BaseCommand):
+    help = "Remove CV access tokens older than DJANGO_RESUME_TOKEN_TTL"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=PRUNE_TOKENS_BATCH_SIZE,
+            help="Number of resumes updated per transaction",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many expired tokens would be removed",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        result = prune_expired_tokens(
+            batch_size=options["batch_size"],
+            dry_run=dry_run,
+            progress=self.report_progress,
+        )
+        verb = "Would prune" if dry_run else "Pruned"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {result.tokens} expired tokens from {result.resumes} resumes"
+            )
+        )
+
+    def report_progress(self, result: TokenPruneResult) -> None:
+        self.stdout.write(
+            f"Processed batch: {result.tokens} expired tokens in "
+            f"{result.resumes} resumes so far"
+        )
@@ -0,0 +1,80 @@
+from django.core.files.storage import FileSystemStorage, InvalidStorageError, storages
+from django.core.management.base import BaseCommand, CommandError
+
+from ...models import Resume
+from ...publishing import publish_resumes
+
+
+class Command(BaseCommand):
+    help = "Render the public resume pages and their assets to static files"
+
+    def add_arguments(self, parser):
+        target = parser.add_mutually_exclusive_group(required=True)
+        target.add_argument(
+            "--output",
+            type=str,
+            help="Directory the pages and assets are written to",
+        )
+        target.add_argument(
+            "--storage",
+            type=str,
+            help="Alias of a configured STORAGES backend to write to",
+        )
+        parser.add_argument(
+            "--slug",
+            action="append",
+            dest="slugs",
+            help="Only publish this resume (may be repeated)",
+        )
+        parser.add_argument(
+            "--protected-path",
+            type=str,
+            default="",
+            help=(
+                "Publish token-protected pages below this path prefix instead "
+                "of skipping them"
+            ),
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Re-publish resumes whose revision has not changed",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report what would be published",
+        )
+
+    def handle(self, *args, **options):
+        if options["output"]:
+            storage = FileSystemStorage(location=options["output"])
+        else:
+            try:
+                storage = storages[options["storage"]]
+            except InvalidStorageError as error:
+                raise CommandError(str(error))
+        protected_path = options["protected_path"].strip("/")
+        if ".." in protected_path.split("/"):
+            raise CommandError("--protected-path must not contain '..'")
+        dry_run = options["dry_run"]
+        result = publish_resumes(
+            storage,
+            slugs=options["slugs"],
+            protected_path=protected_path,
+            force=options["force"],
+            dry_run=dry_run,
+            progress=self.report_progress,
+        )
+        verb = "Would publish" if dry_run else "Published"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {result.pages} pages and {result.assets} assets for "
+                f"{result.resumes} resumes; {result.unchanged} unchanged, "
+                f"{result.skipped_pages} pages not public, "
+                f"{result.removed} removed resumes"
+            )
+        )
+
+    def report_progress(self, resume: Resume, files: list[str]) -> None:
+        self.stdout.write(f"{resume.slug}: {', '.join(files) or 'no public pages'}")
@@ -1,6 +1,6 @@
 from django.core.management.base import BaseCommand
 
-from ...models import Resume
+from ...models import REMOVE_PLUGIN_DATA_BATCH_SIZE, Resume
 
 
 class Command(BaseCommand):
@@ -12,12 +12,35 @@ class Command(BaseCommand):
             type=str,
             help="Name of the plugin for which all data should be remove",
         )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=REMOVE_PLUGIN_DATA_BATCH_SIZE,
+            help="Number of resumes updated per transaction",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many resumes have data for the plugin",
+        )
 
     def handle(self, *args, **options):
         plugin_name = options["plugin_name"]
-        Resume.objects.remove_plugin_data_by_name(plugin_name)
+        if options["dry_run"]:
+            count = Resume.objects.remove_plugin_data_by_name(plugin_name, dry_run=True)
+            self.stdout.write(f"{count} resumes have data for plugin: {plugin_name}")
+            return
+        count = Resume.objects.remove_plugin_data_by_name(
+            plugin_name,
+            batch_size=options["batch_size"],
+            progress=self.report_progress,
+        )
         self.stdout.write(
             self.style.SUCCESS(
-                f"Successfully deleted all data for plugin: {plugin_name}"
+                f"Successfully deleted all data for plugin: {plugin_name} "
+                f"({count} resumes)"
             )
         )
+
+    def report_progress(self, removed: int, total: int) -> None:
+        self.stdout.write(f"Removed data from {removed}/{total} resumes")
@@ -0,0 +1,47 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.template.defaultfilters import filesizeformat
+
+from ...images import DEFAULT_ORPHAN_GRACE, remove_orphaned_uploads
+
+
+class Command(BaseCommand):
+    help = "Delete uploaded files that are no longer referenced by any resume"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--grace-hours",
+            type=float,
+            default=DEFAULT_ORPHAN_GRACE.total_seconds() / 3600,
+            help="Keep unreferenced files younger than this many hours",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report which files would be deleted",
+        )
+        parser.add_argument(
+            "--include-legacy",
+            action="store_true",
+            help=(
+                "Also delete unreferenced files below uploads/ that are not "
+                "content-addressed. Only use this if no other code stores "
+                "files there."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        result = remove_orphaned_uploads(
+            grace=timedelta(hours=options["grace_hours"]),
+            dry_run=dry_run,
+            include_legacy=options["include_legacy"],
+        )
+        verb = "Would remove" if dry_run else "Removed"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {result.files} orphaned uploads, reclaiming "
+                f"{filesizeformat(result.bytes)} ({result.bytes} bytes)"
+            )
+        )
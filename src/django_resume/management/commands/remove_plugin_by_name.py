@@ -2,7 +2,7 @@ from pathlib import Path
 
 from django.core.management.base import BaseCommand
 
-from ...models import Resume
+from ...models import REMOVE_PLUGIN_DATA_BATCH_SIZE, Resume
 from ._path_safety import resolve_within, validate_plugin_name
 
 
@@ -15,10 +15,22 @@ class Command(BaseCommand):
             type=str,
             help="Name of the plugin for which all data should be removed",
         )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=REMOVE_PLUGIN_DATA_BATCH_SIZE,
+            help="Number of resumes updated per transaction",
+        )
 
     def handle(self, *args, **options):
         plugin_name = validate_plugin_name(options["plugin_name"])
-        Resume.objects.remove_plugin_data_by_name(plugin_name)
+        Resume.objects.remove_plugin_data_by_name(
+            plugin_name,
+            batch_size=options["batch_size"],
+            progress=lambda removed, total: self.stdout.write(
+                f"Removed data from {removed}/{total} resumes"
+            ),
+        )
 
         plugin_file_name = f"{plugin_name}.py"
         plugin_path = resolve_within(Path.cwd() / "core" / "plugins", plugin_file_name)
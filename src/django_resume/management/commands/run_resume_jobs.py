@@ -0,0 +1,49 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from ...jobs import run_pending_jobs
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued django-resume background jobs (DJANGO_RESUME_JOB_RUNNER = 'worker')"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help=(
+                "Run the pending jobs and exit instead of polling for new ones. "
+                "Also drains jobs left pending by the thread runner."
+            ),
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait between polls when the queue is empty",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=None,
+            help="Exit after running this many jobs",
+        )
+
+    def handle(self, *args, **options):
+        limit = options["limit"]
+        total = 0
+        while limit is None or total < limit:
+            close_old_connections()
+            count = run_pending_jobs(None if limit is None else limit - total)
+            total += count
+            if count:
+                self.stdout.write(f"Ran {count} jobs")
+            if options["once"]:
+                break
+            if not count:
+                time.sleep(options["interval"])
+        self.stdout.write(self.style.SUCCESS(f"Ran {total} jobs in total"))
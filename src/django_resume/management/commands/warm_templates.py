@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from ...themes import warm_templates
+
+
+class Command(BaseCommand):
+    help = (
+        "Compile all page and plugin templates for every theme and report missing ones"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--theme",
+            action="append",
+            dest="themes",
+            help="Only check this theme (may be repeated)",
+        )
+
+    def handle(self, *args, **options):
+        result = warm_templates(options["themes"])
+        for template_name, themes in result.page_themes.items():
+            self.stdout.write(f"page {template_name}: {', '.join(themes) or '-'}")
+        for plugin_name, themes in result.plugin_themes.items():
+            self.stdout.write(f"plugin {plugin_name}: {', '.join(themes) or '-'}")
+        for path in result.missing:
+            self.stdout.write(self.style.WARNING(f"Missing template {path}"))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Compiled {result.compiled} templates, {len(result.missing)} missing"
+            )
+        )
@@ -0,0 +1,39 @@
+from importlib.metadata import entry_points
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...pages import ENTRY_POINT_GROUP
+from ...pages.discovery import get_manifest_path, write_manifest
+
+
+class Command(BaseCommand):
+    help = (
+        "Record the installed page entry points in a manifest read at startup "
+        "instead of scanning all distributions"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            help=(
+                "Manifest file to write "
+                "(default: DJANGO_RESUME_PAGE_ENTRY_POINT_MANIFEST)"
+            ),
+        )
+
+    def handle(self, *args, **options):
+        path = options["output"] or get_manifest_path()
+        if not path:
+            raise CommandError(
+                "Pass --output or set DJANGO_RESUME_PAGE_ENTRY_POINT_MANIFEST"
+            )
+        found = list(entry_points(group=ENTRY_POINT_GROUP))
+        try:
+            write_manifest(path, ENTRY_POINT_GROUP, found)
+        except OSError as exc:
+            raise CommandError(f"Could not write {path}: {exc}") from exc
+        for entry_point in found:
+            self.stdout.write(f"{entry_point.name} = {entry_point.value}")
+        self.stdout.write(
+            self.style.SUCCESS(f"Wrote {len(found)} page entry points to {path}")
+        )
@@ -1,7 +1,7 @@
 import html
 import re
 from urllib.parse import unquote
-from typing import Callable
+from typing import Callable, Iterable
 
 import nh3
 
@@ -90,63 +90,177 @@ def markdown_to_plain_text(text: str) -> str:
     return text.strip()
 
 
+BOLD_RE = re.compile(r"\*\*(.*?)\*\*")
+ITALIC_RE = re.compile(r"\*(.*?)\*")
+LINK_RE = re.compile(r"\[(.*?)\]\(((?:[^()]|\([^()]*\))*)\)")
+HEADING_RE = re.compile(r"(#{1,6})\s*(.*)")
+# Private use character joining fragments for one sanitizer call; it passes
+# through nh3 unchanged.
+FRAGMENT_SEPARATOR = "\ue000"
+SANITIZED_TAG_RE = re.compile(r"<(/?)(a|em|h[1-6]|strong)\b[^>]*>")
+
+
 def markdown_to_html(text: str, handlers: dict[str, Callable] | None = None) -> str:
     """
     Really simple markdown to HTML converter.
 
     You can pass a dictionary of handlers to customize the output.
-    """
-    if handlers is None:
-        handlers = {}
-
-    # Headings
-    def render_heading(m):
-        level = len(m.group(1))
-        content = m.group(2).strip()
-        if "heading" in handlers:
-            return handlers["heading"](level, content)
-        else:
-            return f"<h{level}>{content}</h{level}>"
 
-    text = re.sub(
-        r"^(#{1,6})\s*(.*)",
-        render_heading,
-        text,
-        flags=re.MULTILINE,
-    )
-
-    # Bold
-    def render_bold(m):
-        content = m.group(1)
-        if "bold" in handlers:
-            return handlers["bold"](content)
-        else:
-            return f"<strong>{content}</strong>"
+    Each line is either a heading or scanned once for ``**`` and ``*``
+    delimiters, which are paired as the previous regex passes paired them.
+    Text containing ``[`` gets one more pass matching links over the joined
+    lines, because a link may span emphasis tags and its URL may span lines;
+    other text is joined with ``<br>`` directly. The result is sanitized once.
+    Custom ``bold`` and ``italic`` handlers get the raw content between their
+    delimiters and their output is scanned again, as before, so lines with
+    asterisks still go through the bold and italic patterns for them.
+    """
+    return sanitize_html(_render_markdown(text, handlers or {}))
 
-    text = re.sub(r"\*\*(.*?)\*\*", render_bold, text)
 
-    # Italic
-    def render_italic(m):
-        content = m.group(1)
-        if "italic" in handlers:
-            return handlers["italic"](content)
-        else:
-            return f"<em>{content}</em>"
-
-    text = re.sub(r"\*(.*?)\*", render_italic, text)
+def markdown_to_html_batch(
+    texts: Iterable[str], handlers: dict[str, Callable] | None = None
+) -> list[str]:
+    """
+    Convert many markdown fragments to sanitized HTML, like ``markdown_to_html``.
+
+    Fragments without raw HTML are sanitized together in one ``nh3.clean``
+    call. Fragments that contain ``<`` are sanitized on their own, because an
+    unclosed tag in one of them could otherwise leak into the next. Misnested
+    markdown such as ``[*x](url*)`` can still leave a formatting element open
+    across the separator; if any split piece is unbalanced, the batched
+    fragments are sanitized one by one instead.
+    """
+    texts = list(texts)
+    rendered = [_render_markdown(text, handlers or {}) for text in texts]
+    batched = [
+        index
+        for index, text in enumerate(texts)
+        if "<" not in text and FRAGMENT_SEPARATOR not in text
+    ]
+    batched_indexes = set(batched)
+    results = [
+        fragment if index in batched_indexes else sanitize_html(fragment)
+        for index, fragment in enumerate(rendered)
+    ]
+    if not batched:
+        return results
+    joined = FRAGMENT_SEPARATOR.join(rendered[index] for index in batched)
+    cleaned = sanitize_html(joined).split(FRAGMENT_SEPARATOR)
+    if len(cleaned) != len(batched) or not all(map(_is_balanced, cleaned)):
+        cleaned = [sanitize_html(rendered[index]) for index in batched]
+    for index, fragment in zip(batched, cleaned):
+        results[index] = fragment
+    return results
+
+
+def _is_balanced(fragment: str) -> bool:
+    """Whether every element the sanitizer allows is closed within ``fragment``."""
+    open_tags: list[str] = []
+    for m in SANITIZED_TAG_RE.finditer(fragment):
+        closing, tag = m.groups()
+        if not closing:
+            open_tags.append(tag)
+        elif not open_tags or open_tags.pop() != tag:
+            return False
+    return not open_tags
+
+
+def _emphasis_tags(line: str) -> str:
+    """
+    Replace ``**`` and ``*`` delimiters in one line with ``<strong>``/``<em>``.
 
-    # Links
-    def render_link(m):
-        link_text = m.group(1)
-        url = m.group(2)
-        if "link" in handlers:
-            return handlers["link"](link_text, url)
+    Delimiters are paired as the bold and then the italic pattern would pair
+    them: ``**`` runs left to right, then the remaining single asterisks two by
+    two. Pairs may cross; the sanitizer balances the tags.
+    """
+    tags: list[tuple[int, int, str]] = []
+    bold_positions = set()
+    position = 0
+    while (start := line.find("**", position)) >= 0:
+        end = line.find("**", start + 2)
+        if end < 0:
+            break
+        tags.append((start, 2, "<strong>"))
+        tags.append((end, 2, "</strong>"))
+        bold_positions.update((start, start + 1, end, end + 1))
+        position = end + 2
+    opening = True
+    position = line.find("*")
+    single_tags = []
+    while position >= 0:
+        if position not in bold_positions:
+            single_tags.append((position, 1, "<em>" if opening else "</em>"))
+            opening = not opening
+        position = line.find("*", position + 1)
+    if not opening:
+        single_tags.pop()  # an unpaired asterisk stays as it is
+    tags.extend(single_tags)
+    tags.sort()
+    parts = []
+    position = 0
+    for start, width, tag in tags:
+        parts.append(line[position:start])
+        parts.append(tag)
+        position = start + width
+    parts.append(line[position:])
+    return "".join(parts)
+
+
+def _render_markdown(text: str, handlers: dict[str, Callable]) -> str:
+    heading_handler = handlers.get("heading")
+    bold_handler = handlers.get("bold")
+    italic_handler = handlers.get("italic")
+    link_handler = handlers.get("link")
+
+    def render_bold(m: re.Match[str]) -> str:
+        if bold_handler is not None:
+            return bold_handler(m.group(1))
+        return f"<strong>{m.group(1)}</strong>"
+
+    def render_italic(m: re.Match[str]) -> str:
+        if italic_handler is not None:
+            return italic_handler(m.group(1))
+        return f"<em>{m.group(1)}</em>"
+
+    def render_emphasis(line: str) -> str:
+        if "*" not in line:
+            return line
+        if bold_handler is None and italic_handler is None:
+            return _emphasis_tags(line)
+        # Custom handlers get the raw content of their delimiters.
+        return ITALIC_RE.sub(render_italic, BOLD_RE.sub(render_bold, line))
+
+    def render_link(m: re.Match[str]) -> str:
+        if link_handler is not None:
+            return link_handler(m.group(1), m.group(2))
+        return f'<a href="{m.group(2)}">{m.group(1)}</a>'
+
+    lines = text.split("\n")
+    rendered: list[str] = []
+    index = 0
+    while index < len(lines):
+        line = lines[index]
+        index += 1
+        if not line.startswith("#"):
+            rendered.append(render_emphasis(line))
+            continue
+        m = HEADING_RE.match(line)
+        assert m is not None
+        level = len(m.group(1))
+        content = m.group(2)
+        # As in "#\s*(.*)" over the whole text, blank lines after an empty
+        # heading are skipped and the next line becomes its content.
+        while not content.strip() and index < len(lines):
+            content = lines[index]
+            index += 1
+        content = content.strip()
+        if heading_handler is not None:
+            rendered.append(render_emphasis(heading_handler(level, content)))
         else:
-            return f'<a href="{url}">{link_text}</a>'
-
-    text = re.sub(r"\[(.*?)\]\(((?:[^()]|\([^()]*\))*)\)", render_link, text)
-
-    # Just replace newlines with <br>
-    text = text.replace("\n", "<br>")
-
-    return sanitize_html(text)
+            rendered.append(f"<h{level}>{render_emphasis(content)}</h{level}>")
+    if not any("[" in line for line in rendered):
+        return "<br>".join(rendered)
+    # Links may span emphasis tags, and their URL may span lines.
+    html = LINK_RE.sub(render_link, "\n".join(rendered))
+    return html.replace("\n", "<br>")
@@ -0,0 +1,84 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+PROVENANCE_KEYS = (
+    "source_document",
+    "source_adapter_document",
+    "source_plugin_data",
+    "preserved_extensions",
+)
+
+
+def move_provenance_out_of_resume(apps, schema_editor):
+    Resume = apps.get_model("django_resume", "Resume")
+    ResumeProvenance = apps.get_model("django_resume", "ResumeProvenance")
+    for resume in Resume.objects.only("id", "integration_data").iterator():
+        integration_data = resume.integration_data
+        if not isinstance(integration_data, dict):
+            continue
+        json_resume_state = integration_data.get("json_resume")
+        if not isinstance(json_resume_state, dict):
+            continue
+        provenance = {
+            key: json_resume_state.pop(key)
+            for key in PROVENANCE_KEYS
+            if key in json_resume_state
+        }
+        if not provenance:
+            continue
+        ResumeProvenance.objects.create(
+            resume_id=resume.id, data={"json_resume": provenance}
+        )
+        if not json_resume_state:
+            integration_data.pop("json_resume")
+        resume.integration_data = integration_data
+        resume.save(update_fields=["integration_data"])
+
+
+def move_provenance_into_resume(apps, schema_editor):
+    Resume = apps.get_model("django_resume", "Resume")
+    ResumeProvenance = apps.get_model("django_resume", "ResumeProvenance")
+    for provenance in ResumeProvenance.objects.iterator():
+        resume = Resume.objects.only("id", "integration_data").get(
+            id=provenance.resume_id
+        )
+        integration_data = resume.integration_data or {}
+        for format_id, state in provenance.data.items():
+            integration_data.setdefault(format_id, {}).update(state)
+        resume.integration_data = integration_data
+        resume.save(update_fields=["integration_data"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_resume", "0002_resume_integration_data"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ResumeProvenance",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("data", models.JSONField(blank=True, default=dict)),
+                (
+                    "resume",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="provenance",
+                        to="django_resume.resume",
+                    ),
+                ),
+            ],
+        ),
+        migrations.RunPython(
+            move_provenance_out_of_resume, move_provenance_into_resume
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 6.1.2 on 2026-10-19 07:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_resume", "0003_resumeprovenance"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TokenAccess",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("token_id", models.CharField(max_length=255)),
+                ("page", models.CharField(max_length=255)),
+                ("accessed_at", models.DateTimeField()),
+                (
+                    "resume",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="token_accesses",
+                        to="django_resume.resume",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["resume", "token_id"],
+                        name="django_resu_resume__978656_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -1,21 +1,155 @@
-from django.db import models, transaction
+import re
+from collections.abc import Callable, Iterable
+
+from django.db import DEFAULT_DB_ALIAS, NotSupportedError, connections, models
+from django.db import transaction
+from django.db.models.fields.json import KeyTransform
+from django.db.models.query import ModelIterable
 from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+PLUGIN_DATA_KEY_PREFIX = "plugin_data_key__"
+REMOVE_PLUGIN_DATA_BATCH_SIZE = 500
+
+
+class PartialPluginDataIterable(ModelIterable):
+    """
+    Rebuild ``plugin_data`` from the per-key annotations added by
+    :meth:`ResumeQuerySet.with_plugin_data_keys`.
+    """
+
+    def __iter__(self):
+        for resume in super().__iter__():
+            plugin_data = {}
+            for attr_name in list(vars(resume)):
+                if not attr_name.startswith(PLUGIN_DATA_KEY_PREFIX):
+                    continue
+                value = vars(resume).pop(attr_name)
+                if value is not None:
+                    plugin_data[attr_name.removeprefix(PLUGIN_DATA_KEY_PREFIX)] = value
+            resume.plugin_data = plugin_data
+            resume.plugin_data_is_partial = True
+            yield resume
+
+
+class ResumeQuerySet(models.QuerySet["Resume"]):
+    def with_plugin_data_keys(self, plugin_names: Iterable[str]) -> "ResumeQuerySet":
+        """
+        Load only the given top-level ``plugin_data`` keys.
+
+        The keys are extracted by the database, so the rest of the (possibly
+        large) JSON document never leaves it. Resumes loaded this way refuse to
+        save ``plugin_data``, because that would drop the keys left behind.
+        """
+        annotations = {
+            f"{PLUGIN_DATA_KEY_PREFIX}{name}": KeyTransform(name, "plugin_data")
+            for name in dict.fromkeys(plugin_names)
+        }
+        queryset = self.defer("plugin_data").annotate(**annotations)
+        queryset._iterable_class = PartialPluginDataIterable
+        return queryset
+
+
+class JSONRemoveKey(models.Func):
+    """
+    Remove a top-level key from a JSON column inside the database.
+
+    Compiles to ``column - 'key'`` on PostgreSQL and ``JSON_REMOVE`` on SQLite
+    and MySQL. Other backends are not supported, see :func:`can_remove_json_key`.
+    """
+
+    output_field = models.JSONField()
+
+    def __init__(self, expression, key: str) -> None:
+        super().__init__(expression)
+        self.key = key
 
+    def _json_remove(self, compiler, connection, **extra_context):
+        sql, params = compiler.compile(self.source_expressions[0])
+        return f"JSON_REMOVE({sql}, %s)", (*params, f'$."{self.key}"')
 
-class ResumeManager(models.Manager["Resume"]):
-    def remove_plugin_data_by_name(self, plugin_name: str) -> None:
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self._json_remove(compiler, connection, **extra_context)
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return self._json_remove(compiler, connection, **extra_context)
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        sql, params = compiler.compile(self.source_expressions[0])
+        return f"({sql} - %s::text)", (*params, self.key)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        raise NotSupportedError(
+            f"JSONRemoveKey is not supported on {connection.vendor}."
+        )
+
+
+SAFE_JSON_KEY_RE = re.compile(r"^[A-Za-z0-9_-]+$")
+
+
+def can_remove_json_key(key: str, *, using: str = DEFAULT_DB_ALIAS) -> bool:
+    """Whether :class:`JSONRemoveKey` can remove ``key`` on database ``using``."""
+    vendor = connections[using].vendor
+    if vendor == "postgresql":
+        return True
+    # JSON paths quote the key, so keep to characters that need no escaping.
+    return vendor in ("sqlite", "mysql") and bool(SAFE_JSON_KEY_RE.match(key))
+
+
+class ResumeManager(models.Manager.from_queryset(ResumeQuerySet)):  # type: ignore[misc]
+    def remove_plugin_data_by_name(
+        self,
+        plugin_name: str,
+        *,
+        batch_size: int = REMOVE_PLUGIN_DATA_BATCH_SIZE,
+        dry_run: bool = False,
+        progress: Callable[[int, int], object] | None = None,
+    ) -> int:
+        """
+        Remove the ``plugin_name`` key from every resume's ``plugin_data``.
+
+        Rows are updated in batches of ``batch_size``, each in its own short
+        transaction, and where the database supports it the key is removed in
+        place without loading ``plugin_data`` into Python. ``progress`` is
+        called with ``(removed, total)`` after each batch. Returns the number of
+        resumes that had the key; with ``dry_run`` nothing is changed.
+        """
+        queryset = self.filter(plugin_data__has_key=plugin_name)
+        total = queryset.count()
+        if dry_run or total == 0:
+            return total
+        in_database = can_remove_json_key(plugin_name, using=self.db)
+        removed = 0
+        last_pk = None
+        while True:
+            batch = queryset.order_by("pk")
+            if last_pk is not None:
+                batch = batch.filter(pk__gt=last_pk)
+            pks = list(batch.values_list("pk", flat=True)[:batch_size])
+            if not pks:
+                break
+            last_pk = pks[-1]
+            with transaction.atomic(using=self.db):
+                if in_database:
+                    removed += self.filter(
+                        pk__in=pks, plugin_data__has_key=plugin_name
+                    ).update(plugin_data=JSONRemoveKey("plugin_data", plugin_name))
+                else:
+                    removed += self._remove_plugin_data_in_python(plugin_name, pks)
+            if progress is not None:
+                progress(removed, total)
+        return removed
+
+    def _remove_plugin_data_in_python(self, plugin_name: str, pks: list[int]) -> int:
         resumes_to_update = []
-        for resume in self.only("id", "plugin_data"):
+        for resume in (
+            self.filter(pk__in=pks).select_for_update().only("id", "plugin_data")
+        ):
             if plugin_name not in resume.plugin_data:
                 continue
-            plugin_data = dict(resume.plugin_data)
-            plugin_data.pop(plugin_name, None)
-            assert plugin_name not in plugin_data
-            resume.plugin_data = plugin_data
+            resume.plugin_data.pop(plugin_name)
             resumes_to_update.append(resume)
-        if resumes_to_update:
-            with transaction.atomic():
-                self.bulk_update(resumes_to_update, ["plugin_data"])
+        return self.bulk_update(resumes_to_update, ["plugin_data"])
 
 
 class Resume(models.Model):
@@ -27,6 +161,9 @@ class Resume(models.Model):
 
     objects: ResumeManager = ResumeManager()
 
+    # Set on instances loaded via ResumeQuerySet.with_plugin_data_keys.
+    plugin_data_is_partial: bool = False
+
     def __repr__(self) -> str:
         return f"<{self.name}>"
 
@@ -49,9 +186,125 @@ class Resume(models.Model):
             return theme_plugin.get_data(self).get("name", "plain")
         return "plain"
 
+    def get_provenance(self, format_id: str) -> dict:
+        """Return the stored import provenance for ``format_id``.
+
+        Provenance lives in :class:`ResumeProvenance`, so it is only fetched
+        when a caller (e.g. export) actually asks for it.
+        """
+        if self.pk is None:
+            return {}
+        data = (
+            ResumeProvenance.objects.filter(resume_id=self.pk)
+            .values_list("data", flat=True)
+            .first()
+        )
+        if not isinstance(data, dict):
+            return {}
+        state = data.get(format_id, {})
+        return state if isinstance(state, dict) else {}
+
     def save(self, *args, **kwargs) -> None:
+        update_fields = kwargs.get("update_fields")
+        if self.plugin_data_is_partial and (
+            update_fields is None or "plugin_data" in update_fields
+        ):
+            raise ValueError(
+                "Cannot save plugin_data of a resume loaded with only some "
+                "plugin data keys."
+            )
         if self.plugin_data is None:
             self.plugin_data = {}
         if self.integration_data is None:
             self.integration_data = {}
         super().save(*args, **kwargs)
+
+
+class ResumeProvenance(models.Model):
+    """
+    Import provenance for a resume, stored apart from the ``Resume`` row.
+
+    A JSON Resume import keeps the parsed source document, its adapter
+    projection, the imported plugin data and preserved extensions for exact
+    re-export. That is several full copies of the resume, which public page
+    views never render, so it lives in its own table keyed by format id.
+    """
+
+    resume = models.OneToOneField(
+        Resume, on_delete=models.CASCADE, related_name="provenance"
+    )
+    data = models.JSONField(default=dict, blank=True, null=False)
+
+    def __repr__(self) -> str:
+        return f"<ResumeProvenance {self.resume_id}>"
+
+
+class TokenAccess(models.Model):
+    """
+    One recorded open of a token-protected page.
+
+    Rows are written in batches by :mod:`django_resume.access_log` and never
+    touch the ``Resume`` row. The foreign key has no database constraint so
+    inserting hits does not lock the resume against concurrent editors.
+    """
+
+    resume = models.ForeignKey(
+        Resume,
+        on_delete=models.CASCADE,
+        related_name="token_accesses",
+        db_constraint=False,
+    )
+    token_id = models.CharField(max_length=255)
+    page = models.CharField(max_length=255)
+    accessed_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [models.Index(fields=["resume", "token_id"])]
+
+    def __repr__(self) -> str:
+        return f"<TokenAccess {self.resume_id} {self.token_id}>"
+
+
+class Job(models.Model):
+    """
+    A slow operation queued by a view and run by :mod:`django_resume.jobs`.
+
+    ``kind`` names the handler, ``payload`` holds its JSON arguments and
+    ``result`` the JSON it returned. ``error`` is the message shown to the
+    owner when the job failed.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        SUCCEEDED = "succeeded", "Succeeded"
+        FAILED = "failed", "Failed"
+
+    owner = models.ForeignKey(get_user_model(), on_delete=models.CASCADE)
+    kind = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(
+        max_length=20, choices=Status.choices, default=Status.PENDING
+    )
+    result = models.JSONField(default=dict, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "created_at"])]
+
+    def __repr__(self) -> str:
+        return f"<Job {self.pk} {self.kind} {self.status}>"
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (self.Status.SUCCEEDED, self.Status.FAILED)
+
+    @property
+    def is_stale(self) -> bool:
+        """Unfinished for longer than ``DJANGO_RESUME_JOB_TIMEOUT``."""
+        from .jobs import is_job_stale  # jobs imports the models
+
+        return is_job_stale(self)
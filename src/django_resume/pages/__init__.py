@@ -1,9 +1,10 @@
-from importlib.metadata import entry_points
+from importlib.metadata import EntryPoint, entry_points
 
 from django.utils.module_loading import autodiscover_modules
 
 from .base import ByCapability, ResumePage, by_capability
 from .builtins import register_builtin_pages
+from .discovery import get_manifest_path, read_manifest
 from .registry import PageRegistry, page_registry
 
 #: Entry-point group through which a separately distributed package registers
@@ -18,6 +19,22 @@ ENTRY_POINT_GROUP = "django_resume.pages"
 _loaded_entry_points: set[tuple[str, str]] = set()
 
 
+def get_page_entry_points() -> list[EntryPoint]:
+    """The entry points of :data:`ENTRY_POINT_GROUP`.
+
+    Read from the manifest configured by
+    ``DJANGO_RESUME_PAGE_ENTRY_POINT_MANIFEST`` while it matches the installed
+    distributions (see :mod:`django_resume.pages.discovery`), otherwise from
+    the metadata of every installed distribution.
+    """
+    manifest_path = get_manifest_path()
+    if manifest_path is not None:
+        from_manifest = read_manifest(manifest_path, ENTRY_POINT_GROUP)
+        if from_manifest is not None:
+            return from_manifest
+    return list(entry_points(group=ENTRY_POINT_GROUP))
+
+
 def load_entry_point_pages() -> None:
     """Register pages contributed by separately distributed packages.
 
@@ -33,7 +50,7 @@ def load_entry_point_pages() -> None:
     autodiscovered ``resume_pages`` modules. Each entry point is processed at
     most once (see :data:`_loaded_entry_points`), so the call is idempotent.
     """
-    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+    for entry_point in get_page_entry_points():
         identity = (entry_point.name, entry_point.value)
         if identity in _loaded_entry_points:
             continue
@@ -87,5 +104,6 @@ __all__ = [
     "register_builtin_pages",
     "autodiscover_pages",
     "load_entry_point_pages",
+    "get_page_entry_points",
     "ENTRY_POINT_GROUP",
 ]
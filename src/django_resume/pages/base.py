@@ -6,10 +6,14 @@ from django.http import HttpRequest, HttpResponse
 from django.shortcuts import get_object_or_404, render
 from django.template import TemplateDoesNotExist
 from django.template.loader import get_template
-from django.urls import reverse
 
 from ..models import Resume
 from ..plugins import plugin_registry
+from ..plugins.base import Plugin
+from ..plugins.theme import ThemePlugin
+from ..plugins.tokens import TokenPlugin
+from ..themes import theme_support
+from ..url_templates import reverse_cached
 
 
 @dataclass(frozen=True)
@@ -75,6 +79,22 @@ def build_base_context(request: HttpRequest, resume: Resume) -> dict:
     }
 
 
+def resolve_section_plugins(
+    section_names: list[str] | str | ByCapability,
+) -> list[Plugin]:
+    """The registered plugins selected by a page's ``section_names``.
+
+    Capability and name selections are answered from the registry's memoized
+    indexes, so this is a dict lookup per request."""
+    if isinstance(section_names, ByCapability):
+        return plugin_registry.get_plugins_by_capability(
+            section_names.capabilities, match=section_names.match
+        )
+    if section_names == "__all__":
+        return plugin_registry.get_all_plugins()
+    return plugin_registry.get_plugins_by_name(section_names)
+
+
 def build_section_context(
     request: HttpRequest,
     resume: Resume,
@@ -85,20 +105,7 @@ def build_section_context(
     show_edit_button = base_context.get("show_edit_button", False)
     if theme is None:
         theme = resume.current_theme
-    if isinstance(section_names, ByCapability):
-        plugins = [
-            plugin
-            for plugin in plugin_registry.get_all_plugins()
-            if section_names.matches(plugin)
-        ]
-    elif section_names == "__all__":
-        plugins = plugin_registry.get_all_plugins()
-    else:
-        plugins = [
-            plugin
-            for plugin in (plugin_registry.get_plugin(name) for name in section_names)
-            if plugin is not None
-        ]
+    plugins = resolve_section_plugins(section_names)
     # Each plugin receives a fresh empty per-plugin context (context={}),
     # exactly as the current resume_detail / resume_cv views do. Page-level
     # data lives in base_context; plugins are not meant to see each other's
@@ -134,14 +141,16 @@ def resolve_page_theme(resume: Resume, template_name: str) -> str:
     Returns the resume's current theme when that theme ships the template, and
     otherwise falls back to ``plain`` -- so a theme that lacks a page template
     renders predictably instead of raising ``TemplateDoesNotExist``. The
-    ``plain`` theme short-circuits (it is the fallback, so no lookup is needed).
+    ``plain`` theme short-circuits (it is the fallback, so no lookup is needed),
+    and themes recorded by the template warm-up are answered without a lookup.
     """
     theme = resume.current_theme
     if theme == "plain":
         return theme
-    if _template_exists(page_template_name(theme, template_name)):
-        return theme
-    return "plain"
+    supported = theme_support.has_page_template(theme, template_name)
+    if supported is None:
+        supported = _template_exists(page_template_name(theme, template_name))
+    return theme if supported else "plain"
 
 
 def page_template_path(resume: Resume, template_name: str) -> str:
@@ -166,6 +175,22 @@ class ResumePage:
     # Navigation group label. Links sharing a ``nav_group`` render together; the
     # empty default keeps a page in the implicit ungrouped bucket.
     nav_group: str = ""
+    # Plugins whose data the page reads outside its sections: the CV token gate
+    # (``check_access``, ``finalize_response`` and ``resume.token_is_required``
+    # in page templates). Loaded in addition to the section plugins.
+    access_plugin_names: tuple[str, ...] = (TokenPlugin.name,)
+
+    def get_plugin_data_keys(self) -> list[str] | None:
+        """Top-level ``plugin_data`` keys this page reads, or None for all.
+
+        Resolved from :attr:`section_names` plus :attr:`access_plugin_names` and
+        the theme plugin (``resume.current_theme``). ``dispatch_page`` loads only
+        these keys. Override (returning None) for pages that read other plugin
+        data, e.g. in a custom ``serve``."""
+        if self.section_names == "__all__":
+            return None
+        names = [plugin.name for plugin in resolve_section_plugins(self.section_names)]
+        return [ThemePlugin.name, *self.access_plugin_names, *names]
 
     def check_access(self, request: HttpRequest, resume: Resume) -> HttpResponse | None:
         """Return None to proceed, or a response to short-circuit."""
@@ -183,7 +208,7 @@ class ResumePage:
 
         Uses the ``django_resume`` application namespace so it resolves
         regardless of the instance namespace an integrator mounts the app under."""
-        return reverse(f"django_resume:{self.url_name}", kwargs={"slug": resume.slug})
+        return reverse_cached(f"django_resume:{self.url_name}", slug=resume.slug)
 
     def get_context(
         self, request: HttpRequest, resume: Resume, *, base_context: dict
@@ -211,7 +236,12 @@ class ResumePage:
 
 
 def dispatch_page(request: HttpRequest, slug: str, page: ResumePage) -> HttpResponse:
-    resume = get_object_or_404(Resume.objects.select_related("owner"), slug=slug)
+    # integration_data holds JSON Resume theme state that no page renders.
+    queryset = Resume.objects.select_related("owner").defer("integration_data")
+    plugin_data_keys = page.get_plugin_data_keys()
+    if plugin_data_keys is not None:
+        queryset = queryset.with_plugin_data_keys(plugin_data_keys)
+    resume = get_object_or_404(queryset, slug=slug)
     denied = page.check_access(request, resume)
     if denied is not None:
         return page.finalize_response(denied, request, resume)
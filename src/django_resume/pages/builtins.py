@@ -5,6 +5,7 @@ from django.core.exceptions import PermissionDenied
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import render
 
+from ..access_log import record_token_access
 from ..models import Resume
 from ..plugins import plugin_registry
 from ..plugins.tokens import TokenPlugin
@@ -62,11 +63,15 @@ class CvPage(ResumePage):
         if token_plugin is None:
             return None
         try:
-            TokenPlugin.check_permissions(
-                request, resume.plugin_data.get(TokenPlugin.name, {})
+            token_id = TokenPlugin.authorize(
+                request,
+                resume.plugin_data.get(TokenPlugin.name, {}),
+                resume_pk=resume.pk,
             )
         except PermissionDenied:
             return render_cv_403(request, resume, status=403)
+        if token_id is not None:
+            record_token_access(resume.pk, token_id, self.url_name)
         return None
 
     def finalize_response(
@@ -85,6 +90,7 @@ class PermissionDeniedPage(ResumePage):
     nav_order = 30
     nav_group = "Owner tools"
     # No section_names: serve() renders via render_cv_403 and bypasses get_context.
+    access_plugin_names = (TokenPlugin.name, "permission_denied")
 
     def is_visible(self, resume: Resume) -> bool:
         # The 403 editor is only meaningful when the resume gates its CV behind
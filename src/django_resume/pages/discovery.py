@@ -0,0 +1,118 @@
+"""
+Precomputed entry-point page discovery.
+
+``importlib.metadata.entry_points()`` reads the metadata of every installed
+distribution. With ``DJANGO_RESUME_PAGE_ENTRY_POINT_MANIFEST`` pointing to a
+manifest written by ``python manage.py write_page_manifest`` (at build time or
+on deploy), startup reads the page entry points from that file instead.
+
+The manifest records a fingerprint of the installed distributions: the names
+and modification times of the ``*.dist-info``/``*.egg-info`` entries on
+``sys.path``, which only takes a directory listing per path entry. The path
+list itself is not part of it, so the manifest written by ``manage.py`` matches
+in a web server whose ``sys.path[0]`` differs. Installing,
+upgrading or removing a distribution changes the fingerprint, and a stale,
+missing or unreadable manifest falls back to the metadata scan.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sys
+from importlib.metadata import EntryPoint
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+PAGE_ENTRY_POINT_MANIFEST_SETTING = "DJANGO_RESUME_PAGE_ENTRY_POINT_MANIFEST"
+MANIFEST_VERSION = 1
+METADATA_SUFFIXES = (".dist-info", ".egg-info", ".egg-link", ".pth")
+
+
+def get_manifest_path() -> str | None:
+    path = getattr(settings, PAGE_ENTRY_POINT_MANIFEST_SETTING, None)
+    return os.fspath(path) if path else None
+
+
+def installed_distributions_fingerprint() -> str:
+    """
+    Hash of the distribution metadata entries found on ``sys.path``.
+
+    Only the names and modification times of the metadata entries are hashed,
+    not the path list itself: ``sys.path[0]`` is the script directory or the
+    working directory, which differs between ``manage.py`` and the web server.
+    """
+    metadata = set()
+    scanned = set()
+    for path_entry in sys.path:
+        directory = os.path.realpath(path_entry or ".")
+        if directory in scanned:
+            continue
+        scanned.add(directory)
+        try:
+            with os.scandir(directory) as entries:
+                metadata.update(
+                    (entry.name, entry.stat().st_mtime_ns)
+                    for entry in entries
+                    if entry.name.endswith(METADATA_SUFFIXES)
+                )
+        except OSError:  # missing directory, zip file, ...
+            continue
+    digest = hashlib.sha256()
+    for name, mtime in sorted(metadata):
+        digest.update(f"{name}:{mtime}\n".encode())
+    return digest.hexdigest()
+
+
+def write_manifest(path: str, group: str, entry_points: list[EntryPoint]) -> None:
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "fingerprint": installed_distributions_fingerprint(),
+        "group": group,
+        "entry_points": [
+            {"name": entry_point.name, "value": entry_point.value}
+            for entry_point in entry_points
+        ],
+    }
+    with open(path, "w", encoding="utf-8") as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+        manifest_file.write("\n")
+
+
+def read_manifest(path: str, group: str) -> list[EntryPoint] | None:
+    """The entry points recorded in the manifest, or None if it is not usable.
+
+    A manifest is usable if it can be read, was written for ``group`` and its
+    fingerprint matches the installed distributions.
+    """
+    try:
+        with open(path, encoding="utf-8") as manifest_file:
+            manifest = json.load(manifest_file)
+    except (OSError, ValueError):
+        logger.debug("Page entry point manifest %s is not readable", path)
+        return None
+    if (
+        not isinstance(manifest, dict)
+        or manifest.get("version") != MANIFEST_VERSION
+        or manifest.get("group") != group
+        or not isinstance(manifest.get("entry_points"), list)
+    ):
+        logger.debug("Page entry point manifest %s is invalid", path)
+        return None
+    if manifest.get("fingerprint") != installed_distributions_fingerprint():
+        logger.info(
+            "Page entry point manifest %s is stale, scanning installed "
+            "distributions instead",
+            path,
+        )
+        return None
+    try:
+        return [
+            EntryPoint(name=item["name"], value=item["value"], group=group)
+            for item in manifest["entry_points"]
+        ]
+    except (KeyError, TypeError):
+        logger.debug("Page entry point manifest %s is invalid", path)
+        return None
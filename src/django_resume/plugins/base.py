@@ -20,6 +20,7 @@ from django.core.exceptions import PermissionDenied
 from django.db import transaction
 
 from ..models import Resume
+from ..url_templates import reverse_cached
 
 if TYPE_CHECKING:
     from ..interchange.protocols import ExportAdapter, ImportAdapter
@@ -370,13 +371,13 @@ class SimpleInline(LockedResumeMutationMixin):
         self.get_context = get_context
 
     def get_edit_url(self, resume_id: int) -> str:
-        return reverse(
-            f"django_resume:{self.plugin_name}-edit", kwargs={"resume_id": resume_id}
+        return reverse_cached(
+            f"django_resume:{self.plugin_name}-edit", resume_id=resume_id
         )
 
     def get_post_url(self, resume_id: int) -> str:
-        return reverse(
-            f"django_resume:{self.plugin_name}-post", kwargs={"resume_id": resume_id}
+        return reverse_cached(
+            f"django_resume:{self.plugin_name}-post", resume_id=resume_id
         )
 
     @staticmethod
@@ -979,39 +980,41 @@ class ListInline(LockedResumeMutationMixin):
     # urls
 
     def get_edit_flat_post_url(self, resume_id: int) -> str:
-        return reverse(
+        return reverse_cached(
             f"django_resume:{self.plugin_name}-edit-flat-post",
-            kwargs={"resume_id": resume_id},
+            resume_id=resume_id,
         )
 
     def get_edit_flat_url(self, resume_id: int) -> str:
-        return reverse(
+        return reverse_cached(
             f"django_resume:{self.plugin_name}-edit-flat",
-            kwargs={"resume_id": resume_id},
+            resume_id=resume_id,
         )
 
     def get_edit_item_url(self, resume_id: int, item_id=None) -> str:
         if item_id is None:
-            return reverse(
+            return reverse_cached(
                 f"django_resume:{self.plugin_name}-add-item",
-                kwargs={"resume_id": resume_id},
+                resume_id=resume_id,
             )
         else:
-            return reverse(
+            return reverse_cached(
                 f"django_resume:{self.plugin_name}-edit-item",
-                kwargs={"resume_id": resume_id, "item_id": item_id},
+                resume_id=resume_id,
+                item_id=item_id,
             )
 
     def get_post_item_url(self, resume_id: int) -> str:
-        return reverse(
+        return reverse_cached(
             f"django_resume:{self.plugin_name}-item-post",
-            kwargs={"resume_id": resume_id},
+            resume_id=resume_id,
         )
 
     def get_delete_item_url(self, resume_id: int, item_id: str) -> str:
-        return reverse(
+        return reverse_cached(
             f"django_resume:{self.plugin_name}-delete-item",
-            kwargs={"resume_id": resume_id, "item_id": item_id},
+            resume_id=resume_id,
+            item_id=item_id,
         )
 
     # crud views
@@ -1198,11 +1201,12 @@ class ListPlugin:
     verbose_name = "List Plugin"
     capabilities: tuple[str, ...] = ()
     template_class: type[ThemedTemplates] = ListThemedTemplates
+    data_class: type[ListData] = ListData
     sort_by_reverse_position: bool = True
 
     def __init__(self):
         super().__init__()
-        self.data = data = ListData(plugin_name=self.name)
+        self.data = data = self.data_class(plugin_name=self.name)
         self.templates = self.template_class(
             plugin_name=self.name,
             template_names={
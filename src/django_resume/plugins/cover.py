@@ -1,7 +1,6 @@
 from typing import Type, cast, Any
 
 from django import forms
-from django.core.files.storage import default_storage
 from django.http import HttpRequest
 
 from .base import ListPlugin, ListItemFormMixin, ListInline, ContextDict
@@ -95,6 +94,9 @@ class CoverFlatForm(ImageFormMixin, forms.Form):
             "avatar_alt": item.get("avatar_alt", ""),
             "avatar_img": image_url,
             "avatar_img_url": image_url,
+            "avatar_img_sources": ImageFormMixin.get_image_sources_for_field(
+                item, "avatar_img"
+            ),
             "edit_flat_url": context["edit_flat_url"],
         }
         return context
@@ -132,7 +134,10 @@ class CoverPlugin(ListPlugin):
         # first item is special because it should float around the avatar image
         context["first_item"] = items[0] if items else None
         # add avatar image url
-        context["avatar_img_url"] = default_storage.url(
+        context["avatar_img_url"] = ImageFormMixin.get_image_url_for_field(
             plugin_data.get("flat", {}).get("avatar_img", "")
         )
+        context["avatar_img_sources"] = ImageFormMixin.get_image_sources_for_field(
+            plugin_data.get("flat", {}), "avatar_img"
+        )
         return context
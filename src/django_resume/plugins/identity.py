@@ -1,9 +1,8 @@
 from django import forms
-from django.core.files.storage import default_storage
 from django.http import HttpRequest
 
 from .base import SimplePlugin, ContextDict
-from ..images import ImageFormMixin
+from ..images import ImageFormMixin, get_upload_url
 from ..interchange.pointer import get_pointer
 from ..interchange.protocols import AdapterExport, AdapterImport
 
@@ -209,9 +208,12 @@ class IdentityPlugin(SimplePlugin):
         context = super().get_context(
             _request, plugin_data, resume_pk, context=context, edit=edit, theme=theme
         )
-        context["avatar_img_url"] = default_storage.url(
+        context["avatar_img_url"] = ImageFormMixin.get_image_url_for_field(
             plugin_data.get("avatar_img", "")
         )
+        context["avatar_img_sources"] = ImageFormMixin.get_image_sources_for_field(
+            plugin_data, "avatar_img"
+        )
         return context
 
     def get_structured_data(self, resume) -> dict:
@@ -222,7 +224,7 @@ class IdentityPlugin(SimplePlugin):
             "tagline": data.get("tagline", ""),
             "email": data.get("email", ""),
             "phone": data.get("phone", ""),
-            "avatar_url": default_storage.url(avatar) if avatar else "",
+            "avatar_url": get_upload_url(avatar) if avatar else "",
             "github": data.get("github", ""),
             "linkedin": data.get("linkedin", ""),
             "mastodon": data.get("mastodon", ""),
@@ -1,5 +1,4 @@
 from django import forms
-from django.core.files.storage import default_storage
 from django.http import HttpRequest
 
 from .base import SimplePlugin, ContextDict
@@ -123,9 +122,12 @@ class PermissionDeniedPlugin(SimplePlugin):
         context = super().get_context(
             _request, plugin_data, resume_pk, context=context, edit=edit
         )
-        context["avatar_img_url"] = default_storage.url(
+        context["avatar_img_url"] = ImageFormMixin.get_image_url_for_field(
             plugin_data.get("avatar_img", "")
         )
+        context["avatar_img_sources"] = ImageFormMixin.get_image_sources_for_field(
+            plugin_data, "avatar_img"
+        )
         context["text"] = markdown_to_html(
             plugin_data.get("text", ""), handlers={"link": underlined_link_handler}
         )
@@ -1,7 +1,11 @@
+import threading
+from collections.abc import Iterable
 from typing import TYPE_CHECKING, Union
 
 from django.urls import URLPattern, clear_url_caches
 
+from ..url_templates import clear_url_templates
+
 if TYPE_CHECKING:
     from .base import Plugin
 
@@ -16,44 +20,76 @@ class PluginRegistry:
     def __init__(self) -> None:
         self.plugins: PluginStore = {}
         self.inline_urls: dict[str, list[URLPattern]] = {}
-
-    def _remove_inline_urls(self, plugin_name: str) -> None:
-        patterns_to_remove = self.inline_urls.pop(plugin_name, [])
-        if not patterns_to_remove:
-            return
-        from ..urls import urlpatterns
-
-        urlpatterns[:] = [
-            pattern for pattern in urlpatterns if pattern not in patterns_to_remove
-        ]
-
-    def _register(self, plugin_class: type["Plugin"]) -> None:
+        self.lock = threading.Lock()
+        # Capability tag -> names of the plugins carrying it, and memoized
+        # plugin selections. Both are replaced on every (un)registration.
+        self.capability_index: dict[str, frozenset[str]] = {}
+        self.selections: dict[tuple, tuple["Plugin", ...]] = {}
+
+    def _rebuild_indexes(self) -> None:
+        names_by_capability: dict[str, set[str]] = {}
+        for plugin in self.plugins.values():
+            for capability in getattr(plugin, "capabilities", ()) or ():
+                names_by_capability.setdefault(capability, set()).add(plugin.name)
+        self.capability_index = {
+            capability: frozenset(names)
+            for capability, names in names_by_capability.items()
+        }
+        self.selections = {}
+
+    def _swap_inline_urls(
+        self, removed_names: Iterable[str], added: dict[str, list[URLPattern]]
+    ) -> None:
         """
-        Register a plugin class. This will instantiate the plugin and add it to the registry.
+        Replace the inline URLs of ``removed_names`` with the ``added`` ones.
 
-        It will also add the plugin's inline URLs to the urlpatterns list.
+        The new ``urlpatterns`` list is built aside and assigned in a single
+        slice assignment, so the URLconf never contains half of a batch.
         """
-        plugin = plugin_class()
-        self._remove_inline_urls(plugin.name)
-        self.plugins[plugin.name] = plugin
         from ..urls import urlpatterns
 
-        inline_urls = plugin.get_inline_urls()
-        urlpatterns.extend(inline_urls)
-        self.inline_urls[plugin.name] = inline_urls
+        removed = {
+            id(pattern)
+            for name in removed_names
+            for pattern in self.inline_urls.pop(name, [])
+        }
+        patterns = [pattern for pattern in urlpatterns if id(pattern) not in removed]
+        for name, inline_urls in added.items():
+            patterns.extend(inline_urls)
+            self.inline_urls[name] = inline_urls
+        urlpatterns[:] = patterns
 
     def register(self, plugin_class: type["Plugin"]) -> None:
-        self._register(plugin_class)
-        clear_url_caches()
+        self.register_plugin_list([plugin_class])
 
-    def register_plugin_list(self, plugin_classes: list) -> None:
-        for plugin_class in plugin_classes:
-            self.register(plugin_class)
+    def register_plugin_list(self, plugin_classes: Iterable[type["Plugin"]]) -> None:
+        """
+        Register several plugin classes at once.
+
+        All plugins are instantiated and their inline URLs computed before the
+        registry changes, so a failing plugin leaves it untouched. The URLs are
+        then swapped in together and the URL caches are cleared once for the
+        whole batch. A plugin replaces an already registered one of the same
+        name, including its inline URLs.
+        """
+        plugins = [plugin_class() for plugin_class in plugin_classes]
+        if not plugins:
+            return
+        inline_urls = {plugin.name: plugin.get_inline_urls() for plugin in plugins}
+        with self.lock:
+            self._swap_inline_urls(inline_urls.keys(), inline_urls)
+            self.plugins.update((plugin.name, plugin) for plugin in plugins)
+            self._rebuild_indexes()
+            clear_url_caches()
+            clear_url_templates()
 
     def unregister(self, plugin_class: type["Plugin"]) -> None:
-        del self.plugins[plugin_class.name]
-        self._remove_inline_urls(plugin_class.name)
-        clear_url_caches()
+        with self.lock:
+            del self.plugins[plugin_class.name]
+            self._swap_inline_urls([plugin_class.name], {})
+            self._rebuild_indexes()
+            clear_url_caches()
+            clear_url_templates()
 
     def get_plugin(self, name) -> Union["Plugin", None]:
         return self.plugins.get(name)
@@ -61,6 +97,55 @@ class PluginRegistry:
     def get_all_plugins(self) -> list["Plugin"]:
         return list(self.plugins.values())
 
+    def get_plugins_by_capability(
+        self, capabilities: Iterable[str], match: str = "any"
+    ) -> list["Plugin"]:
+        """
+        Plugins carrying any (``match="any"``) or all (``match="all"``) of
+        ``capabilities``, in registration order. No capabilities match nothing.
+
+        The result is memoized until the next (un)registration.
+        """
+        capabilities = tuple(capabilities)
+        key = ("capabilities", capabilities, match)
+        # Work on the current index and memo, so a selection computed while a
+        # registration swaps them is not stored in the new memo.
+        index, selections = self.capability_index, self.selections
+        selection = selections.get(key)
+        if selection is None:
+            name_sets = [
+                index.get(capability, frozenset()) for capability in capabilities
+            ]
+            if not name_sets:
+                names: frozenset[str] = frozenset()
+            elif match == "all":
+                names = frozenset.intersection(*name_sets)
+            else:
+                names = frozenset.union(*name_sets)
+            selection = tuple(
+                plugin for plugin in self.plugins.values() if plugin.name in names
+            )
+            selections[key] = selection
+        return list(selection)
+
+    def get_plugins_by_name(self, names: Iterable[str]) -> list["Plugin"]:
+        """
+        The registered plugins among ``names``, in the order given.
+
+        The result is memoized until the next (un)registration.
+        """
+        key = ("names", tuple(names))
+        selections = self.selections
+        selection = selections.get(key)
+        if selection is None:
+            selection = tuple(
+                plugin
+                for plugin in (self.plugins.get(name) for name in key[1])
+                if plugin is not None
+            )
+            selections[key] = selection
+        return list(selection)
+
 
 # The global plugin registry - this is a singleton since module level variables are shared across the application.
 plugin_registry = PluginRegistry()
@@ -15,6 +15,7 @@ from .base import (
 
 from ..markdown import (
     markdown_to_html,
+    markdown_to_html_batch,
     textarea_input_to_markdown,
     textarea_input_to_html,
     markdown_to_textarea_input,
@@ -272,10 +273,12 @@ class TimelineMixin:
         )
         # convert markdown to html for rendering
         items = plugin_data.get("items", [])
-        for item in items:
-            item["description"] = markdown_to_html(
-                item["description"], handlers={"link": underlined_link_handler}
-            )
+        descriptions = markdown_to_html_batch(
+            (item["description"] for item in items),
+            handlers={"link": underlined_link_handler},
+        )
+        for item, description in zip(items, descriptions):
+            item["description"] = description
         return context
 
     def get_structured_data(self, resume) -> dict:
@@ -1,25 +1,38 @@
 import hmac
 import secrets
 import string
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from urllib.parse import urlencode
 
 from django.conf import settings
 from django import forms
+from django.core import signing
 from django.core.exceptions import ImproperlyConfigured, PermissionDenied
+from django.db import transaction
 from django.http import HttpRequest
 from django.urls import reverse
+from django.utils.crypto import salted_hmac
 from django.utils.dateparse import parse_datetime
 from django.utils.html import format_html
 from django.utils import timezone
 from django.utils.safestring import SafeString
 
-from .base import ListPlugin, ListItemFormMixin
+from ..access_log import access_log_enabled, get_token_access_summaries
+from .base import ListData, ListPlugin, ListItemFormMixin
 from ..models import Resume
 
 
 TOKEN_ALPHABET = string.ascii_letters + string.digits
 DEFAULT_TOKEN_TTL = timedelta(days=30)
 TOKEN_TTL_SETTING = "DJANGO_RESUME_TOKEN_TTL"
+TOKEN_HASH_SALT = "django_resume.plugins.tokens.TokenPlugin"
+PRUNE_TOKENS_BATCH_SIZE = 500
+SHARE_LINK_PARAM = "share"
+SHARE_LINK_SALT = "django_resume.plugins.tokens.share_link"
+SHARE_LINK_KEY_ID_SETTING = "DJANGO_RESUME_SHARE_LINK_KEY_ID"
+SHARE_LINK_REVOKED_KEY_IDS_SETTING = "DJANGO_RESUME_SHARE_LINK_REVOKED_KEY_IDS"
 
 
 class _UnsetTTL:
@@ -79,6 +92,122 @@ def is_token_expired(
     return created + resolved_ttl <= now
 
 
+def hash_token(token: str) -> str:
+    """Keyed hash of an access token (HMAC-SHA256 under ``SECRET_KEY``)."""
+    return salted_hmac(TOKEN_HASH_SALT, token, algorithm="sha256").hexdigest()
+
+
+def get_token_index_key_id() -> str:
+    """
+    Fingerprint of the key used by :func:`hash_token`. An index built before a
+    ``SECRET_KEY`` rotation has a different key id and is ignored.
+    """
+    return hash_token("")[:16]
+
+
+def build_token_index(items: Iterable[object]) -> dict:
+    """
+    Map the keyed hash of each stored token to the fields needed to validate
+    it, so an access check is a single dict lookup instead of a scan.
+    """
+    tokens: dict[str, dict] = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        token = item.get("token")
+        if not isinstance(token, str):
+            continue
+        token_hash = hash_token(token)
+        entry = {"id": item.get("id"), "created": item.get("created")}
+        existing = tokens.get(token_hash)
+        if existing is not None:
+            # Duplicate tokens: keep the entry that expires last (a missing
+            # ``created`` never expires), matching the scan's "any unexpired".
+            existing_created = normalize_token_created(existing["created"])
+            created = normalize_token_created(entry["created"])
+            if existing_created is None or (
+                created is not None and created <= existing_created
+            ):
+                continue
+        tokens[token_hash] = entry
+    return {"key_id": get_token_index_key_id(), "tokens": tokens}
+
+
+def get_share_link_key_id() -> str:
+    return str(getattr(settings, SHARE_LINK_KEY_ID_SETTING, "1"))
+
+
+def get_revoked_share_link_key_ids() -> frozenset[str]:
+    revoked = getattr(settings, SHARE_LINK_REVOKED_KEY_IDS_SETTING, ())
+    if isinstance(revoked, str):
+        raise ImproperlyConfigured(
+            f"{SHARE_LINK_REVOKED_KEY_IDS_SETTING} must be a collection of key ids."
+        )
+    return frozenset(str(key_id) for key_id in revoked)
+
+
+def create_share_token(
+    resume: Resume,
+    *,
+    receiver: str = "",
+    expires_in: timedelta | None | _UnsetTTL = UNSET_TTL,
+    now: datetime | None = None,
+) -> str:
+    """
+    Return a signed, expiring share token for ``resume``'s CV.
+
+    The token carries the resume, its expiry and the current share link key id
+    (``DJANGO_RESUME_SHARE_LINK_KEY_ID``), signed with ``SECRET_KEY``. Nothing is
+    stored, so issuing links for many recipients costs no writes. ``expires_in``
+    defaults to ``DJANGO_RESUME_TOKEN_TTL``; ``None`` never expires.
+    """
+    if isinstance(expires_in, _UnsetTTL):
+        expires_in = get_token_ttl()
+    if now is None:
+        now = timezone.now()
+    payload: dict[str, object] = {
+        "r": resume.pk,
+        "k": get_share_link_key_id(),
+        "e": int((now + expires_in).timestamp()) if expires_in is not None else None,
+    }
+    if receiver:
+        payload["to"] = receiver
+    return signing.dumps(payload, salt=SHARE_LINK_SALT, compress=True)
+
+
+def create_share_link(resume: Resume, **kwargs) -> str:
+    """The CV URL for ``resume`` carrying a fresh :func:`create_share_token`."""
+    base_url = reverse("django_resume:cv", kwargs={"slug": resume.slug})
+    query = urlencode({SHARE_LINK_PARAM: create_share_token(resume, **kwargs)})
+    return f"{base_url}?{query}"
+
+
+def verify_share_token(
+    share_token: str, resume_pk: int, *, now: datetime | None = None
+) -> dict:
+    """
+    Return the payload of a valid share token for ``resume_pk``.
+
+    The signature is checked in constant time by ``django.core.signing``.
+    Raises ``PermissionDenied`` for a forged, foreign, expired or revoked token.
+    """
+    try:
+        payload = signing.loads(share_token, salt=SHARE_LINK_SALT)
+    except signing.BadSignature:
+        raise PermissionDenied("Invalid share link.")
+    if not isinstance(payload, dict) or payload.get("r") != resume_pk:
+        raise PermissionDenied("Invalid share link.")
+    if str(payload.get("k")) in get_revoked_share_link_key_ids():
+        raise PermissionDenied("Share link revoked.")
+    expires = payload.get("e")
+    if expires is not None:
+        if now is None:
+            now = timezone.now()
+        if not isinstance(expires, int) or expires <= now.timestamp():
+            raise PermissionDenied("Share link expired.")
+    return payload
+
+
 def generate_random_string(length=20) -> str:
     return "".join(secrets.choice(TOKEN_ALPHABET) for _ in range(length))
 
@@ -99,6 +228,7 @@ class TokenItemForm(ListItemFormMixin, forms.Form):
     receiver = forms.CharField(max_length=255)
     created = forms.DateTimeField(widget=forms.HiddenInput(), required=False)
     cv_link = forms.CharField(required=False, label="CV Link", widget=HTMLLinkWidget())
+    opens = forms.CharField(required=False, disabled=True, label="Opens")
 
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
@@ -117,12 +247,27 @@ class TokenItemForm(ListItemFormMixin, forms.Form):
             self.fields["created"].initial = created
 
         self.generate_cv_link(self.resume)
+        self.set_opens(self.resume)
 
     def generate_cv_link(self, resume: Resume) -> None:
         base_url = reverse("django_resume:cv", kwargs={"slug": resume.slug})
         link = f"{base_url}?token={self.token}"
         self.fields["cv_link"].initial = link
 
+    def set_opens(self, resume: Resume) -> None:
+        if not access_log_enabled():
+            del self.fields["opens"]
+            return None
+        summary = get_token_access_summaries(resume).get(str(self.initial.get("id")))
+        if summary is None:
+            self.fields["opens"].initial = "Never opened"
+            return None
+        last_accessed = timezone.localtime(summary.last_accessed).strftime(
+            "%Y-%m-%d %H:%M"
+        )
+        self.fields["opens"].initial = f"{summary.count} (last {last_accessed})"
+        return None
+
     def clean_token(self) -> str:
         token = self.cleaned_data["token"]
         if not token:
@@ -140,6 +285,7 @@ class TokenItemForm(ListItemFormMixin, forms.Form):
         if cleaned_data is None:
             return {}
         cleaned_data.pop("cv_link", None)  # Remove 'cv_link' from cleaned_data
+        cleaned_data.pop("opens", None)
         return cleaned_data
 
 
@@ -151,6 +297,19 @@ class TokenViaGetForm(forms.Form):
     token = forms.CharField(max_length=255, required=True, label="Token")
 
 
+class TokenData(ListData):
+    """
+    Keep ``plugin_data["index"]`` in sync with the token items on every write.
+
+    The items keep the plaintext tokens: the owner UI shows them, and the index
+    is rebuilt from them after a ``SECRET_KEY`` rotation.
+    """
+
+    def set_data(self, resume: Resume, data: dict) -> Resume:
+        data["index"] = build_token_index(data.get("items", []))
+        return super().set_data(resume, data)
+
+
 class TokenPlugin(ListPlugin):
     """
     Generate tokens for a resume.
@@ -163,6 +322,7 @@ class TokenPlugin(ListPlugin):
     verbose_name = "CV Token"
     flat_template = "django_resume/plain/token_flat.html"
     flat_form_template = "django_resume/plain/token_flat_form.html"
+    data_class = TokenData
 
     @staticmethod
     def get_admin_item_form() -> type[forms.Form]:
@@ -183,20 +343,55 @@ class TokenPlugin(ListPlugin):
         )
 
     @staticmethod
-    def check_permissions(request: HttpRequest, plugin_data: dict) -> None:
+    def check_permissions(
+        request: HttpRequest, plugin_data: dict, *, resume_pk: int | None = None
+    ) -> None:
+        TokenPlugin.authorize(request, plugin_data, resume_pk=resume_pk)
+        return None
+
+    @staticmethod
+    def authorize(
+        request: HttpRequest, plugin_data: dict, *, resume_pk: int | None = None
+    ) -> str | None:
+        """
+        Check access like :meth:`check_permissions` and return the id of the
+        token that granted it (``"share:<receiver>"`` for a signed share link),
+        or None when no token was needed.
+        """
         token_required = TokenPlugin.token_is_required(plugin_data)
         if not token_required or request.user.is_authenticated:
             return None
+        share_token = request.GET.get(SHARE_LINK_PARAM)
+        if share_token is not None and resume_pk is not None:
+            # Signed share links are verified without reading the token list.
+            payload = verify_share_token(share_token, resume_pk)
+            return f"share:{payload.get('to', '')}"
         form = TokenViaGetForm(request.GET)
         if not form.is_valid():
             raise PermissionDenied("Token required to access this page.")
         token = form.cleaned_data["token"]
         if token is None:
             raise PermissionDenied("Token required to access this page.")
-        matched_token = False
-        matched_unexpired_token = False
         now = timezone.now()
         ttl = get_token_ttl()
+        index = plugin_data.get("index")
+        if (
+            isinstance(index, dict)
+            and isinstance(index.get("tokens"), dict)
+            and index.get("key_id") == get_token_index_key_id()
+        ):
+            # Looking up a keyed hash leaks nothing useful through timing: the
+            # caller cannot relate the hash of their guess to stored hashes.
+            entry = index["tokens"].get(hash_token(token))
+            if not isinstance(entry, dict):
+                raise PermissionDenied("Invalid token.")
+            if is_token_expired(entry, now=now, ttl=ttl):
+                raise PermissionDenied("Token expired.")
+            return str(entry.get("id") or "")
+        # No usable index (legacy data or a rotated key): scan every item.
+        matched_token = False
+        matched_unexpired_token = False
+        granted_token_id = ""
         for item in plugin_data.get("items", []):
             if not isinstance(item, dict):
                 continue
@@ -206,9 +401,11 @@ class TokenPlugin(ListPlugin):
             token_matches = hmac.compare_digest(token, stored_token)
             token_is_unexpired = not is_token_expired(item, now=now, ttl=ttl)
             matched_token |= token_matches
-            matched_unexpired_token |= token_matches & token_is_unexpired
+            if token_matches & token_is_unexpired:
+                matched_unexpired_token = True
+                granted_token_id = str(item.get("id") or "")
         if matched_unexpired_token:
-            return None
+            return granted_token_id
         if matched_token:
             raise PermissionDenied("Token expired.")
         raise PermissionDenied("Invalid token.")
@@ -223,5 +420,81 @@ class TokenPlugin(ListPlugin):
         edit: bool = False,
         theme: str = "plain",
     ) -> dict:
-        self.check_permissions(request, plugin_data)
+        self.check_permissions(request, plugin_data, resume_pk=resume_pk)
         return {}
+
+
+@dataclass
+class TokenPruneResult:
+    resumes: int = 0
+    tokens: int = 0
+
+
+def prune_expired_tokens(
+    *,
+    batch_size: int = PRUNE_TOKENS_BATCH_SIZE,
+    dry_run: bool = False,
+    now: datetime | None = None,
+    progress: Callable[[TokenPruneResult], object] | None = None,
+) -> TokenPruneResult:
+    """
+    Remove tokens older than ``DJANGO_RESUME_TOKEN_TTL`` from every resume.
+
+    Resumes are walked by primary key in batches of ``batch_size``; each batch
+    is locked, pruned and written back with one ``bulk_update`` in its own
+    transaction. Token lists without a current index are re-indexed on the
+    way. ``progress`` is called with the running totals after each batch.
+    """
+    result = TokenPruneResult()
+    ttl = get_token_ttl()
+    if now is None:
+        now = timezone.now()
+    data = TokenData(plugin_name=TokenPlugin.name)
+    key_id = get_token_index_key_id()
+    queryset = Resume.objects.filter(plugin_data__has_key=TokenPlugin.name)
+    last_pk = None
+    while True:
+        batch = queryset.order_by("pk")
+        if last_pk is not None:
+            batch = batch.filter(pk__gt=last_pk)
+        pks = list(batch.values_list("pk", flat=True)[:batch_size])
+        if not pks:
+            break
+        last_pk = pks[-1]
+        with transaction.atomic():
+            resumes = Resume.objects.filter(pk__in=pks).only("id", "plugin_data")
+            if not dry_run:
+                resumes = resumes.select_for_update()
+            resumes_to_update = []
+            for resume in resumes:
+                plugin_data = data.get_data(resume)
+                if not isinstance(plugin_data, dict):
+                    continue
+                items = plugin_data.get("items", [])
+                if not isinstance(items, list):
+                    continue
+                kept_items = [
+                    item
+                    for item in items
+                    if not (
+                        isinstance(item, dict)
+                        and is_token_expired(item, now=now, ttl=ttl)
+                    )
+                ]
+                expired = len(items) - len(kept_items)
+                index = plugin_data.get("index")
+                index_is_current = (
+                    isinstance(index, dict) and index.get("key_id") == key_id
+                )
+                if expired:
+                    result.resumes += 1
+                    result.tokens += expired
+                elif index_is_current:
+                    continue
+                plugin_data["items"] = kept_items
+                resumes_to_update.append(data.set_data(resume, plugin_data))
+            if resumes_to_update and not dry_run:
+                Resume.objects.bulk_update(resumes_to_update, ["plugin_data"])
+        if progress is not None:
+            progress(result)
+    return result
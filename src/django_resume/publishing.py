@@ -0,0 +1,374 @@
+"""
+Publish public resume pages as static files.
+
+Every registered :class:`~django_resume.pages.ResumePage` is rendered for
+every resume as an anonymous visitor would see it and written, together with
+the static files and uploads it references, to a Django storage: a
+``FileSystemStorage`` for a directory tree served by nginx, or any configured
+storage backend for a bucket behind a CDN. Files are laid out by URL path
+(``<url>/index.html`` for pages), so the published tree answers the same URLs
+as the application.
+
+A manifest in the target storage records a revision hash and the written
+pages of each resume; later runs only re-render resumes whose revision
+changed and remove the pages of resumes that are gone.
+"""
+
+import hashlib
+import json
+import os
+import posixpath
+import re
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from datetime import timedelta
+from html.parser import HTMLParser
+from urllib.parse import unquote, urljoin, urlsplit
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.base import ContentFile
+from django.core.files.storage import Storage, default_storage
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import reverse
+
+from .access_log import access_log_paused
+from .models import Resume
+from .pages import page_registry
+from .pages.base import ResumePage, dispatch_page
+from .plugins.tokens import SHARE_LINK_PARAM, create_share_token
+
+MANIFEST_NAME = "django-resume-publish.json"
+MANIFEST_VERSION = 1
+#: Lifetime of the share token used to render a token-protected page. The
+#: token only has to outlive the render; it is never written to the output.
+PUBLISH_SHARE_TOKEN_TTL = timedelta(minutes=5)
+PUBLISH_SHARE_RECEIVER = "publish_resumes"
+CSS_URL_RE = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)""")
+
+
+@dataclass
+class PublishResult:
+    resumes: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    pages: int = 0
+    skipped_pages: int = 0
+    assets: int = 0
+
+
+class AssetCollector(HTMLParser):
+    """Collect the URLs of images, scripts and stylesheets in a page."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.urls: list[str] = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        values = dict(attrs)
+        names = ("src", "poster", "href") if tag == "link" else ("src", "poster")
+        for name in names:
+            value = values.get(name)
+            if value:
+                self.urls.append(value)
+        srcset = values.get("srcset")
+        if srcset:
+            for candidate in srcset.split(","):
+                url = candidate.strip().split(" ")[0]
+                if url:
+                    self.urls.append(url)
+
+
+def iter_asset_urls(html: str) -> list[str]:
+    """Return the asset URLs referenced by ``html``.
+
+    Covers ``src``/``srcset`` attributes, ``<link>`` targets and ``url()``
+    references in inline styles.
+    """
+    collector = AssetCollector()
+    collector.feed(html)
+    collector.close()
+    return [*collector.urls, *(match.group(2) for match in CSS_URL_RE.finditer(html))]
+
+
+def get_resume_revision(resume: Resume, *, protected_path: str = "") -> str:
+    """Hash of everything that determines the published pages of ``resume``.
+
+    The resume model keeps no revision counter, so the hash covers its name,
+    slug and plugin data plus the registered pages and the protected path.
+    Template or static file changes are not covered; publish with ``force``
+    after deploying them.
+    """
+    state = {
+        "name": resume.name,
+        "slug": resume.slug,
+        "plugin_data": resume.plugin_data,
+        "pages": sorted(page.url_name for page in page_registry.get_all_pages()),
+        "protected_path": protected_path,
+    }
+    encoded = json.dumps(state, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def page_file_name(url: str, *, prefix: str = "") -> str:
+    """Storage name of the page served at ``url``."""
+    path = urlsplit(url).path.strip("/")
+    return posixpath.join(prefix.strip("/"), path, "index.html").lstrip("/")
+
+
+def render_public_page(
+    page: ResumePage, resume: Resume, *, share_token: str | None = None
+) -> HttpResponse:
+    """Render ``page`` for ``resume`` as an anonymous, non-editing visitor.
+
+    The render is not a visit, so it is kept out of the token access log.
+    """
+    data = {SHARE_LINK_PARAM: share_token} if share_token is not None else {}
+    request = RequestFactory().get(page.nav_url(resume), data)
+    request.user = AnonymousUser()
+    with access_log_paused():
+        return dispatch_page(request, resume.slug, page)
+
+
+class AssetResolver:
+    """Map asset URLs found in published pages to readable sources."""
+
+    def __init__(self) -> None:
+        self.static_prefix = urlsplit(settings.STATIC_URL or "").path
+        placeholder = "uploads/00/x"
+        upload_url = reverse("django_resume:upload", kwargs={"name": placeholder})
+        self.upload_prefix = upload_url[: -len(placeholder)]
+        media_url = urlsplit(default_storage.url(""))
+        self.media_prefix = "" if media_url.netloc else media_url.path
+
+    def open(self, url: str) -> bytes | None:
+        """Return the content of the local asset at ``url``, or None.
+
+        Only path-only URLs below ``STATIC_URL``, the upload route or the
+        default storage are published; assets on other hosts stay where they
+        are.
+        """
+        parts = urlsplit(url)
+        if parts.scheme or parts.netloc or not parts.path.startswith("/"):
+            return None
+        path = unquote(parts.path)
+        if ".." in path.split("/"):
+            return None
+        if self.static_prefix and path.startswith(self.static_prefix):
+            return self.open_static(path[len(self.static_prefix) :])
+        if path.startswith(self.upload_prefix + "uploads/"):
+            return self.open_upload(path[len(self.upload_prefix) :])
+        if self.media_prefix and path.startswith(self.media_prefix):
+            return self.open_upload(path[len(self.media_prefix) :])
+        return None
+
+    @staticmethod
+    def open_static(name: str) -> bytes | None:
+        found = finders.find(name)
+        if isinstance(found, str):
+            with open(found, "rb") as static_file:
+                return static_file.read()
+        # Hashed names (ManifestStaticFilesStorage) only exist after
+        # collectstatic, in the static files storage.
+        try:
+            if not staticfiles_storage.exists(name):
+                return None
+        except ImproperlyConfigured:  # no STATIC_ROOT, e.g. in development
+            return None
+        with staticfiles_storage.open(name) as static_file:
+            return static_file.read()
+
+    @staticmethod
+    def open_upload(name: str) -> bytes | None:
+        if not name or not default_storage.exists(name):
+            return None
+        with default_storage.open(name) as upload:
+            return upload.read()
+
+
+def write_file(storage: Storage, name: str, content: bytes) -> None:
+    """Write ``content`` to ``name``, replacing an existing file.
+
+    Readers never see ``name`` missing: on local storages the content is saved
+    under a temporary name and renamed over the old file, backends that
+    overwrite names in place (like most bucket storages) save directly. Only
+    other backends delete the old file first.
+    """
+    if not storage.exists(name):
+        storage.save(name, ContentFile(content))
+        return None
+    try:
+        target = storage.path(name)
+    except NotImplementedError:
+        if storage.get_available_name(name) != name:
+            storage.delete(name)
+        storage.save(name, ContentFile(content))
+        return None
+    directory, base = posixpath.split(name)
+    temporary = storage.save(
+        posixpath.join(directory, f".{base}.publishing"), ContentFile(content)
+    )
+    try:
+        os.replace(storage.path(temporary), target)
+    except OSError:
+        storage.delete(temporary)
+        raise
+    return None
+
+
+def load_manifest(storage: Storage) -> dict[str, dict]:
+    if not storage.exists(MANIFEST_NAME):
+        return {}
+    with storage.open(MANIFEST_NAME) as manifest_file:
+        try:
+            manifest = json.loads(manifest_file.read())
+        except ValueError:
+            return {}
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    resumes = manifest.get("resumes")
+    return resumes if isinstance(resumes, dict) else {}
+
+
+def save_manifest(storage: Storage, resumes: dict[str, dict]) -> None:
+    manifest = {"version": MANIFEST_VERSION, "resumes": resumes}
+    write_file(storage, MANIFEST_NAME, json.dumps(manifest, indent=2).encode("utf-8"))
+
+
+def render_resume_pages(
+    resume: Resume, *, protected_path: str = ""
+) -> Iterator[tuple[str, HttpResponse | None]]:
+    """Yield ``(storage name, response)`` for every page of ``resume``.
+
+    Pages an anonymous visitor cannot see yield a None response. A page
+    denied with 403 (the token-protected CV) is rendered through a
+    short-lived share link and placed below ``protected_path`` when one is
+    given.
+    """
+    for page in page_registry.get_all_pages():
+        url = page.nav_url(resume)
+        response = render_public_page(page, resume)
+        if response.status_code == 200:
+            yield page_file_name(url), response
+            continue
+        if response.status_code == 403 and protected_path:
+            share_token = create_share_token(
+                resume,
+                receiver=PUBLISH_SHARE_RECEIVER,
+                expires_in=PUBLISH_SHARE_TOKEN_TTL,
+            )
+            response = render_public_page(page, resume, share_token=share_token)
+            if response.status_code == 200:
+                yield page_file_name(url, prefix=protected_path), response
+                continue
+        yield page_file_name(url), None
+
+
+def publish_assets(
+    storage: Storage,
+    urls: Iterable[str],
+    *,
+    dry_run: bool,
+    published: set[str],
+) -> int:
+    """Copy the local assets at ``urls`` (and the files their CSS references).
+
+    Files that already exist with the same size are left alone; static files
+    and content-addressed uploads change their name when their content
+    changes.
+    """
+    resolver = AssetResolver()
+    pending = list(urls)
+    copied = 0
+    while pending:
+        url = urlsplit(pending.pop()).path
+        name = url.lstrip("/")
+        if not name or name in published:
+            continue
+        published.add(name)
+        content = resolver.open(url)
+        if content is None:
+            continue
+        if name.endswith(".css"):
+            css = content.decode("utf-8", errors="replace")
+            for match in CSS_URL_RE.finditer(css):
+                reference = match.group(2)
+                if not reference.startswith("data:"):
+                    pending.append(urljoin(url, reference))
+        if storage.exists(name) and storage.size(name) == len(content):
+            continue
+        copied += 1
+        if not dry_run:
+            write_file(storage, name, content)
+    return copied
+
+
+def publish_resumes(
+    storage: Storage,
+    *,
+    slugs: Iterable[str] | None = None,
+    protected_path: str = "",
+    force: bool = False,
+    dry_run: bool = False,
+    progress: Callable[[Resume, list[str]], None] | None = None,
+) -> PublishResult:
+    """Publish the public pages of all (or the given) resumes to ``storage``.
+
+    Resumes whose revision matches the manifest are skipped unless ``force``
+    is set. Pages that are no longer published for a re-rendered resume, and
+    the pages of resumes that no longer exist, are deleted. With ``dry_run``
+    nothing is written or deleted.
+    """
+    result = PublishResult()
+    manifest = load_manifest(storage)
+    queryset = Resume.objects.select_related("owner").defer("integration_data")
+    if slugs is not None:
+        queryset = queryset.filter(slug__in=list(slugs))
+    published_assets: set[str] = set()
+    seen: set[str] = set()
+    for resume in queryset.order_by("pk").iterator():
+        seen.add(resume.slug)
+        revision = get_resume_revision(resume, protected_path=protected_path)
+        previous = manifest.get(resume.slug, {})
+        if not force and previous.get("revision") == revision:
+            result.unchanged += 1
+            continue
+        files: list[str] = []
+        asset_urls: list[str] = []
+        for name, response in render_resume_pages(
+            resume, protected_path=protected_path
+        ):
+            if response is None:
+                result.skipped_pages += 1
+                continue
+            html = response.content.decode(response.charset or "utf-8")
+            asset_urls.extend(iter_asset_urls(html))
+            files.append(name)
+            if not dry_run:
+                write_file(storage, name, response.content)
+        result.assets += publish_assets(
+            storage, asset_urls, dry_run=dry_run, published=published_assets
+        )
+        stale = set(previous.get("files", [])) - set(files)
+        if not dry_run:
+            for name in sorted(stale):
+                if storage.exists(name):
+                    storage.delete(name)
+        manifest[resume.slug] = {"revision": revision, "files": files}
+        result.resumes += 1
+        result.pages += len(files)
+        if progress is not None:
+            progress(resume, files)
+    if slugs is None:
+        for slug in sorted(set(manifest) - seen):
+            for name in manifest.pop(slug).get("files", []):
+                if not dry_run and storage.exists(name):
+                    storage.delete(name)
+            result.removed += 1
+    if not dry_run:
+        save_manifest(storage, manifest)
+    return result
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from django import template
+from django.conf import settings
+
+register = template.Library()
+
+TAILWIND_CDN_SETTING = "DJANGO_RESUME_HEADWIND_TAILWIND_CDN"
+
+
+@register.simple_tag
+def headwind_tailwind_cdn() -> bool:
+    """Return whether headwind pages also load the Tailwind CDN JIT compiler.
+
+    The headwind theme ships a precompiled ``django_resume/css/headwind.css``
+    that only contains the utilities used by the bundled templates. While
+    developing templates with new utility classes, enable
+    ``DJANGO_RESUME_HEADWIND_TAILWIND_CDN`` to compile them in the browser
+    until the stylesheet is rebuilt with ``just build-headwind-css``.
+    """
+    return bool(getattr(settings, TAILWIND_CDN_SETTING, False))
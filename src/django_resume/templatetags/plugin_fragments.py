@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from datetime import timedelta
+
+from django import template
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.template.base import FilterExpression, Parser, Token, token_kwargs
+from django.template.context import Context
+from django.template.loader_tags import IncludeNode
+
+from ..images import cap_by_upload_url_lifetime
+from ..models import Resume
+from ..plugins.base import ThemedTemplates
+
+register = template.Library()
+
+FRAGMENT_CACHE_TIMEOUT_SETTING = "DJANGO_RESUME_FRAGMENT_CACHE_TIMEOUT"
+FRAGMENT_CACHE_ALIAS_SETTING = "DJANGO_RESUME_FRAGMENT_CACHE_ALIAS"
+FRAGMENT_CACHE_KEY_PREFIX = "django_resume:fragment"
+SCALAR_TYPES = (str, int, float, bool, type(None))
+
+
+def get_fragment_cache_timeout() -> timedelta | None:
+    """How long a rendered plugin fragment is reused, or None if disabled.
+
+    Bounded by half the signature lifetime of upload URLs, since fragments
+    embed image URLs.
+    """
+    timeout = getattr(settings, FRAGMENT_CACHE_TIMEOUT_SETTING, None)
+    if timeout is None:
+        return None
+    if not isinstance(timeout, timedelta):
+        raise ImproperlyConfigured(
+            f"{FRAGMENT_CACHE_TIMEOUT_SETTING} must be a datetime.timedelta or None."
+        )
+    timeout = cap_by_upload_url_lifetime(timeout)
+    return timeout if timeout > timedelta(0) else None
+
+
+def fragment_cache_key(
+    resume: Resume, plugin_context: dict, extra_context: dict
+) -> str | None:
+    """Cache key of a plugin fragment, or None if it cannot be cached.
+
+    The key covers the resume, the plugin name, theme and template, the
+    plugin's slice of ``plugin_data``, the edit flag and the scalar values
+    passed to the tag. Non-scalar values are expected to be plugin contexts
+    and are covered by the data slice.
+    """
+    templates = plugin_context.get("templates")
+    if not isinstance(templates, ThemedTemplates) or resume.pk is None:
+        return None
+    plugin_name = templates.plugin_name
+    scalars = sorted(
+        (name, value)
+        for name, value in extra_context.items()
+        if isinstance(value, SCALAR_TYPES)
+    )
+    state = [
+        resume.pk,
+        resume.slug,
+        plugin_name,
+        templates.theme,
+        getattr(templates, "main", ""),
+        bool(plugin_context.get("show_edit_button")),
+        scalars,
+        resume.plugin_data.get(plugin_name, {}),
+    ]
+    encoded = json.dumps(state, sort_keys=True, default=str).encode("utf-8")
+    return f"{FRAGMENT_CACHE_KEY_PREFIX}:{hashlib.sha256(encoded).hexdigest()}"
+
+
+class PluginFragmentNode(template.Node):
+    def __init__(
+        self,
+        plugin: FilterExpression,
+        extra_context: dict[str, FilterExpression],
+        include: IncludeNode,
+    ) -> None:
+        self.plugin = plugin
+        self.extra_context = extra_context
+        self.include = include
+
+    def render(self, context: Context) -> str:
+        timeout = get_fragment_cache_timeout()
+        resume = context.get("resume")
+        plugin_context = self.plugin.resolve(context)
+        if (
+            timeout is None
+            or not isinstance(resume, Resume)
+            or not isinstance(plugin_context, dict)
+        ):
+            return self.include.render(context)
+        extra_context = {
+            name: value.resolve(context) for name, value in self.extra_context.items()
+        }
+        key = fragment_cache_key(resume, plugin_context, extra_context)
+        if key is None:
+            return self.include.render(context)
+        cache = caches[getattr(settings, FRAGMENT_CACHE_ALIAS_SETTING, "default")]
+        fragment = cache.get(key)
+        if fragment is None:
+            fragment = self.include.render(context)
+            cache.set(key, fragment, timeout.total_seconds())
+        return fragment
+
+
+@register.tag
+def plugin_fragment(parser: Parser, token: Token) -> PluginFragmentNode:
+    """Include a plugin's main template, caching the rendered fragment.
+
+    Usage::
+
+        {% plugin_fragment identity %}
+        {% plugin_fragment freelance_timeline with timeline=freelance_timeline %}
+
+    Renders like ``{% include <plugin>.templates.main with ... %}``. With
+    ``DJANGO_RESUME_FRAGMENT_CACHE_TIMEOUT`` set, the output is cached per
+    :func:`fragment_cache_key`, so an unchanged section is reused while other
+    sections of the page change. The plugin template must only depend on its
+    plugin context, the edit flag and the values passed to the tag.
+    """
+    bits = token.split_contents()
+    if len(bits) < 2:
+        raise template.TemplateSyntaxError(
+            f"{bits[0]!r} tag requires a plugin context variable."
+        )
+    tag_name, plugin_name, *remaining = bits
+    if remaining and remaining[0] == "with":
+        remaining = remaining[1:]
+    extra_context = token_kwargs(remaining, parser, support_legacy=False)
+    if remaining:
+        raise template.TemplateSyntaxError(
+            f"{tag_name!r} tag received invalid arguments: {' '.join(remaining)}"
+        )
+    include = IncludeNode(
+        parser.compile_filter(f"{plugin_name}.templates.main"),
+        extra_context=extra_context,
+    )
+    # The parser only sets these on the nodes it returns itself.
+    include.token = token
+    include.origin = parser.origin
+    return PluginFragmentNode(
+        parser.compile_filter(plugin_name), extra_context, include
+    )
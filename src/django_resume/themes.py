@@ -0,0 +1,158 @@
+"""
+Template warm-up and the record of which themes ship which templates.
+
+:func:`warm_templates` compiles every page template and every registered
+plugin's templates for every discovered theme, which fills the cached template
+loader before the first request. It records the themes each page template is
+shipped by in :data:`theme_support`, so the page theme fallback answers from
+memory instead of probing the template loaders on every request.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.template import TemplateDoesNotExist, engines
+from django.template.backends.django import DjangoTemplates
+from django.template.loader import get_template
+
+logger = logging.getLogger(__name__)
+
+WARM_TEMPLATES_SETTING = "DJANGO_RESUME_WARM_TEMPLATES"
+PAGE_TEMPLATE_DIRECTORY = "django_resume/pages"
+
+
+def warm_templates_enabled() -> bool:
+    return bool(getattr(settings, WARM_TEMPLATES_SETTING, False))
+
+
+@dataclass
+class TemplateWarmupResult:
+    compiled: int = 0
+    # Templates absent from a theme that ships the page or plugin's other
+    # templates, i.e. incomplete themes.
+    missing: list[str] = field(default_factory=list)
+    page_themes: dict[str, list[str]] = field(default_factory=dict)
+    plugin_themes: dict[str, list[str]] = field(default_factory=dict)
+
+
+class ThemeSupport:
+    """Which themes ship which page templates, once warmed up."""
+
+    def __init__(self) -> None:
+        self.checked_page_templates: frozenset[str] = frozenset()
+        self.page_templates: dict[str, frozenset[str]] = {}
+
+    def has_page_template(self, theme: str, template_name: str) -> bool | None:
+        """Whether ``theme`` ships ``template_name``, or None if unknown."""
+        templates = self.page_templates.get(theme)
+        if templates is None or template_name not in self.checked_page_templates:
+            return None
+        return template_name in templates
+
+    def clear(self) -> None:
+        self.checked_page_templates = frozenset()
+        self.page_templates = {}
+
+
+theme_support = ThemeSupport()
+
+
+@receiver(setting_changed)
+def clear_theme_support(*, setting: str, **kwargs: Any) -> None:
+    if setting in ("TEMPLATES", "INSTALLED_APPS"):
+        theme_support.clear()
+
+
+def discover_themes() -> list[str]:
+    """Themes with a page template directory in any Django template dir."""
+    themes = {"plain"}
+    for engine in engines.all():
+        if not isinstance(engine, DjangoTemplates):
+            continue
+        for template_dir in engine.template_dirs:
+            pages_dir = Path(template_dir) / PAGE_TEMPLATE_DIRECTORY
+            if pages_dir.is_dir():
+                themes.update(
+                    path.name for path in pages_dir.iterdir() if path.is_dir()
+                )
+    return sorted(themes)
+
+
+def compile_template(name: str) -> bool:
+    """Load ``name`` through the template loaders; False if it does not exist."""
+    try:
+        get_template(name)
+    except TemplateDoesNotExist:
+        return False
+    return True
+
+
+def warm_templates(themes: list[str] | None = None) -> TemplateWarmupResult:
+    """Compile page and plugin templates for ``themes`` (default: discovered).
+
+    Runs from ``AppConfig.ready`` when ``DJANGO_RESUME_WARM_TEMPLATES`` is
+    enabled, after all pages and plugins are registered, and from the
+    ``warm_templates`` management command.
+    """
+    from .pages import page_registry
+    from .pages.base import page_template_name
+    from .plugins import plugin_registry
+
+    if themes is None:
+        themes = discover_themes()
+    result = TemplateWarmupResult()
+
+    page_template_names = sorted(
+        {page.template_name for page in page_registry.get_all_pages()} - {""}
+    )
+    page_templates: dict[str, set[str]] = {theme: set() for theme in themes}
+    for template_name in page_template_names:
+        for theme in themes:
+            if compile_template(page_template_name(theme, template_name)):
+                result.compiled += 1
+                page_templates[theme].add(template_name)
+    for theme, template_names in page_templates.items():
+        if template_names:
+            result.missing.extend(
+                page_template_name(theme, template_name)
+                for template_name in page_template_names
+                if template_name not in template_names
+            )
+    for template_name in page_template_names:
+        result.page_themes[template_name] = [
+            theme for theme in themes if template_name in page_templates[theme]
+        ]
+
+    for plugin in plugin_registry.get_all_plugins():
+        supported = []
+        for theme in themes:
+            templates = type(plugin.templates)(
+                plugin_name=plugin.name,
+                template_names=plugin.templates.template_names,
+                theme=theme,
+            )
+            paths = [
+                templates.get_template_path(key) for key in templates.template_names
+            ]
+            absent = [path for path in paths if not compile_template(path)]
+            result.compiled += len(paths) - len(absent)
+            if not absent:
+                supported.append(theme)
+            elif len(absent) < len(paths):
+                result.missing.extend(absent)
+        result.plugin_themes[plugin.name] = supported
+
+    theme_support.checked_page_templates = frozenset(page_template_names)
+    theme_support.page_templates = {
+        theme: frozenset(template_names)
+        for theme, template_names in page_templates.items()
+    }
+    for path in result.missing:
+        logger.warning("django-resume template %s is missing", path)
+    logger.debug("Compiled %d django-resume templates", result.compiled)
+    return result
@@ -0,0 +1,111 @@
+"""
+Reverse a URL pattern once and format ids into it.
+
+Edit mode renders an edit and a delete link for every list item and every
+page render builds the navigation links, each of which is a ``reverse()``
+call walking the resolver. :func:`reverse_cached` reverses a route once with
+placeholder arguments, keeps the result as a template and substitutes the
+real arguments on later calls.
+
+Templates are keyed by the route name, the argument names, the active script
+prefix and the active URLconf, so custom mount prefixes, ``SCRIPT_NAME`` and
+per-request URLconfs each get their own template. Values that are not plain
+path slugs, and patterns the placeholders cannot be located in, fall back to
+``reverse()``.
+"""
+
+import re
+from typing import Any
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.urls import NoReverseMatch, get_script_prefix, get_urlconf, reverse
+
+# Placeholders that match the ``int``, ``slug`` and ``str`` path converters
+# and are unlikely to appear in a URL prefix.
+INT_PLACEHOLDER_BASE = 918273645500
+STR_PLACEHOLDER_PREFIX = "djresumeplaceholder"
+SAFE_VALUE_RE = re.compile(r"[-a-zA-Z0-9_]+")
+
+UrlTemplate = tuple[tuple[str, ...], tuple[str, ...]]
+_url_templates: dict[tuple, UrlTemplate | None] = {}
+
+
+def clear_url_templates() -> None:
+    _url_templates.clear()
+
+
+@receiver(setting_changed)
+def clear_url_templates_on_urlconf_change(*, setting: str, **kwargs: Any) -> None:
+    if setting == "ROOT_URLCONF":
+        clear_url_templates()
+
+
+def build_url_template(viewname: str, kwargs: dict[str, Any]) -> UrlTemplate | None:
+    """Reverse ``viewname`` with placeholders and split the URL around them.
+
+    Returns the literal parts and the argument name between each pair of
+    parts, or None if the placeholders are rejected by the pattern or do not
+    occur exactly once.
+    """
+    placeholders = {}
+    for index, (name, value) in enumerate(kwargs.items()):
+        if isinstance(value, int):
+            placeholders[name] = str(INT_PLACEHOLDER_BASE + index)
+        else:
+            placeholders[name] = f"{STR_PLACEHOLDER_PREFIX}{index}"
+    try:
+        url = reverse(viewname, kwargs=placeholders)
+    except NoReverseMatch:
+        return None
+    positions = []
+    for name, placeholder in placeholders.items():
+        if url.count(placeholder) != 1:
+            return None
+        positions.append((url.index(placeholder), name, placeholder))
+    parts, names, start = [], [], 0
+    for position, name, placeholder in sorted(positions):
+        parts.append(url[start:position])
+        names.append(name)
+        start = position + len(placeholder)
+    parts.append(url[start:])
+    return tuple(parts), tuple(names)
+
+
+def is_safe_value(value: Any) -> bool:
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, int):
+        return value >= 0
+    return isinstance(value, str) and SAFE_VALUE_RE.fullmatch(value) is not None
+
+
+def reverse_cached(viewname: str, **kwargs: Any) -> str:
+    """Equivalent to ``reverse(viewname, kwargs=kwargs)``, resolved once.
+
+    Only non-negative ``int`` values and strings made of letters, digits,
+    hyphens and underscores are formatted into the cached template, so the
+    route's converters must accept any such value (``int``, ``slug`` and
+    ``str`` do). Anything else is passed to ``reverse()`` so it is validated
+    and quoted as usual.
+    """
+    if not all(is_safe_value(value) for value in kwargs.values()):
+        return reverse(viewname, kwargs=kwargs)
+    key = (
+        viewname,
+        tuple((name, isinstance(value, int)) for name, value in kwargs.items()),
+        get_script_prefix(),
+        get_urlconf(),
+    )
+    try:
+        url_template = _url_templates[key]
+    except KeyError:
+        url_template = _url_templates[key] = build_url_template(viewname, kwargs)
+    if url_template is None:
+        return reverse(viewname, kwargs=kwargs)
+    parts, names = url_template
+    url = [parts[0]]
+    for name, part in zip(names, parts[1:]):
+        url.append(str(kwargs[name]))
+        url.append(part)
+    return "".join(url)
@@ -1,4 +1,4 @@
-from django.urls import path, reverse
+from django.urls import path, re_path, reverse
 from django.views.generic import RedirectView
 
 from . import views
@@ -45,7 +45,9 @@ urlpatterns = [
         views.render_json_resume_theme,
         name="json-resume-rendered",
     ),
+    path("jobs/<int:job_id>/", views.job_status, name="job-status"),
     path("cv/<slug:slug>/", CvRedirectView.as_view(), name="cv-redirect"),
+    re_path(r"^(?P<name>uploads/[0-9a-f]{2}/.+)$", views.serve_upload, name="upload"),
     # cover, cv and 403 pages (generated; bare "<slug:slug>/" catch-all is last)
     *page_registry.get_urls(),
 ]
@@ -1,41 +1,54 @@
 import json
+import posixpath
 from typing import Any
 from urllib.parse import urlencode
 
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
-from django.http import Http404, HttpRequest, HttpResponse
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpRequest, HttpResponse
 from django.shortcuts import redirect, render, get_object_or_404
 from django.urls import reverse
 from django.views.decorators.http import require_http_methods
 
-from .formats.json_resume.export import export_resume
-from .formats.json_resume.importer import (
+from .formats.json_resume.errors import (
     JsonResumeImportError,
-    MAX_INPUT_BYTES,
-    load_document_bytes,
-    load_document_url,
-    import_resume_document,
-)
-from .formats.json_resume.themes import (
     JsonResumeThemeError,
     UnknownThemeCatalogKey,
-    catalog_theme,
-    dynamic_theme_install_allowed,
-    install_catalog_theme,
-    install_theme,
-    render_catalog_theme,
-    render_selected_theme,
-    search_themes,
-    selected_catalog_theme_key,
-    selected_theme_name,
-    set_selected_catalog_theme,
-    set_selected_theme,
-    theme_catalog,
 )
 from .interchange.coordinator import PathConflictError
 from .forms import JsonResumeImportForm, ResumeForm
-from .models import Resume
+from .images import (
+    is_content_addressed,
+    serve_uploads_enabled,
+    upload_content_type,
+)
+from .jobs import background_jobs_enabled, enqueue_job
+from .lazy import lazy_function
+from .models import Job, Resume
+
+# The JSON Resume exporter, importer and theme support are imported on first
+# use; they load jsonschema, the HTTP client and the theme runner.
+_EXPORT = "django_resume.formats.json_resume.export"
+_IMPORTER = "django_resume.formats.json_resume.importer"
+_THEMES = "django_resume.formats.json_resume.themes"
+
+export_resume = lazy_function(_EXPORT, "export_resume")
+load_document_chunks = lazy_function(_IMPORTER, "load_document_chunks")
+load_document_url = lazy_function(_IMPORTER, "load_document_url")
+import_resume_document = lazy_function(_IMPORTER, "import_resume_document")
+catalog_theme = lazy_function(_THEMES, "catalog_theme")
+dynamic_theme_install_allowed = lazy_function(_THEMES, "dynamic_theme_install_allowed")
+install_catalog_theme = lazy_function(_THEMES, "install_catalog_theme")
+install_theme = lazy_function(_THEMES, "install_theme")
+render_catalog_theme = lazy_function(_THEMES, "render_catalog_theme")
+render_selected_theme = lazy_function(_THEMES, "render_selected_theme")
+search_themes = lazy_function(_THEMES, "search_themes")
+selected_catalog_theme_key = lazy_function(_THEMES, "selected_catalog_theme_key")
+selected_theme_name = lazy_function(_THEMES, "selected_theme_name")
+set_selected_catalog_theme = lazy_function(_THEMES, "set_selected_catalog_theme")
+set_selected_theme = lazy_function(_THEMES, "set_selected_theme")
+theme_catalog = lazy_function(_THEMES, "theme_catalog")
 
 
 def _resume_list_context(request: HttpRequest, **extra: Any) -> dict[str, Any]:
@@ -93,15 +106,35 @@ def import_json_resume(request: HttpRequest) -> HttpResponse:
         source_error_field = (
             "source_url" if form.cleaned_data.get("source_url") else "file"
         )
+        from .formats.json_resume.importer import MAX_INPUT_BYTES
+
+        uploaded_file = form.cleaned_data.get("file")
+        if uploaded_file is None and background_jobs_enabled():
+            # Fetching the document can take as long as the URL timeout.
+            job = enqueue_job(
+                "json_resume.import_url",
+                owner=request.user,
+                payload={
+                    "source_url": form.cleaned_data["source_url"],
+                    "slug": form.cleaned_data["slug"],
+                    "name": form.cleaned_data["name"],
+                    "portable_only": form.cleaned_data["portable_only"],
+                },
+            )
+            context = _resume_list_context(request, import_job=job)
+            return render(
+                request,
+                "django_resume/pages/plain/resume_list_main.html",
+                context=context,
+            )
         try:
-            uploaded_file = form.cleaned_data.get("file")
             if uploaded_file is not None:
                 if uploaded_file.size > MAX_INPUT_BYTES:
                     raise JsonResumeImportError(
                         f"Input exceeds maximum size of {MAX_INPUT_BYTES} bytes"
                     )
-                document = load_document_bytes(
-                    uploaded_file.read(), source=uploaded_file.name
+                document = load_document_chunks(
+                    uploaded_file.chunks(), source=uploaded_file.name
                 )
             else:
                 document = load_document_url(form.cleaned_data["source_url"])
@@ -145,6 +178,35 @@ def resume_delete(request: HttpRequest, slug: str) -> HttpResponse:
     return HttpResponse(status=200)  # 200 instead of 204 for htmx compatibility
 
 
+@require_http_methods(["GET", "HEAD"])
+def serve_upload(request: HttpRequest, name: str) -> FileResponse:
+    """
+    Serve a content-addressed upload with immutable cache headers.
+
+    Only active with ``DJANGO_RESUME_SERVE_UPLOADS``. The path embeds the
+    content hash, so the response never changes and may be cached forever.
+    Uploads are owner-controlled, so only image types are served inline and
+    the browser must not sniff another type; anything else is a download.
+    """
+    if not serve_uploads_enabled() or not is_content_addressed(name):
+        raise Http404
+    try:
+        file = default_storage.open(name, "rb")
+    except (FileNotFoundError, OSError):
+        raise Http404
+    content_type = upload_content_type(name)
+    if content_type is None:
+        response = FileResponse(
+            file, as_attachment=True, content_type="application/octet-stream"
+        )
+    else:
+        response = FileResponse(file, content_type=content_type)
+    response["X-Content-Type-Options"] = "nosniff"
+    response["Cache-Control"] = "public, max-age=31536000, immutable"
+    response["ETag"] = f'"{posixpath.basename(name)}"'
+    return response
+
+
 @login_required
 @require_http_methods(["GET"])
 def export_json_resume(request: HttpRequest, slug: str) -> HttpResponse:
@@ -217,6 +279,13 @@ def install_json_resume_theme(request: HttpRequest, slug: str) -> HttpResponse:
         return HttpResponse(status=404)
     package_name = request.POST.get("package", "")
     query = request.POST.get("q", "")
+    if background_jobs_enabled():
+        job = enqueue_job(
+            "json_resume.install_theme",
+            owner=request.user,
+            payload={"resume_id": resume.pk, "package": package_name},
+        )
+        return _theme_selector_job_response(request, resume, job, query=query)
     try:
         install_theme(package_name)
         set_selected_theme(resume, package_name)
@@ -248,6 +317,28 @@ def install_json_resume_theme(request: HttpRequest, slug: str) -> HttpResponse:
     return redirect(url)
 
 
+def _theme_selector_job_response(
+    request: HttpRequest, resume: Resume, job: Job, *, query: str = ""
+) -> HttpResponse:
+    """The theme selector with the status of a queued theme job."""
+    return render(
+        request,
+        "django_resume/json_resume/theme_selector.html",
+        {
+            "resume": resume,
+            "catalog": theme_catalog(),
+            "query": query,
+            "results": [],
+            "selected_theme": selected_theme_name(resume),
+            "selected_catalog_key": selected_catalog_theme_key(resume),
+            "allow_dynamic_install": dynamic_theme_install_allowed(),
+            "job": job,
+            "is_editable": True,
+        },
+        status=202,
+    )
+
+
 @login_required
 @require_http_methods(["POST"])
 def preview_json_resume_catalog_theme(
@@ -281,6 +372,17 @@ def use_json_resume_catalog_theme(
     resume = get_object_or_404(Resume, slug=slug)
     if resume.owner != request.user:
         return HttpResponse(status=404)
+    if background_jobs_enabled():
+        try:
+            entry = catalog_theme(key)
+        except UnknownThemeCatalogKey as exc:
+            raise Http404 from exc
+        job = enqueue_job(
+            "json_resume.use_catalog_theme",
+            owner=request.user,
+            payload={"resume_id": resume.pk, "key": entry.key},
+        )
+        return _theme_selector_job_response(request, resume, job)
     try:
         entry = catalog_theme(key)
         install_catalog_theme(entry.key)
@@ -325,6 +427,14 @@ def render_json_resume_theme(request: HttpRequest, slug: str) -> HttpResponse:
     return _theme_html_response(rendered.html)
 
 
+@login_required
+@require_http_methods(["GET"])
+def job_status(request: HttpRequest, job_id: int) -> HttpResponse:
+    """Status fragment of an owned background job, polled by htmx."""
+    job = get_object_or_404(Job, pk=job_id, owner=request.user)
+    return render(request, "django_resume/jobs/status.html", {"job": job})
+
+
 def _theme_html_response(html: str) -> HttpResponse:
     response = HttpResponse(html, content_type="text/html; charset=utf-8")
     response["Cache-Control"] = "private, no-store"
@@ -0,0 +1,463 @@
+import io
+import os
+import struct
+import time
+from datetime import timedelta
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import InMemoryStorage, default_storage
+from django.core.files.uploadedfile import InMemoryUploadedFile
+from django.test import override_settings
+from django.utils import timezone
+
+from django_resume import images
+from django_resume.images import (
+    ImageFormMixin,
+    build_picture_sources,
+    generate_image_derivatives,
+    plan_image_derivatives,
+)
+from django_resume.models import Resume, ResumeProvenance
+
+IN_MEMORY_STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.InMemoryStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
+
+def png_header(width: int, height: int) -> bytes:
+    return b"\211PNG\r\n\032\n" + b"\0\0\0\rIHDR" + struct.pack(">LL", width, height)
+
+
+@override_settings(DJANGO_RESUME_IMAGE_DERIVATIVE_WIDTHS=(320, 160, 640))
+def test_plan_image_derivatives_never_upscales(monkeypatch):
+    monkeypatch.setattr(images, "get_derivative_formats", lambda: ("webp", "jpeg"))
+
+    planned = plan_image_derivatives("uploads/me.png", 500)
+
+    assert planned == [
+        {"path": "uploads/derivatives/me-160w.webp", "width": 160, "format": "webp"},
+        {"path": "uploads/derivatives/me-320w.webp", "width": 320, "format": "webp"},
+        {"path": "uploads/derivatives/me-160w.jpeg", "width": 160, "format": "jpeg"},
+        {"path": "uploads/derivatives/me-320w.jpeg", "width": 320, "format": "jpeg"},
+    ]
+    assert plan_image_derivatives("uploads/me.png", None) == []
+
+
+@override_settings(STORAGES=IN_MEMORY_STORAGES)
+def test_build_picture_sources_groups_srcsets_by_format():
+    for path in ("d/a-160w.webp", "d/a-320w.webp", "d/a-160w.jpeg", "d/a.gif"):
+        default_storage.save(path, ContentFile(b"image"))
+
+    sources = build_picture_sources(
+        [
+            {"path": "d/a-160w.webp", "width": 160, "format": "webp"},
+            {"path": "d/a-320w.webp", "width": 320, "format": "webp"},
+            {"path": "d/a-160w.jpeg", "width": 160, "format": "jpeg"},
+            {"path": "d/a.gif", "width": 10, "format": "gif"},
+        ]
+    )
+
+    assert sources == [
+        {
+            "type": "image/webp",
+            "srcset": f"{default_storage.url('d/a-160w.webp')} 160w, "
+            f"{default_storage.url('d/a-320w.webp')} 320w",
+        },
+        {
+            "type": "image/jpeg",
+            "srcset": f"{default_storage.url('d/a-160w.jpeg')} 160w",
+        },
+    ]
+    assert build_picture_sources(None) == []
+
+
+@override_settings(STORAGES=IN_MEMORY_STORAGES)
+def test_build_picture_sources_skips_renditions_not_written_yet():
+    # Given renditions that were planned, of which only one was written
+    default_storage.save("d/a-160w.webp", ContentFile(b"image"))
+    derivatives = [
+        {"path": "d/a-160w.webp", "width": 160, "format": "webp"},
+        {"path": "d/a-320w.webp", "width": 320, "format": "webp"},
+        {"path": "d/a-160w.avif", "width": 160, "format": "avif"},
+    ]
+
+    # Then only the written one is offered, so no <source> points to a 404
+    sources = build_picture_sources(derivatives)
+    assert sources == [
+        {"type": "image/webp", "srcset": f"{default_storage.url('d/a-160w.webp')} 160w"}
+    ]
+
+    # And the missing ones appear once they are written and the memo expires
+    default_storage.save("d/a-320w.webp", ContentFile(b"image"))
+    images.derivative_exists_cache.clear()
+    assert len(build_picture_sources(derivatives)[0]["srcset"].split(", ")) == 2
+
+
+@pytest.mark.django_db
+@override_settings(
+    STORAGES=IN_MEMORY_STORAGES, DJANGO_RESUME_IMAGE_DERIVATIVE_WIDTHS=(160,)
+)
+def test_image_upload_schedules_derivatives_after_commit(
+    monkeypatch, django_capture_on_commit_callbacks
+):
+    monkeypatch.setattr(images, "get_derivative_formats", lambda: ("webp",))
+    generated = []
+    monkeypatch.setattr(
+        images,
+        "generate_image_derivatives",
+        lambda path, derivatives: generated.append((path, derivatives)),
+    )
+    header = png_header(400, 300)
+    upload = InMemoryUploadedFile(
+        io.BytesIO(header), "avatar_img", "me.png", "image/png", len(header), None
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        cleaned = ImageFormMixin.do_clean_image_field(
+            {"avatar_img": upload, "clear_avatar": False}, "avatar_img", "clear_avatar"
+        )
+        assert generated == []
+    for thread in images.threading.enumerate():
+        if thread.name == "django-resume-image-derivatives":
+            thread.join()
+
+    derivatives = cleaned["avatar_img_derivatives"]
+    assert [(item["width"], item["format"]) for item in derivatives] == [(160, "webp")]
+    assert generated == [(cleaned["avatar_img"], derivatives)]
+
+
+def test_clearing_an_image_drops_its_derivatives():
+    cleaned = ImageFormMixin.do_clean_image_field(
+        {"avatar_img": None, "clear_avatar": True}, "avatar_img", "clear_avatar"
+    )
+
+    assert cleaned == {"avatar_img": None, "avatar_img_derivatives": []}
+
+
+@override_settings(STORAGES=IN_MEMORY_STORAGES)
+def test_generate_image_derivatives_writes_resized_renditions():
+    Image = pytest.importorskip("PIL.Image")
+    buffer = io.BytesIO()
+    Image.new("RGBA", (400, 200), "red").save(buffer, format="PNG")
+    path = default_storage.save("uploads/me.png", ContentFile(buffer.getvalue()))
+    derivatives = [
+        {
+            "path": images.derivative_path(path, 100, "jpeg"),
+            "width": 100,
+            "format": "jpeg",
+        }
+    ]
+
+    assert generate_image_derivatives(path, derivatives) == 1
+
+    with default_storage.open(derivatives[0]["path"], "rb") as file:
+        assert Image.open(file).size == (100, 50)
+
+
+@override_settings(STORAGES=IN_MEMORY_STORAGES)
+def test_generate_image_derivatives_applies_the_exif_orientation():
+    # Given a landscape photo tagged to be displayed rotated by 90 degrees
+    Image = pytest.importorskip("PIL.Image")
+    exif = Image.Exif()
+    exif[0x0112] = 6  # Orientation: rotate 90 CW
+    buffer = io.BytesIO()
+    Image.new("RGB", (400, 200), "red").save(buffer, format="JPEG", exif=exif)
+    path = default_storage.save("uploads/me.jpg", ContentFile(buffer.getvalue()))
+    derivative = {
+        "path": images.derivative_path(path, 100, "jpeg"),
+        "width": 100,
+        "format": "jpeg",
+    }
+
+    # When a rendition is generated
+    assert generate_image_derivatives(path, [derivative]) == 1
+
+    # Then it is upright, like the original as browsers display it
+    with default_storage.open(derivative["path"], "rb") as file:
+        assert Image.open(file).size == (100, 200)
+
+
+@override_settings(STORAGES=IN_MEMORY_STORAGES)
+def test_generate_image_derivatives_skips_existing_renditions_before_decoding(
+    monkeypatch,
+):
+    Image = pytest.importorskip("PIL.Image")
+    path = images.store_upload(in_memory_upload(png_header(400, 200), "me.png"))
+    derivative = {
+        "path": images.derivative_path(path, 100, "webp"),
+        "width": 100,
+        "format": "webp",
+    }
+    default_storage.save(derivative["path"], ContentFile(b"webp"))
+
+    opened = []
+    monkeypatch.setattr(Image, "open", lambda *args: opened.append(args))
+
+    assert generate_image_derivatives(path, [derivative]) == 0
+    assert opened == []
+
+
+class CountingReader(io.BytesIO):
+    def __init__(self, data: bytes) -> None:
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+def jpeg_with_exif(width: int, height: int, exif_size: int) -> bytes:
+    app1 = b"\xff\xe1" + struct.pack(">H", exif_size + 2) + b"\0" * exif_size
+    sof2 = b"\xff\xc2" + struct.pack(">HBHH", 11, 8, height, width) + b"\0" * 4
+    return b"\xff\xd8" + app1 + sof2 + b"\xff\xda"
+
+
+def test_jpeg_dimensions_skip_segment_payloads():
+    data = jpeg_with_exif(640, 480, 60_000)
+    reader = CountingReader(data)
+    reader.seek(7)
+
+    assert images.get_image_metadata_from_bytesio(reader, len(data)) == (640, 480)
+    assert reader.bytes_read < 64
+    assert reader.tell() == 7
+
+
+def test_webp_extended_and_lossless_dimensions():
+    vp8x = b"RIFF\0\0\0\0WEBPVP8X" + b"\0" * 8 + (799).to_bytes(3, "little")
+    vp8x += (599).to_bytes(3, "little") + b"\0\0"
+    bits = (300 - 1) | ((200 - 1) << 14)
+    vp8l = b"RIFF\0\0\0\0WEBPVP8L" + b"\0" * 5 + bits.to_bytes(4, "little")
+    vp8l += b"\0" * 7
+
+    assert images.get_image_metadata_from_bytesio(io.BytesIO(vp8x), 32) == (800, 600)
+    assert images.get_image_metadata_from_bytesio(io.BytesIO(vp8l), 32) == (300, 200)
+
+
+@override_settings(STORAGES=IN_MEMORY_STORAGES)
+def test_image_dimensions_are_probed_from_the_upload_for_every_field(monkeypatch):
+    monkeypatch.setattr(images, "get_derivative_formats", lambda: ())
+
+    def fail_open(*args, **kwargs):
+        raise AssertionError("the stored file must not be re-read")
+
+    monkeypatch.setattr(default_storage, "open", fail_open)
+    header = png_header(1200, 400)
+    upload = InMemoryUploadedFile(
+        io.BytesIO(header), "banner_img", "banner.png", "image/png", len(header), None
+    )
+
+    cleaned = ImageFormMixin.do_clean_image_field(
+        {"banner_img": upload, "clear_banner": False}, "banner_img", "clear_banner"
+    )
+
+    assert (cleaned["banner_img_width"], cleaned["banner_img_height"]) == (1200, 400)
+
+
+def in_memory_upload(content: bytes, name: str) -> InMemoryUploadedFile:
+    return InMemoryUploadedFile(
+        io.BytesIO(content), "avatar_img", name, "image/png", len(content), None
+    )
+
+
+@override_settings(STORAGES=IN_MEMORY_STORAGES)
+def test_uploads_are_stored_once_under_their_content_hash(monkeypatch):
+    content = png_header(10, 10)
+    digest = images.hashlib.sha256(content).hexdigest()
+
+    first = images.store_upload(in_memory_upload(content, "Me.PNG"))
+    saves = []
+    monkeypatch.setattr(default_storage, "save", lambda *args: saves.append(args))
+    second = images.store_upload(in_memory_upload(content, "me.png"))
+
+    assert first == second == f"uploads/{digest[:2]}/{digest}.png"
+    assert saves == []
+    assert images.is_content_addressed(first)
+    assert images.is_content_addressed(images.derivative_path(first, 160, "webp"))
+    assert not images.is_content_addressed("uploads/me.png")
+
+
+def test_reused_uploads_get_a_fresh_modification_time(tmp_path):
+    storages = {
+        **IN_MEMORY_STORAGES,
+        "default": {
+            "BACKEND": "django.core.files.storage.FileSystemStorage",
+            "OPTIONS": {"location": str(tmp_path)},
+        },
+    }
+    with override_settings(STORAGES=storages):
+        # Given an upload stored long ago
+        path = images.store_upload(in_memory_upload(png_header(4, 4), "me.png"))
+        old = time.time() - 7 * 24 * 3600
+        os.utime(default_storage.path(path), (old, old))
+
+        # When the same file is uploaded again
+        assert images.store_upload(in_memory_upload(png_header(4, 4), "me.png")) == path
+
+        # Then the orphan sweep's grace period starts again
+        modified = default_storage.get_modified_time(path)
+        assert timezone.now() - modified < timedelta(minutes=1)
+
+
+@override_settings(STORAGES=IN_MEMORY_STORAGES)
+def test_serve_upload_sends_immutable_cache_headers(client):
+    path = images.store_upload(in_memory_upload(png_header(10, 10), "me.png"))
+
+    with override_settings(DJANGO_RESUME_SERVE_UPLOADS=True):
+        url = images.get_upload_url(path)
+        response = client.get(url)
+        missing = client.get(url.replace(path[-10:], "0" * 6 + ".png"))
+
+    assert url == f"/resume/{path}"
+    assert response.status_code == 200
+    assert response["Cache-Control"] == "public, max-age=31536000, immutable"
+    assert response["Content-Type"] == "image/png"
+    assert response["X-Content-Type-Options"] == "nosniff"
+    assert b"".join(response.streaming_content) == png_header(10, 10)
+    assert missing.status_code == 404
+    assert client.get(url).status_code == 404  # disabled by default
+    assert images.get_upload_url(path) == default_storage.url(path)
+
+
+@override_settings(STORAGES=IN_MEMORY_STORAGES, DJANGO_RESUME_SERVE_UPLOADS=True)
+def test_serve_upload_never_serves_documents_inline(client):
+    # Given an HTML payload uploaded as .html and a legacy .svg upload
+    payload = b"<script>alert(1)</script>"
+    path = images.store_upload(in_memory_upload(payload, "avatar.html"))
+    digest = images.hashlib.sha256(payload).hexdigest()
+    svg = default_storage.save(
+        f"uploads/{digest[:2]}/{digest}.svg", ContentFile(payload)
+    )
+
+    # When they are requested
+    responses = [client.get(images.get_upload_url(name)) for name in (path, svg)]
+
+    # Then the extension is dropped on upload and both are sent as downloads
+    assert path == f"uploads/{digest[:2]}/{digest}"
+    for response in responses:
+        assert response["Content-Type"] == "application/octet-stream"
+        assert response["Content-Disposition"].startswith("attachment")
+        assert response["X-Content-Type-Options"] == "nosniff"
+
+
+@pytest.mark.django_db
+@override_settings(STORAGES=IN_MEMORY_STORAGES)
+def test_remove_orphaned_uploads_keeps_referenced_and_recent_files(user):
+    kept = images.store_upload(in_memory_upload(png_header(1, 1), "kept.png"))
+    rendition = images.derivative_path(kept, 160, "webp")
+    default_storage.save(rendition, ContentFile(b"webp"))
+    orphan = images.store_upload(in_memory_upload(png_header(2, 2), "orphan.png"))
+    user.save()
+    Resume.objects.create(
+        name="Resume",
+        slug="resume",
+        owner=user,
+        plugin_data={
+            "identity": {
+                "avatar_img": kept,
+                "avatar_img_derivatives": [{"path": rendition, "width": 160}],
+            }
+        },
+    )
+    later = timezone.now() + timedelta(days=2)
+
+    assert images.remove_orphaned_uploads().files == 0  # still in grace period
+    dry_run = images.remove_orphaned_uploads(now=later, dry_run=True)
+    assert default_storage.exists(orphan)
+    result = images.remove_orphaned_uploads(now=later)
+
+    assert (dry_run.files, dry_run.bytes) == (1, len(png_header(2, 2)))
+    assert (result.files, result.bytes) == (1, len(png_header(2, 2)))
+    assert not default_storage.exists(orphan)
+    assert default_storage.exists(kept)
+    assert default_storage.exists(rendition)
+
+
+@pytest.mark.django_db
+@override_settings(STORAGES=IN_MEMORY_STORAGES)
+def test_remove_orphaned_uploads_spares_foreign_and_provenance_files(user):
+    # Given a host project's file below uploads/, a legacy upload and an
+    # image only referenced by a resume's import provenance
+    foreign = default_storage.save("uploads/invoices/2026.pdf", ContentFile(b"pdf"))
+    legacy = default_storage.save("uploads/avatar.png", ContentFile(b"png"))
+    imported = images.store_upload(in_memory_upload(png_header(3, 3), "cv.png"))
+    user.save()
+    resume = Resume.objects.create(name="Resume", slug="resume", owner=user)
+    ResumeProvenance.objects.create(
+        resume=resume, data={"json_resume": {"plugin_data": {"image": imported}}}
+    )
+    later = timezone.now() + timedelta(days=2)
+
+    # When orphans are removed
+    assert images.remove_orphaned_uploads(now=later).files == 0
+
+    # Then only the explicit legacy sweep touches files it did not name
+    assert default_storage.exists(imported)
+    assert default_storage.exists(foreign)
+    assert images.remove_orphaned_uploads(now=later, include_legacy=True).files == 2
+    assert not default_storage.exists(legacy)
+    assert default_storage.exists(imported)
+
+
+@pytest.mark.django_db
+@override_settings(STORAGES=IN_MEMORY_STORAGES)
+def test_remove_orphaned_uploads_rechecks_references_before_deleting(user, monkeypatch):
+    # Given an old orphan that a resume starts referencing after the
+    # references were collected
+    orphan = images.store_upload(in_memory_upload(png_header(5, 5), "me.png"))
+    user.save()
+    Resume.objects.create(
+        name="Resume",
+        slug="resume",
+        owner=user,
+        plugin_data={"identity": {"avatar_img": orphan}},
+    )
+    monkeypatch.setattr(images, "collect_referenced_uploads", set)
+    later = timezone.now() + timedelta(days=2)
+
+    # When orphans are removed
+    result = images.remove_orphaned_uploads(now=later)
+
+    # Then the file is kept
+    assert result.files == 0
+    assert default_storage.exists(orphan)
+
+
+class SigningStorage(InMemoryStorage):
+    querystring_expire = 60
+    signed = 0
+
+    def url(self, name):
+        SigningStorage.signed += 1
+        return f"{super().url(name)}?signature={SigningStorage.signed}"
+
+
+@override_settings(
+    STORAGES={
+        **IN_MEMORY_STORAGES,
+        "default": {"BACKEND": "tests.images_test.SigningStorage"},
+    }
+)
+def test_upload_urls_are_signed_once_per_window(monkeypatch):
+    SigningStorage.signed = 0
+    clock = [1000.0]
+    monkeypatch.setattr(images.time, "monotonic", lambda: clock[0])
+
+    # Half of the backend's 60 second signature lifetime caps the 5 minute TTL.
+    assert images.get_upload_url_cache_ttl() == timedelta(seconds=30)
+    first = images.get_upload_url("uploads/me.png")
+    assert ImageFormMixin.get_image_url_for_field("uploads/me.png") == first
+    clock[0] += 29
+    assert images.get_upload_url("uploads/me.png") == first
+    clock[0] += 2
+    second = images.get_upload_url("uploads/me.png")
+
+    assert first.endswith("signature=1")
+    assert second.endswith("signature=2")
+    with override_settings(DJANGO_RESUME_UPLOAD_URL_CACHE_TTL=timedelta(0)):
+        images.get_upload_url("uploads/me.png")
+        images.get_upload_url("uploads/me.png")
+    assert SigningStorage.signed == 4
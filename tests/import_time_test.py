@@ -0,0 +1,68 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+# Loaded on first use only (see django_resume.lazy); importing the URLconf,
+# which imports every view, must not pull them in.
+LAZY_MODULES = [
+    "jsonschema",
+    "urllib.request",
+    "django_resume.formats.json_resume.export",
+    "django_resume.formats.json_resume.importer",
+    "django_resume.formats.json_resume.themes",
+    "django_resume.formats.json_resume.validation",
+]
+
+
+def import_times(statement: str) -> dict[str, int]:
+    """Cumulative import time in microseconds per module imported by ``statement``.
+
+    Runs in a fresh interpreter with ``python -X importtime``.
+    """
+    root = Path(__file__).resolve().parent.parent
+    env = {
+        **os.environ,
+        "DJANGO_SETTINGS_MODULE": "tests.settings",
+        "PYTHONPATH": os.pathsep.join(
+            [str(root), str(root / "src"), os.environ.get("PYTHONPATH", "")]
+        ),
+    }
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=root,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _self, cumulative, module = line[len("import time:") :].split("|")
+        if cumulative.strip().isdigit():
+            times[module.strip()] = int(cumulative)
+    return times
+
+
+def test_urlconf_import_skips_optional_features():
+    times = import_times("import django; django.setup(); import django_resume.urls")
+
+    assert "django_resume.views" in times
+    loaded = [module for module in LAZY_MODULES if module in times]
+    assert loaded == [], (
+        f"importing django_resume.urls loaded {loaded}; "
+        f"it took {times['django_resume.urls'] / 1000:.1f} ms"
+    )
+
+
+def test_lazy_view_functions_load_their_module_on_call():
+    # importlib imports are not reported by -X importtime, so check sys.modules.
+    times = import_times(
+        "import sys, django; django.setup(); from django_resume import views; "
+        "views.theme_catalog(); "
+        "assert 'django_resume.formats.json_resume.themes' in sys.modules"
+    )
+
+    assert "django_resume.formats.json_resume.export" in times
@@ -0,0 +1,271 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from django_resume import jobs
+from django_resume.formats.json_resume.themes import catalog_theme
+from django_resume.jobs import (
+    JobFailed,
+    claim_job,
+    enqueue_job,
+    run_job,
+    run_pending_jobs,
+)
+from django_resume.models import Job, Resume
+
+
+def echo_job(job):
+    return {"message": "done", "echo": job.payload["value"]}
+
+
+def failing_job(job):
+    raise JobFailed("Nope.")
+
+
+def crashing_job(job):
+    raise RuntimeError("internal detail")
+
+
+TEST_HANDLERS = {
+    "test.echo": f"{__name__}.echo_job",
+    "test.fail": f"{__name__}.failing_job",
+    "test.crash": f"{__name__}.crashing_job",
+}
+
+
+@pytest.fixture
+def owner(django_user_model):
+    return django_user_model.objects.create_user(username="owner", password="test")
+
+
+@pytest.fixture
+def job_settings(settings):
+    settings.DJANGO_RESUME_JOB_HANDLERS = TEST_HANDLERS
+    return settings
+
+
+@pytest.mark.django_db
+def test_inline_runner_runs_job_on_enqueue(job_settings, owner):
+    job = enqueue_job("test.echo", owner=owner, payload={"value": 42})
+
+    job.refresh_from_db()
+    assert job.status == Job.Status.SUCCEEDED
+    assert job.result == {"message": "done", "echo": 42}
+    assert job.started_at is not None and job.finished_at is not None
+
+
+@pytest.mark.django_db
+def test_worker_runner_leaves_job_queued(job_settings, owner):
+    job_settings.DJANGO_RESUME_JOB_RUNNER = "worker"
+
+    job = enqueue_job("test.echo", owner=owner, payload={"value": 1})
+
+    job.refresh_from_db()
+    assert job.status == Job.Status.PENDING
+    assert run_pending_jobs() == 1
+    job.refresh_from_db()
+    assert job.status == Job.Status.SUCCEEDED
+
+
+@pytest.mark.django_db
+def test_claim_job_claims_each_job_once(job_settings, owner):
+    job_settings.DJANGO_RESUME_JOB_RUNNER = "worker"
+    first = enqueue_job("test.echo", owner=owner, payload={"value": 1})
+    second = enqueue_job("test.echo", owner=owner, payload={"value": 2})
+
+    assert claim_job().pk == first.pk
+    assert claim_job().pk == second.pk
+    assert claim_job() is None
+
+
+@pytest.mark.django_db
+def test_thread_runner_submits_job_after_commit(
+    job_settings, owner, monkeypatch, django_capture_on_commit_callbacks
+):
+    job_settings.DJANGO_RESUME_JOB_RUNNER = "thread"
+    submitted = []
+
+    class Executor:
+        def submit(self, function, *args):
+            submitted.append(args)
+            function(*args)
+
+    monkeypatch.setattr(jobs, "get_executor", Executor)
+    monkeypatch.setattr(jobs, "close_old_connections", lambda: None)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        job = enqueue_job("test.echo", owner=owner, payload={"value": 3})
+        assert submitted == []
+
+    assert submitted == [(job.pk,)]
+    job.refresh_from_db()
+    assert job.status == Job.Status.SUCCEEDED
+
+
+@pytest.mark.django_db
+def test_failed_jobs_keep_only_owner_facing_messages(job_settings, owner):
+    failed = enqueue_job("test.fail", owner=owner, payload={})
+    crashed = enqueue_job("test.crash", owner=owner, payload={})
+    unknown = enqueue_job("test.unknown", owner=owner, payload={})
+
+    assert (failed.status, failed.error) == (Job.Status.FAILED, "Nope.")
+    assert crashed.status == Job.Status.FAILED
+    assert crashed.error == jobs.UNEXPECTED_ERROR_MESSAGE
+    assert "test.unknown" in run_job(unknown).error
+
+
+@pytest.mark.django_db
+def test_stale_running_jobs_are_failed_by_the_next_worker_pass(job_settings, owner):
+    # Given a job whose worker died an hour ago, and one that just started
+    job_settings.DJANGO_RESUME_JOB_RUNNER = "worker"
+    orphaned = enqueue_job("test.echo", owner=owner, payload={"value": 1})
+    current = enqueue_job("test.echo", owner=owner, payload={"value": 2})
+    Job.objects.filter(pk=orphaned.pk).update(
+        status=Job.Status.RUNNING, started_at=timezone.now() - timedelta(hours=1)
+    )
+    Job.objects.filter(pk=current.pk).update(
+        status=Job.Status.RUNNING, started_at=timezone.now()
+    )
+
+    # When a worker runs
+    run_pending_jobs()
+
+    # Then only the orphaned job is failed, and it is not run again
+    orphaned.refresh_from_db()
+    current.refresh_from_db()
+    assert orphaned.status == Job.Status.FAILED
+    assert orphaned.error == jobs.INTERRUPTED_ERROR_MESSAGE
+    assert orphaned.result == {}
+    assert current.status == Job.Status.RUNNING
+
+
+@pytest.mark.django_db
+def test_thread_runner_leftovers_are_drained_by_run_resume_jobs(job_settings, owner):
+    # A job queued by the thread runner of a process that restarted before
+    # the transaction's on_commit hook ran stays pending.
+    job_settings.DJANGO_RESUME_JOB_RUNNER = "thread"
+    job = enqueue_job("test.echo", owner=owner, payload={"value": 1})
+
+    call_command("run_resume_jobs", "--once", stdout=StringIO())
+
+    job.refresh_from_db()
+    assert job.status == Job.Status.SUCCEEDED
+
+
+@pytest.mark.django_db
+def test_job_status_stops_polling_stale_jobs(client, job_settings, owner):
+    job_settings.DJANGO_RESUME_JOB_RUNNER = "worker"
+    job = enqueue_job("test.echo", owner=owner, payload={"value": 1})
+    client.force_login(owner)
+    url = reverse("resume:job-status", kwargs={"job_id": job.pk})
+    assert "hx-get" in client.get(url).content.decode()
+
+    Job.objects.filter(pk=job.pk).update(created_at=timezone.now() - timedelta(hours=1))
+    content = client.get(url).content.decode()
+
+    assert "hx-get" not in content
+    assert "taking longer than expected" in content
+
+
+def test_invalid_job_timeout_is_rejected(settings):
+    settings.DJANGO_RESUME_JOB_TIMEOUT = 60
+
+    with pytest.raises(ImproperlyConfigured):
+        jobs.get_job_timeout()
+
+
+def test_invalid_job_runner_is_rejected(settings):
+    settings.DJANGO_RESUME_JOB_RUNNER = "celery"
+
+    with pytest.raises(ImproperlyConfigured):
+        jobs.get_job_runner()
+
+
+@pytest.mark.django_db
+def test_run_resume_jobs_command(job_settings, owner):
+    job_settings.DJANGO_RESUME_JOB_RUNNER = "worker"
+    enqueue_job("test.echo", owner=owner, payload={"value": 1})
+    enqueue_job("test.echo", owner=owner, payload={"value": 2})
+    stdout = StringIO()
+
+    call_command("run_resume_jobs", "--once", stdout=stdout)
+
+    assert "Ran 2 jobs in total" in stdout.getvalue()
+    assert not Job.objects.exclude(status=Job.Status.SUCCEEDED).exists()
+
+
+@pytest.mark.django_db
+def test_url_import_is_queued_and_polled(client, settings, owner, monkeypatch):
+    # Given background jobs run by a worker
+    settings.DJANGO_RESUME_JOB_RUNNER = "worker"
+    client.force_login(owner)
+    monkeypatch.setattr(
+        "django_resume.formats.json_resume.jobs.load_document_url",
+        lambda url: {"basics": {"name": "Queued Jane"}},
+    )
+
+    # When a URL import is posted
+    response = client.post(
+        reverse("resume:json-resume-import"),
+        {"source_url": "https://example.com/resume.json", "slug": "queued-jane"},
+    )
+
+    # Then the view returns at once with a polling status fragment
+    assert response.status_code == 200
+    job = Job.objects.get()
+    status_url = reverse("resume:job-status", kwargs={"job_id": job.pk})
+    assert f'hx-get="{status_url}"' in response.content.decode()
+    assert not Resume.objects.filter(slug="queued-jane").exists()
+
+    # And once the worker ran the job, polling shows the result
+    run_pending_jobs()
+    response = client.get(status_url)
+    content = response.content.decode()
+    assert "Imported Queued Jane." in content
+    assert "hx-get" not in content
+    assert Resume.objects.get(slug="queued-jane").owner == owner
+
+
+@pytest.mark.django_db
+def test_job_status_is_private(client, django_user_model, job_settings, owner):
+    job = enqueue_job("test.echo", owner=owner, payload={"value": 1})
+    other = django_user_model.objects.create_user(username="other", password="test")
+    client.force_login(other)
+
+    response = client.get(reverse("resume:job-status", kwargs={"job_id": job.pk}))
+
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_catalog_theme_use_is_queued(client, settings, owner, monkeypatch):
+    settings.DJANGO_RESUME_JOB_RUNNER = "worker"
+    resume = Resume.objects.create(name="Jane", slug="jane", owner=owner)
+    client.force_login(owner)
+    installed = []
+    monkeypatch.setattr(
+        "django_resume.formats.json_resume.jobs.install_catalog_theme",
+        lambda key: installed.append(key) or catalog_theme(key),
+    )
+
+    response = client.post(
+        reverse(
+            "resume:json-resume-theme-use", kwargs={"slug": resume.slug, "key": "even"}
+        )
+    )
+
+    assert response.status_code == 202
+    assert installed == []
+    job = Job.objects.get()
+    assert job.payload == {"resume_id": resume.pk, "key": "even"}
+
+    run_pending_jobs()
+
+    job.refresh_from_db()
+    assert installed == ["even"]
+    assert job.status == Job.Status.SUCCEEDED
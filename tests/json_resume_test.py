@@ -9,7 +9,8 @@ from pathlib import Path
 import pytest
 from django.core.management import call_command
 from django.core.management.base import CommandError
-from django.db import IntegrityError
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 import django_resume.formats.json_resume as json_resume_pkg
@@ -22,9 +23,15 @@ from django_resume.formats.json_resume.importer import (
     MAX_INPUT_BYTES,
     import_resume_document,
     load_document_bytes,
+    load_document_chunks,
     load_document_url,
     load_document,
 )
+from django_resume.formats.json_resume.streaming import (
+    CHUNK_SIZE,
+    MAX_NESTING_DEPTH,
+    parse_document_chunks,
+)
 from django_resume.formats.json_resume import themes as json_resume_themes
 from django_resume.formats.json_resume.themes import (
     JsonResumeThemeError,
@@ -47,7 +54,7 @@ from django_resume.interchange.coordinator import (
     PathConflictError,
     build_document,
 )
-from django_resume.models import Resume
+from django_resume.models import Resume, ResumeProvenance
 from django_resume.plugins import SimplePlugin, ListPlugin
 from django_resume.plugins.about import AboutPlugin
 from django_resume.plugins.education import EducationPlugin
@@ -940,6 +947,37 @@ def test_preserved_extensions_are_stored_and_reexported(user):
     ]
 
 
+@pytest.mark.django_db
+def test_import_provenance_is_stored_off_the_resume_row(user, client):
+    user.save()
+    document = load_official_schema_sample()
+
+    result = import_resume_document(
+        document,
+        owner=user,
+        slug="jsonresume-provenance",
+        restore_django_resume_data=False,
+    )
+
+    assert result.resume is not None
+    resume = Resume.objects.get(slug="jsonresume-provenance")
+    assert resume.integration_data == {}
+    provenance = ResumeProvenance.objects.get(resume=resume)
+    assert provenance.data["json_resume"]["source_document"] == document
+    assert resume.get_provenance("json_resume")["source_plugin_data"] == (
+        resume.plugin_data
+    )
+
+    client.force_login(user)
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(
+            reverse("django_resume:cv", kwargs={"slug": "jsonresume-provenance"})
+        )
+    assert response.status_code == 200
+    assert not any("django_resume_resumeprovenance" in q["sql"] for q in queries)
+    assert not any('"integration_data"' in q["sql"] for q in queries)
+
+
 @pytest.mark.django_db
 def test_import_resume_document_rejects_duplicate_source_path_adapters(user):
     user.save()
@@ -1926,6 +1964,70 @@ def test_load_document_bytes_rejects_oversize_input():
         load_document_bytes(b" " * (MAX_INPUT_BYTES + 1))
 
 
+def split_bytes(data, size):
+    return [data[start : start + size] for start in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 1024])
+def test_load_document_chunks_matches_json_loads(size):
+    data = json.dumps(
+        {
+            "basics": {"name": 'Jäne "Doe"', "summary": "Line\nbreak \U0001f600"},
+            "work": [{"highlights": ["a\\b", ""], "rank": -12.5e-3}, {}],
+            "meta": {"flags": [True, False, None], "count": 0, "big": 10**30},
+        },
+        indent=2,
+    ).encode()
+
+    assert load_document_chunks(split_bytes(data, size)) == json.loads(data)
+
+
+def test_load_document_chunks_rejects_input_early():
+    consumed = []
+
+    def chunks():
+        for chunk in [b'{"basics": {"name": "Jane",', b' "name": "Janet"}', b"}"]:
+            consumed.append(chunk)
+            yield chunk
+
+    with pytest.raises(JsonResumeImportError, match="Duplicate JSON object key"):
+        load_document_chunks(chunks())
+    assert len(consumed) == 2
+
+
+def test_load_document_chunks_rejects_oversize_input_while_streaming():
+    def chunks():
+        while True:
+            yield b" " * CHUNK_SIZE
+
+    with pytest.raises(JsonResumeImportError, match="Input exceeds maximum size"):
+        load_document_chunks(chunks())
+
+
+def test_load_document_chunks_rejects_deep_nesting():
+    data = b'{"a": ' * MAX_NESTING_DEPTH + b"1" + b"}" * MAX_NESTING_DEPTH
+    assert parse_document_chunks([data], max_bytes=len(data))
+
+    with pytest.raises(JsonResumeImportError, match="Nesting deeper than"):
+        load_document_chunks([b"[" * (MAX_NESTING_DEPTH + 1)])
+
+
+@pytest.mark.parametrize(
+    "data, message",
+    [
+        (b'{"basics": ', "Invalid JSON: Expecting value"),
+        (b'{"basics": {}} []', "Invalid JSON: Extra data: line 1 column 16"),
+        (b'{"basics": [1 2]}', "Invalid JSON: Expecting ',' delimiter"),
+        (b'{"basics": "\xff"}', "Invalid UTF-8 in input"),
+        (b'{"basics": "unterminated', "Unterminated string"),
+        (b"[]", "JSON Resume document must be an object"),
+    ],
+)
+def test_load_document_chunks_rejects_invalid_input(data, message):
+    with pytest.raises(JsonResumeImportError, match=message):
+        load_document_chunks(split_bytes(data, 3))
+
+
 def test_load_document_url_rejects_non_http_url():
     with pytest.raises(JsonResumeImportError, match="must use http or https") as exc:
         load_document_url("file:///tmp/resume.json")
@@ -1964,8 +2066,9 @@ def test_load_document_url_does_not_read_redirect_response_body(monkeypatch):
         def read(self, *args):
             if self.status in {301, 302, 303, 307, 308}:
                 raise AssertionError("redirect response body should not be read")
-            assert args == (MAX_INPUT_BYTES + 1,)
-            return self._body
+            assert args == (CHUNK_SIZE,)
+            body, self._body = self._body, b""
+            return body
 
     class FakeConnection:
         def __init__(self, response):
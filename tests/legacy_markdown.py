@@ -0,0 +1,50 @@
+"""
+The multi-pass markdown renderer ``markdown_to_html`` replaced.
+
+Tests use it as the oracle the current renderer must match, and the markdown
+benchmark as the baseline.
+"""
+
+import re
+from collections.abc import Callable
+
+from django_resume.markdown import sanitize_html
+
+
+def legacy_markdown_to_html(
+    text: str, handlers: dict[str, Callable] | None = None
+) -> str:
+    if handlers is None:
+        handlers = {}
+
+    def render_heading(m):
+        level = len(m.group(1))
+        content = m.group(2).strip()
+        if "heading" in handlers:
+            return handlers["heading"](level, content)
+        return f"<h{level}>{content}</h{level}>"
+
+    text = re.sub(r"^(#{1,6})\s*(.*)", render_heading, text, flags=re.MULTILINE)
+
+    def render_bold(m):
+        if "bold" in handlers:
+            return handlers["bold"](m.group(1))
+        return f"<strong>{m.group(1)}</strong>"
+
+    text = re.sub(r"\*\*(.*?)\*\*", render_bold, text)
+
+    def render_italic(m):
+        if "italic" in handlers:
+            return handlers["italic"](m.group(1))
+        return f"<em>{m.group(1)}</em>"
+
+    text = re.sub(r"\*(.*?)\*", render_italic, text)
+
+    def render_link(m):
+        if "link" in handlers:
+            return handlers["link"](m.group(1), m.group(2))
+        return f'<a href="{m.group(2)}">{m.group(1)}</a>'
+
+    text = re.sub(r"\[(.*?)\]\(((?:[^()]|\([^()]*\))*)\)", render_link, text)
+    text = text.replace("\n", "<br>")
+    return sanitize_html(text)
@@ -138,3 +138,68 @@ def test_remove_plugin_by_name_removes_plugin_files_and_resume_data(
     assert Resume.objects.get(slug="test-resume").plugin_data == {
         "about": {"title": "About"}
     }
+
+
+@pytest.mark.django_db
+def test_remove_data_for_plugin_dry_run_reports_count(user):
+    user.save()
+    Resume.objects.create(
+        name="Test Resume",
+        slug="test-resume",
+        owner=user,
+        plugin_data={"about": {"title": "About"}},
+    )
+    stdout = StringIO()
+
+    call_command("remove_data_for_plugin", "about", "--dry-run", stdout=stdout)
+
+    assert "1 resumes have data for plugin: about" in stdout.getvalue()
+    assert Resume.objects.get(slug="test-resume").plugin_data == {
+        "about": {"title": "About"}
+    }
+
+
+@pytest.mark.django_db
+def test_remove_data_for_plugin_reports_progress(user):
+    user.save()
+    Resume.objects.create(
+        name="Test Resume",
+        slug="test-resume",
+        owner=user,
+        plugin_data={"about": {"title": "About"}},
+    )
+    stdout = StringIO()
+
+    call_command("remove_data_for_plugin", "about", stdout=stdout)
+
+    assert "Removed data from 1/1 resumes" in stdout.getvalue()
+    assert Resume.objects.get(slug="test-resume").plugin_data == {}
+
+
+@pytest.mark.django_db
+def test_remove_orphaned_uploads_reports_reclaimed_bytes(monkeypatch):
+    from django_resume.images import UploadSweepResult
+
+    calls = []
+
+    def sweep(**kwargs):
+        calls.append(kwargs)
+        return UploadSweepResult(files=2, bytes=2048)
+
+    monkeypatch.setattr(
+        "django_resume.management.commands.remove_orphaned_uploads."
+        "remove_orphaned_uploads",
+        sweep,
+    )
+    stdout = StringIO()
+
+    call_command(
+        "remove_orphaned_uploads", "--grace-hours=6", "--dry-run", stdout=stdout
+    )
+
+    assert calls[0]["dry_run"] is True
+    assert calls[0]["include_legacy"] is False
+    assert calls[0]["grace"].total_seconds() == 6 * 3600
+    assert "Would remove 2 orphaned uploads, reclaiming 2.0\xa0KB (2048 bytes)" in (
+        stdout.getvalue()
+    )
@@ -1,5 +1,9 @@
+import nh3
+import pytest
+
 from django_resume.markdown import (
     markdown_to_html,
+    markdown_to_html_batch,
     markdown_to_plain_text,
     textarea_input_to_markdown,
     textarea_input_to_html,
@@ -7,6 +11,8 @@ from django_resume.markdown import (
     underlined_link_handler,
 )
 
+from .legacy_markdown import legacy_markdown_to_html
+
 
 def test_markdown_textarea_input_to_markdown():
     # Given a textarea input with HTML
@@ -175,3 +181,91 @@ def test_markdown_to_plain_text_removes_markdown_markup():
 
     # Then only the readable text should remain
     assert text == "Heading\nBold link"
+
+
+EQUIVALENCE_CASES = [
+    "## Foobar",
+    "Hello<script>alert(1)</script>World",
+    "Foobar baz [foobar](https://example.com) blub blah",
+    "[foobar](javascript:alert(1))",
+    "[foobar](javascript%3Aalert(1))",
+    "[foobar](data:text/html;base64,PHNjcmlwdD5hbGVydCgxKTwvc2NyaXB0Pg==)",
+    "Some text\nwith a line break",
+    "# Heading\n**Bold** and *italic* with [link](mailto:test@example.com)",
+    "#\n\n  Heading after blank lines\nnext",
+    "**bold with *italic* and [a link](https://example.com/(x))** tail",
+    "[*emphasized* link](https://example.com) and ** unclosed",
+    "####### seven\n### **three**\n\n\n",
+    "*[a](http://b)*",
+    "*a [b](url) d*",
+    "# *[x](url)*",
+    "*a **b** c*",
+    "***both*** and ****",
+    "*a **b* c** [d *e](f) g*",
+    "[a](x\ny) and *unpaired",
+    "## Highlights\n" + "Led the **platform team** through a *migration* to "
+    "[Django](https://www.djangoproject.com/), cutting latency by **40%**.\n" * 20,
+]
+
+
+@pytest.mark.parametrize("markdown", EQUIVALENCE_CASES)
+@pytest.mark.parametrize(
+    "handlers",
+    [
+        None,
+        {"link": underlined_link_handler},
+        {
+            "heading": lambda level, content: f"<h{level}>*{content}*</h{level}>",
+            "bold": lambda content: f"<b>{content}</b>",
+            "italic": lambda content: f"<i>{content}</i>",
+        },
+    ],
+    ids=["default", "link", "custom"],
+)
+def test_markdown_to_html_matches_multi_pass_renderer(markdown, handlers):
+    # The renderer must produce what the previous multi-pass one produced
+    assert markdown_to_html(markdown, handlers) == legacy_markdown_to_html(
+        markdown, handlers
+    )
+
+
+def test_markdown_to_html_batch_sanitizes_plain_fragments_in_one_call(monkeypatch):
+    # Given fragments with markup, raw HTML and an unclosed tag
+    texts = [
+        "**Bold** [link](https://example.com)",
+        "<strong>unclosed",
+        "plain & simple\nsecond line",
+        "[bad](javascript:alert(1))",
+        "<script>alert(1)</script>",
+        "",
+    ]
+    handlers = {"link": underlined_link_handler}
+    expected = [markdown_to_html(text, handlers) for text in texts]
+    calls = []
+    clean = nh3.clean
+
+    def counting_clean(text, **kwargs):
+        calls.append(text)
+        return clean(text, **kwargs)
+
+    monkeypatch.setattr(nh3, "clean", counting_clean)
+
+    # When the fragments are converted in one batch
+    html = markdown_to_html_batch(texts, handlers)
+
+    # Then each fragment matches the single conversion, and only fragments
+    # with raw HTML need a sanitizer call of their own
+    assert html == expected
+    assert len(calls) == 3
+
+
+@pytest.mark.parametrize("markdown", ["[*x](http://y*)", "**[x](http://y**)"])
+def test_markdown_to_html_batch_keeps_misnested_markup_in_its_fragment(markdown):
+    # Given misnested markdown that leaves a formatting element open
+    texts = [markdown, "plain text", "more"]
+
+    # When the fragments are converted in one batch
+    html = markdown_to_html_batch(texts)
+
+    # Then no element leaks into the following fragments
+    assert html == [markdown_to_html(text) for text in texts]
@@ -93,3 +93,80 @@ def test_remove_plugin_data_by_name_removes_only_the_requested_plugin(user):
     assert first_resume.plugin_data == {"skills": {"items": ["Python"]}}
     assert second_resume.plugin_data == {"skills": {"items": ["Django"]}}
     assert third_resume.plugin_data == {}
+
+
+@pytest.mark.django_db
+def test_with_plugin_data_keys_loads_only_requested_keys(user):
+    user.save()
+    Resume.objects.create(
+        name="John Doe",
+        slug="john-doe",
+        owner=user,
+        plugin_data={"about": {"title": "About"}, "skills": {"items": ["Python"]}},
+    )
+
+    resume = Resume.objects.with_plugin_data_keys(["about", "missing"]).get(
+        slug="john-doe"
+    )
+
+    assert resume.plugin_data == {"about": {"title": "About"}}
+    assert resume.plugin_data_is_partial is True
+    with pytest.raises(ValueError):
+        resume.save()
+    resume.name = "Jane Doe"
+    resume.save(update_fields=["name"])
+    resume = Resume.objects.get(slug="john-doe")
+    assert resume.plugin_data == {
+        "about": {"title": "About"},
+        "skills": {"items": ["Python"]},
+    }
+
+
+@pytest.mark.django_db
+def test_remove_plugin_data_by_name_dry_run_only_counts(user):
+    user.save()
+    Resume.objects.create(
+        name="John Doe",
+        slug="john-doe",
+        owner=user,
+        plugin_data={"about": {"title": "About"}},
+    )
+
+    count = Resume.objects.remove_plugin_data_by_name("about", dry_run=True)
+
+    assert count == 1
+    assert Resume.objects.get(slug="john-doe").plugin_data == {
+        "about": {"title": "About"}
+    }
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("in_database", [True, False])
+def test_remove_plugin_data_by_name_in_batches(user, monkeypatch, in_database):
+    user.save()
+    monkeypatch.setattr(
+        "django_resume.models.can_remove_json_key", lambda key, using: in_database
+    )
+    for number in range(5):
+        Resume.objects.create(
+            name=f"Resume {number}",
+            slug=f"resume-{number}",
+            owner=user,
+            plugin_data={"about": {"title": "About"}, "skills": {"items": []}},
+        )
+    Resume.objects.create(
+        name="Other", slug="other", owner=user, plugin_data={"skills": {}}
+    )
+    reports = []
+
+    removed = Resume.objects.remove_plugin_data_by_name(
+        "about",
+        batch_size=2,
+        progress=lambda done, total: reports.append((done, total)),
+    )
+
+    assert removed == 5
+    assert reports == [(2, 5), (4, 5), (5, 5)]
+    assert [resume.plugin_data for resume in Resume.objects.order_by("pk")] == [
+        {"skills": {"items": []}}
+    ] * 5 + [{"skills": {}}]
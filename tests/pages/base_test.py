@@ -1,5 +1,7 @@
 import pytest
+from django.http import HttpResponse
 from django.test import RequestFactory
+from django.urls import reverse
 
 from django_resume.pages.base import (
     ResumePage,
@@ -7,6 +9,7 @@ from django_resume.pages.base import (
     build_section_context,
     page_template_path,
 )
+from django_resume.pages.builtins import CoverLetterPage
 from django_resume.plugins import plugin_registry
 
 
@@ -83,3 +86,40 @@ def test_default_page_hooks():
     assert page.check_access(rf, None) is None
     sentinel = object()
     assert page.finalize_response(sentinel, rf, None) is sentinel
+
+
+def test_get_plugin_data_keys_resolves_sections_access_and_theme():
+    class AboutPage(ResumePage):
+        section_names = ["about", "does-not-exist"]
+
+    class EverythingPage(ResumePage):
+        section_names = "__all__"
+
+    assert AboutPage().get_plugin_data_keys() == ["theme", "token", "about"]
+    assert EverythingPage().get_plugin_data_keys() is None
+
+
+@pytest.mark.django_db
+def test_dispatch_page_loads_only_declared_plugin_data(resume, client, monkeypatch):
+    resume.owner.save()
+    resume.plugin_data = {
+        "about": {"title": "About me", "text": "hello"},
+        "projects": {"items": [{"id": "p1", "title": "Secret project"}]},
+        "token": {"flat": {"token_required": False}},
+    }
+    resume.save()
+    seen = {}
+
+    def serve(self, request, resume, base_context):
+        seen["plugin_data"] = resume.plugin_data
+        return HttpResponse("ok")
+
+    monkeypatch.setattr(CoverLetterPage, "serve", serve)
+
+    response = client.get(reverse("django_resume:detail", kwargs={"slug": "john-doe"}))
+
+    assert response.status_code == 200
+    assert seen["plugin_data"] == {
+        "about": {"title": "About me", "text": "hello"},
+        "token": {"flat": {"token_required": False}},
+    }
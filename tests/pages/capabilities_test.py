@@ -26,6 +26,7 @@ from django_resume.plugins import (
     SkillsPlugin,
     ThemePlugin,
     TokenPlugin,
+    plugin_registry,
 )
 
 
@@ -146,3 +147,53 @@ def test_explicit_list_and_all_selection_unchanged(resume):
     # and strictly more (cover, theme, ... are present too).
     assert {"identity", "about", "skills", "projects", "cover"} <= set(all_sections)
     assert set(portfolio) < set(all_sections)
+
+
+class GalleryPlugin(AboutPlugin):
+    name = "gallery"
+    verbose_name = "Gallery"
+    capabilities = ("portfolio", "media")
+
+
+def test_registry_capability_index_follows_registration():
+    # The index and the memoized selection are rebuilt on (un)registration,
+    # so a selection resolved before a plugin is added does not go stale.
+    assert plugin_registry.get_plugins_by_capability(["media"]) == []
+
+    plugin_registry.register(GalleryPlugin)
+    try:
+        assert plugin_registry.capability_index["media"] == frozenset({"gallery"})
+        assert [
+            p.name for p in plugin_registry.get_plugins_by_capability(["media"])
+        ] == ["gallery"]
+        both = plugin_registry.get_plugins_by_capability(
+            ["portfolio", "media"], match="all"
+        )
+        assert [plugin.name for plugin in both] == ["gallery"]
+    finally:
+        plugin_registry.unregister(GalleryPlugin)
+
+    assert "media" not in plugin_registry.capability_index
+    assert plugin_registry.get_plugins_by_capability(["media"]) == []
+
+
+def test_registry_capability_selection_matches_by_capability():
+    # The index answers exactly what scanning with ByCapability.matches would,
+    # in registration order.
+    for selector in [
+        by_capability("portfolio"),
+        by_capability("cv", "cover"),
+        by_capability("portfolio", "cv", match="all"),
+        by_capability(),
+    ]:
+        expected = [
+            plugin
+            for plugin in plugin_registry.get_all_plugins()
+            if selector.matches(plugin)
+        ]
+        assert (
+            plugin_registry.get_plugins_by_capability(
+                selector.capabilities, match=selector.match
+            )
+            == expected
+        )
@@ -7,15 +7,24 @@ installed distribution is proven by the live-server e2e test
 (``e2e_tests/entrypoint_page_test.py``).
 """
 
+import sys
+from importlib.metadata import EntryPoint
+from io import StringIO
+
 import pytest
+from django.core.management import call_command
 
 import django_resume.pages as pages_pkg
+from django_resume.management.commands import write_page_manifest
 from django_resume.pages import (
     ENTRY_POINT_GROUP,
     ResumePage,
+    discovery,
+    get_page_entry_points,
     load_entry_point_pages,
     page_registry,
 )
+from django_resume.pages.discovery import write_manifest
 
 
 @pytest.fixture(autouse=True)
@@ -121,3 +130,90 @@ def test_autodiscover_runs_modules_then_entry_points(monkeypatch):
     pages_pkg.autodiscover_pages()
 
     assert seen == [("modules", "resume_pages"), ("entry_points",)]
+
+
+def _real_entry_point(name):
+    return EntryPoint(
+        name=name, value=f"{__name__}:ManifestPage", group=ENTRY_POINT_GROUP
+    )
+
+
+class ManifestPage(ResumePage):
+    url_name = "manifest-demo"
+    path = "manifest-demo/"
+
+
+def test_manifest_replaces_metadata_scan(monkeypatch, settings, tmp_path):
+    # A fresh manifest answers discovery without scanning distributions.
+    manifest = tmp_path / "pages.json"
+    write_manifest(str(manifest), ENTRY_POINT_GROUP, [_real_entry_point("demo")])
+    settings.DJANGO_RESUME_PAGE_ENTRY_POINT_MANIFEST = manifest
+
+    def fail(group=None):
+        raise AssertionError("entry_points() must not be called")
+
+    monkeypatch.setattr(pages_pkg, "entry_points", fail)
+    try:
+        load_entry_point_pages()
+        assert isinstance(page_registry.get_page("manifest-demo"), ManifestPage)
+    finally:
+        page_registry.unregister(ManifestPage)
+
+
+def test_stale_manifest_falls_back_to_metadata_scan(monkeypatch, settings, tmp_path):
+    manifest = tmp_path / "pages.json"
+    write_manifest(str(manifest), ENTRY_POINT_GROUP, [_real_entry_point("demo")])
+    settings.DJANGO_RESUME_PAGE_ENTRY_POINT_MANIFEST = manifest
+    # A distribution installed after the manifest was written.
+    monkeypatch.setattr(
+        discovery, "installed_distributions_fingerprint", lambda: "changed"
+    )
+    _patch_entry_points(monkeypatch, [])
+
+    assert get_page_entry_points() == []
+
+
+def test_manifest_matches_with_a_different_script_directory(
+    monkeypatch, settings, tmp_path
+):
+    # Given a manifest written by manage.py from the project directory
+    manifest = tmp_path / "pages.json"
+    project, server_bin = tmp_path / "project", tmp_path / "bin"
+    project.mkdir()
+    server_bin.mkdir()
+    monkeypatch.setattr(sys, "path", [str(project), *sys.path[1:]])
+    write_manifest(str(manifest), ENTRY_POINT_GROUP, [_real_entry_point("demo")])
+    settings.DJANGO_RESUME_PAGE_ENTRY_POINT_MANIFEST = manifest
+
+    # When a web server process with another sys.path[0] reads it
+    monkeypatch.setattr(sys, "path", [str(server_bin), *sys.path[1:]])
+    _patch_entry_points(monkeypatch, [])
+
+    # Then the manifest is still fresh
+    assert [ep.name for ep in get_page_entry_points()] == ["demo"]
+
+
+def test_missing_manifest_falls_back_to_metadata_scan(monkeypatch, settings, tmp_path):
+    settings.DJANGO_RESUME_PAGE_ENTRY_POINT_MANIFEST = tmp_path / "missing.json"
+    scanned = [_real_entry_point("scanned")]
+    _patch_entry_points(monkeypatch, scanned)
+
+    assert get_page_entry_points() == scanned
+
+
+def test_write_page_manifest_command(monkeypatch, settings, tmp_path):
+    manifest = tmp_path / "pages.json"
+    monkeypatch.setattr(
+        write_page_manifest,
+        "entry_points",
+        lambda group=None: [_real_entry_point("demo")],
+    )
+    stdout = StringIO()
+
+    call_command("write_page_manifest", "--output", str(manifest), stdout=stdout)
+
+    assert "Wrote 1 page entry points" in stdout.getvalue()
+    entry_points = discovery.read_manifest(str(manifest), ENTRY_POINT_GROUP)
+    assert [(ep.name, ep.value) for ep in entry_points] == [
+        ("demo", f"{__name__}:ManifestPage")
+    ]
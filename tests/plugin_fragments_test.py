@@ -0,0 +1,99 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.template import Context, Template
+from django.test import RequestFactory
+from django.test.signals import template_rendered
+
+from django_resume.plugins import plugin_registry
+
+ABOUT_TEMPLATE = "django_resume/plugins/about/plain/content.html"
+
+
+@pytest.fixture
+def rendered_templates():
+    names = []
+
+    def record(sender, template, **kwargs):
+        names.append(template.name)
+
+    template_rendered.connect(record)
+    yield names
+    template_rendered.disconnect(record)
+
+
+@pytest.fixture
+def fragment_cache(settings):
+    settings.DJANGO_RESUME_FRAGMENT_CACHE_TIMEOUT = timedelta(minutes=5)
+    cache.clear()
+    yield cache
+    cache.clear()
+
+
+def render_about(resume, *, edit=False):
+    plugin = plugin_registry.get_plugin("about")
+    about = plugin.get_context(
+        RequestFactory().get("/"),
+        plugin.get_data(resume),
+        resume.pk,
+        context={},
+        edit=edit,
+        theme="plain",
+    )
+    template = Template("{% load plugin_fragments %}{% plugin_fragment about %}")
+    return template.render(Context({"resume": resume, "about": about}))
+
+
+@pytest.mark.django_db
+def test_plugin_fragment_reuses_unchanged_section(
+    resume, fragment_cache, rendered_templates
+):
+    # Given a resume with an about section
+    resume.owner.save()
+    resume.plugin_data = {"about": {"title": "About", "text": "First"}}
+    resume.save()
+
+    # When the section is rendered twice
+    first = render_about(resume)
+    second = render_about(resume)
+
+    # Then the plugin template is only rendered once
+    assert "First" in first
+    assert second == first
+    assert rendered_templates.count(ABOUT_TEMPLATE) == 1
+
+
+@pytest.mark.django_db
+def test_plugin_fragment_renders_again_after_data_or_edit_flag_change(
+    resume, fragment_cache, rendered_templates
+):
+    # Given a rendered about section
+    resume.owner.save()
+    resume.plugin_data = {"about": {"title": "About", "text": "First"}}
+    resume.save()
+    render_about(resume)
+
+    # When its data changes, or it is rendered in edit mode
+    resume.plugin_data["about"]["text"] = "Second"
+    changed = render_about(resume)
+    render_about(resume, edit=True)
+
+    # Then the section is rendered again each time
+    assert "Second" in changed
+    assert rendered_templates.count(ABOUT_TEMPLATE) == 3
+
+
+@pytest.mark.django_db
+def test_plugin_fragment_does_not_cache_by_default(resume, rendered_templates):
+    # Given no fragment cache timeout
+    resume.owner.save()
+    resume.plugin_data = {"about": {"title": "About", "text": "First"}}
+    resume.save()
+
+    # When the section is rendered twice
+    render_about(resume)
+    render_about(resume)
+
+    # Then it is rendered both times
+    assert rendered_templates.count(ABOUT_TEMPLATE) == 2
@@ -1,9 +1,11 @@
+from unittest import mock
+
 import pytest
 from django import forms
 from django.urls import NoReverseMatch, reverse
 
 from django_resume.urls import urlpatterns
-from django_resume.plugins import SimplePlugin, plugin_registry
+from django_resume.plugins import SimplePlugin, plugin_registry, registry
 
 
 @pytest.fixture(autouse=True)
@@ -83,3 +85,42 @@ def test_unregister_removes_inline_urls():
 
     with pytest.raises(NoReverseMatch):
         reverse("django_resume:simple_plugin-edit", kwargs={"resume_id": 1})
+
+
+class OtherSimplePlugin(SimplePlugin):
+    name = "other_simple_plugin"
+    verbose_name = "Other Simple Plugin"
+
+
+class BrokenPlugin(SimplePlugin):
+    name = "broken_plugin"
+
+    def get_inline_urls(self):
+        raise RuntimeError("broken")
+
+
+def test_register_plugin_list_clears_url_caches_once():
+    initial_url_count = len(urlpatterns)
+    expected_inline_url_count = len(SimplePlugin().get_inline_urls()) + len(
+        OtherSimplePlugin().get_inline_urls()
+    )
+
+    with mock.patch.object(registry, "clear_url_caches") as clear_url_caches:
+        plugin_registry.register_plugin_list([SimplePlugin, OtherSimplePlugin])
+
+    try:
+        assert clear_url_caches.call_count == 1
+        assert len(urlpatterns) == initial_url_count + expected_inline_url_count
+    finally:
+        plugin_registry.unregister(OtherSimplePlugin)
+
+
+def test_register_plugin_list_leaves_registry_untouched_on_error():
+    initial_urls = list(urlpatterns)
+
+    with pytest.raises(RuntimeError):
+        plugin_registry.register_plugin_list([SimplePlugin, BrokenPlugin])
+
+    assert plugin_registry.get_plugin(SimplePlugin.name) is None
+    assert plugin_registry.get_plugin(BrokenPlugin.name) is None
+    assert urlpatterns == initial_urls
@@ -0,0 +1,166 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.files.storage import FileSystemStorage
+from django.core.management import call_command
+from django.test import override_settings
+
+from django_resume.access_log import access_buffer
+from django_resume.models import TokenAccess
+from django_resume.publishing import MANIFEST_NAME, iter_asset_urls, write_file
+
+
+def publish(output, *args):
+    stdout = StringIO()
+    call_command("publish_resumes", f"--output={output}", *args, stdout=stdout)
+    return stdout.getvalue()
+
+
+def test_iter_asset_urls_collects_sources_links_and_css_urls():
+    html = (
+        '<link rel="stylesheet" href="/static/a.css">'
+        '<a href="/resume/other/">other</a>'
+        '<img src="/media/b.png" srcset="/media/b-160w.webp 160w, /media/b-320w.webp 320w">'
+        "<style>@font-face { src: url('/static/font.woff2'); }</style>"
+    )
+
+    assert iter_asset_urls(html) == [
+        "/static/a.css",
+        "/media/b.png",
+        "/media/b-160w.webp",
+        "/media/b-320w.webp",
+        "/static/font.woff2",
+    ]
+
+
+@pytest.mark.django_db
+def test_publish_resumes_writes_public_pages_and_assets(tmp_path, resume):
+    # Given a public headwind resume
+    resume.owner.save()
+    resume.plugin_data = {
+        "theme": {"name": "headwind"},
+        "token": {"flat": {"token_required": False}},
+    }
+    resume.save()
+
+    # When the resumes are published
+    output = publish(tmp_path)
+
+    # Then the cover and CV pages are written by URL path, but not the 403 editor
+    assert (tmp_path / "resume/john-doe/index.html").exists()
+    assert (tmp_path / "resume/john-doe/cv/index.html").exists()
+    assert not (tmp_path / "resume/john-doe/403/index.html").exists()
+    # And the stylesheet is copied together with the fonts it references
+    assert (tmp_path / "static/django_resume/css/headwind.css").exists()
+    assert (tmp_path / "static/django_resume/fonts/inter_400.woff2").exists()
+    manifest = json.loads((tmp_path / MANIFEST_NAME).read_text())
+    assert manifest["resumes"]["john-doe"]["files"] == [
+        "resume/john-doe/index.html",
+        "resume/john-doe/cv/index.html",
+    ]
+    assert "Published 2 pages" in output
+
+
+@pytest.mark.django_db
+def test_publish_resumes_only_republishes_changed_resumes(tmp_path, resume):
+    # Given a resume that was already published
+    resume.owner.save()
+    resume.plugin_data = {"token": {"flat": {"token_required": False}}}
+    resume.save()
+    publish(tmp_path)
+
+    # When publishing again without changes
+    output = publish(tmp_path)
+
+    # Then nothing is re-rendered
+    assert "Published 0 pages and 0 assets for 0 resumes; 1 unchanged" in output
+
+    # When the resume changes
+    resume.plugin_data["about"] = {"title": "About", "text": "Updated about text"}
+    resume.save()
+    output = publish(tmp_path)
+
+    # Then it is published again
+    assert "for 1 resumes; 0 unchanged" in output
+    cv = (tmp_path / "resume/john-doe/cv/index.html").read_text()
+    assert "Updated about text" in cv
+
+
+@pytest.mark.django_db
+def test_publish_resumes_removes_pages_of_deleted_resumes(tmp_path, resume):
+    # Given a published resume that was deleted afterwards
+    resume.owner.save()
+    resume.plugin_data = {"token": {"flat": {"token_required": False}}}
+    resume.save()
+    publish(tmp_path)
+    resume.delete()
+
+    # When publishing again
+    output = publish(tmp_path)
+
+    # Then its pages are removed
+    assert not (tmp_path / "resume/john-doe/index.html").exists()
+    assert "1 removed resumes" in output
+
+
+@pytest.mark.django_db
+def test_publish_resumes_skips_token_protected_cv(tmp_path, resume):
+    # Given a resume whose CV requires an access token
+    resume.owner.save()
+    resume.save()
+
+    # When the resumes are published
+    publish(tmp_path)
+
+    # Then only the public cover page is written
+    assert (tmp_path / "resume/john-doe/index.html").exists()
+    assert not (tmp_path / "resume/john-doe/cv/index.html").exists()
+
+
+@pytest.mark.django_db
+def test_publish_resumes_places_token_protected_cv_below_protected_path(
+    tmp_path, resume
+):
+    # Given a resume whose CV requires an access token
+    resume.owner.save()
+    resume.save()
+
+    # When the resumes are published with a protected path
+    publish(tmp_path, "--protected-path=private-4f2a")
+
+    # Then the CV is written below the protected path only
+    cv = tmp_path / "private-4f2a/resume/john-doe/cv/index.html"
+    assert cv.exists()
+    assert not (tmp_path / "resume/john-doe/cv/index.html").exists()
+    assert "share=" not in cv.read_text()
+
+
+@pytest.mark.django_db
+@override_settings(DJANGO_RESUME_TOKEN_ACCESS_LOG=True)
+def test_publish_resumes_does_not_log_protected_renders_as_opens(tmp_path, resume):
+    # Given a token-protected resume with the access log enabled
+    resume.owner.save()
+    resume.save()
+
+    # When the CV is published below a protected path
+    publish(tmp_path, "--protected-path=private-4f2a")
+    access_buffer.flush()
+
+    # Then the render is not recorded as an open
+    assert (tmp_path / "private-4f2a/resume/john-doe/cv/index.html").exists()
+    assert TokenAccess.objects.count() == 0
+
+
+def test_write_file_replaces_local_files_without_deleting_them(tmp_path, monkeypatch):
+    storage = FileSystemStorage(location=tmp_path)
+    write_file(storage, "resume/index.html", b"old")
+
+    def fail_delete(name):
+        raise AssertionError(f"{name} was deleted before the new content was saved")
+
+    monkeypatch.setattr(storage, "delete", fail_delete)
+    write_file(storage, "resume/index.html", b"new")
+
+    assert (tmp_path / "resume/index.html").read_bytes() == b"new"
+    assert storage.listdir("resume") == ([], ["index.html"])
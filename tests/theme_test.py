@@ -1,4 +1,11 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from django_resume.pages.base import resolve_page_theme
 from django_resume.plugins.base import ThemedTemplates, get_current_theme
+from django_resume.themes import theme_support, warm_templates
 
 
 def test_theme_paths():
@@ -23,3 +30,61 @@ def test_get_theme_from_resume(resume):
 
     # Then the theme should be correct
     assert theme == "foobar"
+
+
+@pytest.fixture
+def warmed_theme_support():
+    yield theme_support
+    theme_support.clear()
+
+
+def test_warm_templates_records_supported_themes(warmed_theme_support):
+    # When all templates are warmed up
+    result = warm_templates(["plain", "headwind"])
+
+    # Then the themes shipped by pages and plugins are reported
+    assert result.missing == []
+    assert result.page_themes["resume_cv.html"] == ["plain", "headwind"]
+    assert result.plugin_themes["permission_denied"] == ["plain"]
+    assert result.plugin_themes["about"] == ["plain", "headwind"]
+    assert theme_support.has_page_template("headwind", "resume_cv.html") is True
+    assert result.compiled > 0
+
+
+def test_warmed_page_theme_is_resolved_without_template_lookup(
+    resume, warmed_theme_support, monkeypatch
+):
+    # Given warmed up templates and a headwind resume
+    warm_templates(["plain", "headwind"])
+    resume.plugin_data = {"theme": {"name": "headwind"}}
+
+    def fail(name):
+        raise AssertionError(f"unexpected template lookup for {name}")
+
+    monkeypatch.setattr("django_resume.pages.base._template_exists", fail)
+
+    # When the page theme is resolved
+    theme = resolve_page_theme(resume, "resume_cv.html")
+
+    # Then the recorded support answers without probing the loaders
+    assert theme == "headwind"
+
+
+def test_warm_templates_command_reports_templates(warmed_theme_support):
+    stdout = StringIO()
+
+    call_command("warm_templates", "--theme=plain", stdout=stdout)
+
+    output = stdout.getvalue()
+    assert "plugin permission_denied: plain" in output
+    assert "0 missing" in output
+
+
+def test_app_config_warms_templates_when_enabled(settings, warmed_theme_support):
+    from django_resume.apps import ResumeConfig
+
+    settings.DJANGO_RESUME_WARM_TEMPLATES = True
+
+    ResumeConfig.warm_templates()
+
+    assert theme_support.has_page_template("plain", "resume_cv.html") is True
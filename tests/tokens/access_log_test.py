@@ -0,0 +1,211 @@
+import threading
+import time
+from datetime import timedelta
+
+import pytest
+from django.db import DatabaseError
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from django_resume import access_log
+from django_resume.access_log import (
+    access_buffer,
+    get_token_access_summaries,
+    record_token_access,
+)
+from django_resume.models import Resume, TokenAccess
+from django_resume.plugins.tokens import (
+    TokenItemForm,
+    build_token_index,
+    create_share_link,
+)
+
+
+@pytest.fixture
+def flusher_wakeups(monkeypatch):
+    """Replace the flusher thread, recording when record() would wake it."""
+    wakeups = []
+    monkeypatch.setattr(access_buffer, "start_flusher", lambda: None)
+    monkeypatch.setattr(access_buffer, "_wakeup", FakeEvent(wakeups))
+    yield wakeups
+    access_buffer.flush()
+
+
+class FakeEvent(threading.Event):
+    def __init__(self, wakeups):
+        super().__init__()
+        self.wakeups = wakeups
+
+    def set(self):
+        self.wakeups.append(len(access_buffer))
+
+
+@pytest.fixture
+def token_resume(user):
+    user.save()
+    items = [{"id": "a", "token": "secret", "created": timezone.now().isoformat()}]
+    return Resume.objects.create(
+        name="Resume",
+        slug="resume",
+        owner=user,
+        plugin_data={
+            "token": {
+                "flat": {"token_required": True},
+                "items": items,
+                "index": build_token_index(items),
+            }
+        },
+    )
+
+
+@pytest.mark.django_db
+@override_settings(
+    DJANGO_RESUME_TOKEN_ACCESS_LOG=True, DJANGO_RESUME_TOKEN_ACCESS_FLUSH_SIZE=2
+)
+def test_cv_token_hits_are_buffered_and_flushed_in_batches(
+    client, token_resume, flusher_wakeups
+):
+    url = reverse("django_resume:cv", kwargs={"slug": token_resume.slug})
+
+    assert client.get(url, {"token": "secret"}).status_code == 200
+    assert len(access_buffer) == 1
+    assert flusher_wakeups == []
+
+    assert client.get(url, {"token": "wrong"}).status_code == 403
+    assert client.get(url, {"token": "secret"}).status_code == 200
+
+    # The full buffer wakes the flusher thread instead of writing in the request.
+    assert flusher_wakeups == [2]
+    assert TokenAccess.objects.count() == 0
+    assert access_buffer.flush() == 2
+    assert list(TokenAccess.objects.values_list("token_id", "page")) == [
+        ("a", "cv"),
+        ("a", "cv"),
+    ]
+
+
+@pytest.mark.django_db
+@override_settings(DJANGO_RESUME_TOKEN_ACCESS_LOG=True)
+def test_share_link_hits_fit_the_token_id_column(client, token_resume, flusher_wakeups):
+    # Given a share link for a receiver label as long as the form allows
+    url = create_share_link(token_resume, receiver="r" * 255)
+
+    assert client.get(url).status_code == 200
+    access_buffer.flush()
+
+    # Then the recorded id is cut to the column length
+    token_id = TokenAccess.objects.get().token_id
+    assert len(token_id) == 255
+    assert token_id.startswith("share:rrr")
+
+
+@pytest.mark.django_db
+def test_a_failing_hit_does_not_drop_the_batch(
+    token_resume, monkeypatch, flusher_wakeups
+):
+    def fail_batch(*args, **kwargs):
+        raise DatabaseError("value too long")
+
+    save = TokenAccess.save
+
+    def fail_one(self, *args, **kwargs):
+        if self.token_id == "bad":
+            raise DatabaseError("value too long")
+        return save(self, *args, **kwargs)
+
+    monkeypatch.setattr(TokenAccess.objects, "bulk_create", fail_batch)
+    monkeypatch.setattr(TokenAccess, "save", fail_one)
+    with override_settings(DJANGO_RESUME_TOKEN_ACCESS_LOG=True):
+        for token_id in ("a", "bad", "b"):
+            record_token_access(token_resume.pk, token_id, "cv")
+
+    assert access_buffer.flush() == 2
+    assert sorted(TokenAccess.objects.values_list("token_id", flat=True)) == [
+        "a",
+        "b",
+    ]
+
+
+@pytest.mark.django_db
+def test_token_hits_are_not_recorded_by_default(client, token_resume):
+    url = reverse("django_resume:cv", kwargs={"slug": token_resume.slug})
+
+    assert client.get(url, {"token": "secret"}).status_code == 200
+
+    assert len(access_buffer) == 0
+    assert access_buffer.flush() == 0
+
+
+@pytest.mark.django_db
+@override_settings(
+    DJANGO_RESUME_TOKEN_ACCESS_LOG=True,
+    DJANGO_RESUME_TOKEN_ACCESS_FLUSH_INTERVAL=timedelta(minutes=1),
+)
+def test_token_hits_wake_the_flusher_once_the_interval_has_passed(
+    token_resume, flusher_wakeups
+):
+    access_buffer.flush()
+    now = timezone.now()
+
+    record_token_access(token_resume.pk, "a", "cv", now=now)
+    assert flusher_wakeups == []
+    record_token_access(token_resume.pk, "a", "cv", now=now + timedelta(minutes=2))
+
+    assert flusher_wakeups == [2]
+
+
+@pytest.mark.django_db(transaction=True)
+@override_settings(
+    DJANGO_RESUME_TOKEN_ACCESS_LOG=True,
+    DJANGO_RESUME_TOKEN_ACCESS_FLUSH_INTERVAL=timedelta(milliseconds=50),
+)
+def test_flusher_thread_writes_buffered_hits_of_an_idle_process(
+    token_resume, monkeypatch
+):
+    monkeypatch.setattr(access_log, "MIN_FLUSHER_SLEEP", 0.01)
+    access_buffer._wakeup.set()  # let a sleeping flusher pick up the new interval
+    access_buffer.flush()
+
+    # No further hit arrives to notice the interval has passed.
+    record_token_access(token_resume.pk, "a", "cv")
+
+    deadline = time.monotonic() + 5
+    while TokenAccess.objects.count() == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(access_buffer) == 0
+    assert TokenAccess.objects.count() == 1
+
+
+@pytest.mark.django_db
+@override_settings(DJANGO_RESUME_TOKEN_ACCESS_LOG=True)
+def test_token_item_form_shows_aggregated_opens(
+    token_resume, django_assert_num_queries
+):
+    last = timezone.now()
+    TokenAccess.objects.bulk_create(
+        [
+            TokenAccess(resume=token_resume, token_id="a", page="cv", accessed_at=at)
+            for at in (last - timedelta(days=1), last)
+        ]
+    )
+
+    with django_assert_num_queries(1):
+        forms = [
+            TokenItemForm(initial={"id": token_id}, resume=token_resume)
+            for token_id in ("a", "b")
+        ]
+
+    assert forms[0].fields["opens"].initial.startswith("2 (last ")
+    assert forms[1].fields["opens"].initial == "Never opened"
+    assert set(get_token_access_summaries(token_resume)) == {"a"}
+
+
+@pytest.mark.django_db
+def test_token_item_form_skips_opens_without_access_log(
+    token_resume, django_assert_num_queries
+):
+    with django_assert_num_queries(0):
+        form = TokenItemForm(initial={"id": "a"}, resume=token_resume)
+
+    assert "opens" not in form.fields
@@ -1,16 +1,28 @@
 from datetime import timedelta
+from io import StringIO
+from urllib.parse import parse_qs, urlsplit
 
 import pytest
 from django.contrib.auth.models import AnonymousUser
 from django.core.exceptions import ImproperlyConfigured, PermissionDenied
+from django.core.management import call_command
 from django.test import override_settings
+from django.urls import reverse
 from django.utils import timezone
 
+from django_resume.models import Resume
 from django_resume.plugins.tokens import (
     TOKEN_ALPHABET,
     TokenPlugin,
+    build_token_index,
+    create_share_link,
+    create_share_token,
     generate_random_string,
+    get_token_index_key_id,
     get_token_ttl,
+    hash_token,
+    prune_expired_tokens,
+    verify_share_token,
 )
 
 
@@ -168,3 +180,182 @@ def test_tokens_check_permissions_ignores_malformed_items(rf):
     )
 
     assert permitted_if_none is None
+
+
+@override_settings(DJANGO_RESUME_TOKEN_TTL=timedelta(minutes=5))
+def test_token_data_maintains_hashed_index_on_write(resume):
+    plugin = TokenPlugin()
+    fresh_created = (timezone.now() - timedelta(minutes=4)).isoformat()
+    expired_created = (timezone.now() - timedelta(minutes=6)).isoformat()
+
+    plugin.data.create(resume, {"id": "a", "token": "fresh", "created": fresh_created})
+    plugin.data.create(
+        resume, {"id": "b", "token": "stale", "created": expired_created}
+    )
+    plugin_data = resume.plugin_data[TokenPlugin.name]
+
+    assert plugin_data["index"]["key_id"] == get_token_index_key_id()
+    assert plugin_data["index"]["tokens"] == {
+        hash_token("fresh"): {"id": "a", "created": fresh_created},
+        hash_token("stale"): {"id": "b", "created": expired_created},
+    }
+    plugin.data.delete(resume, {"id": "b"})
+    assert list(plugin_data["index"]["tokens"]) == [hash_token("fresh")]
+
+
+@override_settings(DJANGO_RESUME_TOKEN_TTL=timedelta(minutes=5))
+def test_tokens_check_permissions_uses_index_without_scanning_items(rf):
+    fresh_created = (timezone.now() - timedelta(minutes=4)).isoformat()
+    expired_created = (timezone.now() - timedelta(minutes=6)).isoformat()
+    # The items are deliberately absent: a valid index is all that is read.
+    plugin_data = {
+        "flat": {"token_required": True},
+        "index": build_token_index(
+            [
+                {"id": "a", "token": "fresh", "created": fresh_created},
+                {"id": "b", "token": "stale", "created": expired_created},
+            ]
+        ),
+    }
+
+    def check(token):
+        request = rf.get("/", {"token": token})
+        request.user = AnonymousUser()
+        return TokenPlugin.check_permissions(request, plugin_data)
+
+    assert check("fresh") is None
+    with pytest.raises(PermissionDenied, match="Token expired."):
+        check("stale")
+    with pytest.raises(PermissionDenied, match="Invalid token."):
+        check("unknown")
+
+
+def test_tokens_check_permissions_ignores_index_from_another_key(rf):
+    request = rf.get("/", {"token": "expected-token"})
+    request.user = AnonymousUser()
+    stale_index = {"key_id": "rotated", "tokens": {}}
+
+    permitted_if_none = TokenPlugin.check_permissions(
+        request,
+        {
+            "flat": {"token_required": True},
+            "items": [{"token": "expected-token"}],
+            "index": stale_index,
+        },
+    )
+
+    assert permitted_if_none is None
+
+
+@pytest.mark.django_db
+@override_settings(DJANGO_RESUME_TOKEN_TTL=timedelta(minutes=5))
+def test_prune_expired_tokens_removes_expired_items_in_batches(user):
+    user.save()
+    fresh_created = (timezone.now() - timedelta(minutes=4)).isoformat()
+    expired_created = (timezone.now() - timedelta(minutes=6)).isoformat()
+    for number in range(3):
+        Resume.objects.create(
+            name=f"Resume {number}",
+            slug=f"resume-{number}",
+            owner=user,
+            plugin_data={
+                "token": {
+                    "items": [
+                        {"id": "a", "token": "fresh", "created": fresh_created},
+                        {"id": "b", "token": "stale", "created": expired_created},
+                        {"id": "c", "token": "legacy"},
+                    ]
+                }
+            },
+        )
+    reports = []
+
+    dry_run = prune_expired_tokens(dry_run=True)
+    result = prune_expired_tokens(
+        batch_size=2, progress=lambda result: reports.append(result.tokens)
+    )
+
+    assert (dry_run.resumes, dry_run.tokens) == (3, 3)
+    assert (result.resumes, result.tokens) == (3, 3)
+    assert reports == [2, 3]
+    for resume in Resume.objects.all():
+        token_data = resume.plugin_data["token"]
+        assert [item["id"] for item in token_data["items"]] == ["a", "c"]
+        assert set(token_data["index"]["tokens"]) == {
+            hash_token("fresh"),
+            hash_token("legacy"),
+        }
+
+
+@pytest.mark.django_db
+@override_settings(DJANGO_RESUME_TOKEN_TTL=timedelta(minutes=5))
+def test_prune_expired_tokens_command_reports_counts(user):
+    user.save()
+    expired_created = (timezone.now() - timedelta(minutes=6)).isoformat()
+    Resume.objects.create(
+        name="Resume",
+        slug="resume",
+        owner=user,
+        plugin_data={
+            "token": {"items": [{"id": "b", "token": "t", "created": expired_created}]}
+        },
+    )
+    stdout = StringIO()
+
+    call_command("prune_expired_tokens", "--dry-run", stdout=stdout)
+    assert "Would prune 1 expired tokens from 1 resumes" in stdout.getvalue()
+    assert len(Resume.objects.get().plugin_data["token"]["items"]) == 1
+
+    call_command("prune_expired_tokens", stdout=stdout)
+    assert "Pruned 1 expired tokens from 1 resumes" in stdout.getvalue()
+    assert Resume.objects.get().plugin_data["token"]["items"] == []
+
+
+@pytest.mark.django_db
+def test_share_link_grants_cv_access_without_stored_tokens(client, user):
+    user.save()
+    resume = Resume.objects.create(name="Resume", slug="resume", owner=user)
+
+    link = create_share_link(resume, receiver="recruiter@example.com")
+
+    assert client.get(link).status_code == 200
+    other = Resume.objects.create(name="Other", slug="other", owner=user)
+    foreign_link = reverse("django_resume:cv", kwargs={"slug": "other"})
+    share_token = link.split("share=")[1]
+    assert client.get(f"{foreign_link}?share={share_token}").status_code == 403
+    assert client.get(f"{link}tampered").status_code == 403
+    assert other.plugin_data == {}
+
+
+@pytest.mark.django_db
+def test_share_token_expires_and_can_be_revoked(user):
+    user.save()
+    resume = Resume.objects.create(name="Resume", slug="resume", owner=user)
+    share_token = create_share_token(resume, expires_in=timedelta(minutes=5))
+
+    assert verify_share_token(share_token, resume.pk)["r"] == resume.pk
+    with pytest.raises(PermissionDenied, match="Share link expired."):
+        verify_share_token(
+            share_token, resume.pk, now=timezone.now() + timedelta(minutes=6)
+        )
+    with override_settings(DJANGO_RESUME_SHARE_LINK_REVOKED_KEY_IDS=["1"]):
+        with pytest.raises(PermissionDenied, match="Share link revoked."):
+            verify_share_token(share_token, resume.pk)
+    with override_settings(DJANGO_RESUME_SHARE_LINK_KEY_ID="2"):
+        rotated_token = create_share_token(resume, expires_in=None)
+    with override_settings(DJANGO_RESUME_SHARE_LINK_REVOKED_KEY_IDS=["1"]):
+        assert verify_share_token(rotated_token, resume.pk)["e"] is None
+
+
+@pytest.mark.django_db
+def test_create_share_links_command_prints_one_link_per_receiver(user):
+    user.save()
+    resume = Resume.objects.create(name="Resume", slug="resume", owner=user)
+    stdout = StringIO()
+
+    call_command("create_share_links", "resume", "a", "b", "--days", "7", stdout=stdout)
+
+    lines = stdout.getvalue().splitlines()
+    assert [line.split("\t")[0] for line in lines] == ["a", "b"]
+    share_token = parse_qs(urlsplit(lines[0].split("\t")[1]).query)["share"][0]
+    assert verify_share_token(share_token, resume.pk)["to"] == "a"
@@ -0,0 +1,118 @@
+from unittest import mock
+
+import pytest
+from django.urls import include, path, reverse, set_script_prefix
+
+from django_resume import url_templates
+from django_resume.pages import page_registry
+from django_resume.plugins import plugin_registry
+from django_resume.plugins.timelines import EmployedTimelinePlugin
+from django_resume.templatetags.page_nav import page_nav_links
+from django_resume.url_templates import clear_url_templates, reverse_cached
+
+# Mounts the app under a different prefix and instance namespace than
+# tests.urls, used as ROOT_URLCONF by the tests below.
+urlpatterns = [
+    path("people/cv/", include("django_resume.urls", namespace="people")),
+]
+
+
+@pytest.fixture(autouse=True)
+def url_templates_cleared():
+    clear_url_templates()
+    yield
+    clear_url_templates()
+    set_script_prefix("/")
+
+
+@pytest.fixture
+def timeline_plugin():
+    plugin_registry.register(EmployedTimelinePlugin)
+    return plugin_registry.get_plugin(EmployedTimelinePlugin.name)
+
+
+def test_reverse_cached_matches_reverse(timeline_plugin):
+    name = f"django_resume:{timeline_plugin.name}-delete-item"
+    for resume_id, item_id in [(1, "abc"), (42, "5f0c-9a1e_x")]:
+        assert reverse_cached(name, resume_id=resume_id, item_id=item_id) == reverse(
+            name, kwargs={"resume_id": resume_id, "item_id": item_id}
+        )
+
+
+def test_reverse_cached_reverses_once(timeline_plugin):
+    name = f"django_resume:{timeline_plugin.name}-edit-item"
+    with mock.patch.object(url_templates, "reverse", wraps=reverse) as reverse_mock:
+        urls = [
+            reverse_cached(name, resume_id=1, item_id=f"item-{i}") for i in range(5)
+        ]
+    assert reverse_mock.call_count == 1
+    assert urls[3] == reverse(name, kwargs={"resume_id": 1, "item_id": "item-3"})
+
+
+def test_reverse_cached_falls_back_for_unsafe_values(timeline_plugin):
+    name = f"django_resume:{timeline_plugin.name}-delete-item"
+    item_id = "a b%c"
+    assert reverse_cached(name, resume_id=1, item_id=item_id) == reverse(
+        name, kwargs={"resume_id": 1, "item_id": item_id}
+    )
+
+
+def test_reverse_cached_follows_script_prefix(timeline_plugin):
+    name = f"django_resume:{timeline_plugin.name}-delete-item"
+    root_url = reverse_cached(name, resume_id=1, item_id="abc")
+
+    set_script_prefix("/mounted/")
+    mounted_url = reverse_cached(name, resume_id=1, item_id="abc")
+
+    assert mounted_url == "/mounted" + root_url
+    assert mounted_url == reverse(name, kwargs={"resume_id": 1, "item_id": "abc"})
+
+
+def test_reverse_cached_follows_root_urlconf(settings, timeline_plugin):
+    name = f"django_resume:{timeline_plugin.name}-delete-item"
+    assert reverse_cached(name, resume_id=1, item_id="abc").startswith("/resume/")
+
+    settings.ROOT_URLCONF = __name__
+    url = reverse_cached(name, resume_id=1, item_id="abc")
+
+    assert url.startswith("/people/cv/")
+    assert url == reverse(name, kwargs={"resume_id": 1, "item_id": "abc"})
+
+
+def test_list_plugin_edit_urls_match_reverse(timeline_plugin):
+    plugin_data = {
+        "items": [
+            {"id": "first", "position": 0, "description": ""},
+            {"id": "2nd", "position": 1, "description": ""},
+        ]
+    }
+    context = timeline_plugin.get_context(
+        None, plugin_data, 7, context={}, edit=True, theme="plain"
+    )
+
+    for entry in context["ordered_entries"]:
+        kwargs = {"resume_id": 7, "item_id": entry["id"]}
+        assert entry["edit_url"] == reverse(
+            f"django_resume:{timeline_plugin.name}-edit-item", kwargs=kwargs
+        )
+        assert entry["delete_url"] == reverse(
+            f"django_resume:{timeline_plugin.name}-delete-item", kwargs=kwargs
+        )
+
+
+def test_page_nav_links_match_reverse(resume):
+    links = page_nav_links(resume)
+
+    expected = {
+        page.nav_title: reverse(
+            f"django_resume:{page.url_name}", kwargs={"slug": resume.slug}
+        )
+        for page in page_registry.get_ordered_pages()
+        if page.nav_title
+    }
+    assert links
+    assert {link["title"]: link["url"] for link in links} == {
+        title: url
+        for title, url in expected.items()
+        if title in {link["title"] for link in links}
+    }
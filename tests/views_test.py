@@ -531,10 +531,29 @@ def test_headwind_resume_detail_owner_loads_htmx_for_boosted_links(client, resum
     cv_link = reverse("resume:cv", kwargs={"slug": resume.slug})
     content = r.content.decode("utf-8")
     assert "htmx.org" in content
-    assert "@media print" in content
+    assert "django_resume/css/headwind.css" in content
+    assert "cdn.tailwindcss.com" not in content
     assert anchor_with_attrs(content, cv_link, 'hx-boost="true"')
 
 
+@pytest.mark.django_db
+def test_headwind_loads_tailwind_cdn_only_in_dev_mode(client, resume, settings):
+    # Given a public headwind resume and the Tailwind CDN fallback enabled
+    resume.owner.save()
+    resume.plugin_data["theme"] = {"name": "headwind"}
+    resume.plugin_data[TokenPlugin.name] = {"flat": {"token_required": False}}
+    resume.save()
+    settings.DJANGO_RESUME_HEADWIND_TAILWIND_CDN = True
+
+    # When the cover page is rendered
+    r = client.get(reverse("resume:detail", kwargs={"slug": resume.slug}))
+
+    # Then the precompiled stylesheet is still linked and the JIT is loaded
+    content = r.content.decode("utf-8")
+    assert "django_resume/css/headwind.css" in content
+    assert "cdn.tailwindcss.com" in content
+
+
 @pytest.mark.django_db
 def test_resume_cv_about_renders_sanitized_markdown(client, resume):
     # Given a resume using the headwind theme and markdown in the about plugin